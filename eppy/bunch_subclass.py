@@ -97,6 +97,7 @@ def addfunctions(abunch):
             'azimuth': fh.azimuth,
             'tilt': fh.tilt,
             'coords': fh.getcoords,  # needed for debugging
+            'vertices': fh.getvertices,
         }
         abunch.__functions.update(func_dict)
 
@@ -170,6 +171,65 @@ def addfunctions(abunch):
 
     return abunch
 
+
+def idfindexes(idf, key):
+    """the indexes that the idf keeps of the objects of key
+
+    The indexes are kept in idf._indexes as {KEY: {name: index}}, with
+    the key None for indexes of all the objects. Each index has the
+    methods add(idfobject), remove(idfobject) and
+    update(idfobject, fieldindex), that are called by Idf_MSequence and
+    EpBunch when the objects change. See idf_helpers.nodeindex and
+    IDF.query"""
+    indexes = getattr(idf, '_indexes', None)
+    if not indexes:
+        return []
+    return (list(indexes.get(None, {}).values()) +
+            list(indexes.get(key.upper(), {}).values()))
+
+
+def printvalue(val):
+    """the value of a field as printed by EpBunch. integers without
+    decimals"""
+    try:
+        value = int(val)
+        if value != val:
+            value = val
+    except ValueError as e:
+        value = val
+    return value
+
+
+def fieldline(val, fieldname, last=False):
+    """the line of a field in idfobjectstr. last if it is the last field"""
+    if last:
+        line = '    %s;' % (printvalue(val), )
+    else:
+        line = '    %s,' % (printvalue(val), )
+    return '%s    !- %s' % (line.ljust(26), fieldname.replace('_', ' '))
+
+
+def idfobjectstr(obj, objls):
+    """the idf snippet of an object with the field values obj and the field
+    names objls, as printed by EpBunch"""
+    # lines = [str(val) for val in self.obj]
+    # replace the above line with code that will print an integer without decimals
+    lines = [printvalue(val) for val in obj]
+    # ------------
+    comments = [comm.replace('_', ' ') for comm in objls]
+    lines[0] = "%s," % (lines[0],)  # comma after first line
+    for i, line in enumerate(lines[1:-1]):
+        lines[i + 1] = '    %s,' % (line,)  # indent and comma
+    lines[-1] = '    %s;' % (lines[-1],)  # ';' after last line
+    lines = lines[:1] + [line.ljust(26) for line in lines[1:]]  # ljsut the lines
+    filler = '%s    !- %s'
+    nlines = [filler % (line, comm) for line,
+              comm in zip(lines[1:], comments[1:])]  # adds comments to line
+    nlines.insert(0, lines[0])  # first line without comment
+    astr = '\n'.join(nlines)
+    return '\n%s\n' % (astr,)
+
+
 class EpBunch(Bunch):
     """
     Fields, values, and descriptions of fields in an EnergyPlus IDF object
@@ -179,6 +239,13 @@ class EpBunch(Bunch):
     """
     def __init__(self, obj, objls, objidd, *args, **kwargs):
         super(EpBunch, self).__init__(*args, **kwargs)
+        # cache of the vertices and geometry of a surface
+        # kept out of the dict, so that it does not change equality
+        # emptied when the coordinates are written. See function_helpers
+        object.__setattr__(self, '_geometry', {})
+        # None, or the position of obj in its key if obj is shared with a
+        # copy of the idf. See sharedcopy and ownobj
+        object.__setattr__(self, '_shared', None)
         self.obj = obj  # field names
         self.objls = objls  # field values
         self.objidd = objidd  # field metadata (minimum, maximum, type, etc.)
@@ -262,6 +329,72 @@ class EpBunch(Bunch):
         """
         return get_referenced_object(self, fieldname)
 
+    def invalidategeometry(self, fieldindex=None):
+        """empty the cached vertices if fieldindex is a coordinate field.
+        Empty them anyway if fieldindex is None.
+        Needed only if the coordinates are changed directly in self.obj"""
+        geometry = self._geometry
+        if geometry:
+            if fieldindex is None or fieldindex >= geometry['first_x']:
+                geometry.clear()
+
+    def copywithobj(self, obj):
+        """a copy of this object with the field values obj, that are of the
+        same key. Faster than making a new EpBunch, since the functions of
+        the key are not looked up again. The copy is in no idf"""
+        other = type(self).__new__(type(self))
+        dict.update(other, self)
+        dict.__setitem__(other, 'obj', obj)
+        dict.__setitem__(other, 'theidf', None)
+        dict.__setitem__(other, '__functions', dict(self['__functions']))
+        object.__setattr__(other, '_geometry', {})
+        object.__setattr__(other, '_shared', None)
+        return other
+
+    def sharedcopy(self, position=None):
+        """a copy of this object that shares obj with it, until one of them
+        writes a field. position is the index of obj in the objects of its
+        key, to find it quickly then. See ownobj and IDF.copy"""
+        other = self.copywithobj(self.obj)
+        object.__setattr__(other, '_shared', position)
+        object.__setattr__(self, '_shared', position)
+        return other
+
+    def ownobj(self):
+        """make obj a list of this object only, if it is shared with a copy
+        of the idf, and return it. The list in idf.model is replaced too.
+        Needed only before writing directly into self.obj"""
+        position = self._shared
+        obj = self.obj
+        if position is None:
+            return obj
+        theidf = dict.get(self, 'theidf')
+        newobj = list(obj)
+        if theidf is not None:
+            objs = theidf.idfobjects[obj[0]].list2
+            if not (position < len(objs) and objs[position] is obj):
+                # the objects have moved since the copy
+                position = None
+                for i, anobj in enumerate(objs):
+                    if anobj is obj:
+                        position = i
+                        break
+            if position is not None:
+                objs[position] = newobj
+        dict.__setitem__(self, 'obj', newobj)
+        object.__setattr__(self, '_shared', None)
+        return newobj
+
+    def fieldschanged(self, fieldindex=None):
+        """update the indexes of the idf after the fields changed.
+        fieldindex is the field that changed, None if any could have.
+        See idfindexes.
+        Needed only if the fields are changed directly in self.obj"""
+        theidf = dict.get(self, 'theidf')
+        if theidf is not None:
+            for index in idfindexes(theidf, self.obj[0]):
+                index.update(self, fieldindex)
+
     def __setattr__(self, name, value):
         try:
             origname = self['__functions'][name]
@@ -280,14 +413,22 @@ class EpBunch(Bunch):
             return None
         elif name in ('obj', 'objls', 'objidd', 'theidf'):  # let Bunch handle it
             super(EpBunch, self).__setattr__(name, value)
+            self._geometry.clear()
+            if name == 'obj':
+                object.__setattr__(self, '_shared', None)
+            if name in ('obj', 'objls'):
+                self.fieldschanged()
             return None
         elif name in self.fieldnames:  # set the value, extending if needed
             i = self.fieldnames.index(name)
+            self.invalidategeometry(i)
+            self.ownobj()
             try:
                 self.fieldvalues[i] = value
             except IndexError:
                 extendlist(self.fieldvalues, i)
                 self.fieldvalues[i] = value
+            self.fieldschanged(i)
         else:
             astr = "unable to find field %s" % (name,)
             raise BadEPFieldError(astr)  # TODO: could raise AttributeError
@@ -337,44 +478,29 @@ class EpBunch(Bunch):
         if key in ('obj', 'objls', 'objidd',
                 '__functions', '__aliases', 'theidf'):
             super(EpBunch, self).__setitem__(key, value)
+            if key == 'obj':
+                object.__setattr__(self, '_shared', None)
+            if key in ('obj', 'objls'):
+                self._geometry.clear()
+                self.fieldschanged()
             return None
         elif key in self.fieldnames:
             i = self.fieldnames.index(key)
+            self.invalidategeometry(i)
+            self.ownobj()
             try:
                 self.fieldvalues[i] = value
             except IndexError:
                 extendlist(self.fieldvalues, i)
                 self.fieldvalues[i] = value
+            self.fieldschanged(i)
         else:
             astr = "unknown field %s" % (key,)
             raise BadEPFieldError(astr)
 
     def __repr__(self):
         """print this as an idf snippet"""
-        # lines = [str(val) for val in self.obj]
-        # replace the above line with code that will print an integer without decimals
-        lines = []
-        for val in self.obj:
-            try:
-                value = int(val)
-                if value != val:
-                    value = val
-            except ValueError as e:
-                value = val
-            lines.append(value)
-        # ------------
-        comments = [comm.replace('_', ' ') for comm in self.objls]
-        lines[0] = "%s," % (lines[0],)  # comma after first line
-        for i, line in enumerate(lines[1:-1]):
-            lines[i + 1] = '    %s,' % (line,)  # indent and comma
-        lines[-1] = '    %s;' % (lines[-1],)  # ';' after last line
-        lines = lines[:1] + [line.ljust(26) for line in lines[1:]]  # ljsut the lines
-        filler = '%s    !- %s'
-        nlines = [filler % (line, comm) for line,
-                  comm in zip(lines[1:], comments[1:])]  # adds comments to line
-        nlines.insert(0, lines[0])  # first line without comment
-        astr = '\n'.join(nlines)
-        return '\n%s\n' % (astr,)
+        return idfobjectstr(self.obj, self.objls)
 
     def __str__(self):
         """same as __repr__"""
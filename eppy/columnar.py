@@ -0,0 +1,163 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""One field of all the objects of a key, as a numpy array.
+
+getcolumn reads a field of all the objects of a key into an array, and
+setcolumn writes an array back into the field, in one pass, so bulk
+edits such as scaling all the vertices or shifting all the schedule
+values are vectorized. Idf_MSequence.column and set_column use them.
+
+Numeric fields give a float array. Values that are not numbers, such as
+autosize, are nan in it.
+
+This module needs numpy.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import numpy as np
+
+from eppy.bunch_subclass import BadEPFieldError
+from eppy.idfreader import convertafield
+
+
+def numericfields(idfobjects, inblock=None):
+    """the (fieldindex, fieldname, isinteger) of the real and integer fields
+    of idfobjects, all of the same key. inblock is the list of the field
+    names of the key in the idd, such as A1, N1. If it is given, the N
+    fields without a type are numeric too, as in idfreader.convertafield"""
+    if not idfobjects:
+        return []
+    first = idfobjects[0]
+    if not inblock:
+        inblock = [''] * len(first.objidd)
+    fields = []
+    for i, (fieldname, comm, iddname) in enumerate(
+            zip(first.objls, first.objidd, inblock)):
+        fieldtype = comm.get('type', [None])[0]
+        if i == 0:
+            continue
+        if fieldtype in ('real', 'integer') or (
+                fieldtype is None and iddname.startswith('N')):
+            fields.append((i, fieldname, fieldtype == 'integer'))
+    return fields
+
+
+def fieldtypes(idfobjects, fieldnames):
+    """the (fieldindex, fieldname, isinteger) of fieldnames in idfobjects,
+    all of the same key"""
+    if not idfobjects:
+        return []
+    first = idfobjects[0]
+    fields = []
+    for fieldname in fieldnames:
+        try:
+            i = first.objls.index(fieldname)
+        except ValueError:
+            astr = "unknown field %s" % (fieldname, )
+            raise BadEPFieldError(astr)
+        fieldtype = first.objidd[i].get('type', [None])[0]
+        fields.append((i, fieldname, fieldtype == 'integer'))
+    return fields
+
+
+def readcolumns(idfobjects, fields):
+    """return (values, texts) of the fields of idfobjects
+
+    values is a float array with a row for each object and a column for
+    each field. texts is {(row, column): value} of the values that are not
+    numbers. They are nan in values. Missing fields are nan and not in
+    texts"""
+    values = np.full((len(idfobjects), len(fields)), np.nan)
+    texts = {}
+    for row, idfobject in enumerate(idfobjects):
+        obj = idfobject.obj
+        for column, (i, fieldname, isinteger) in enumerate(fields):
+            try:
+                value = obj[i]
+            except IndexError:
+                continue
+            try:
+                values[row, column] = float(value)
+            except (TypeError, ValueError):
+                if value != '':
+                    texts[(row, column)] = value
+    return values, texts
+
+
+def tofieldvalue(value, isinteger):
+    """the value to put in a field. integer fields get an int"""
+    if isinteger:
+        return int(round(value))
+    return float(value)
+
+
+def keyblock(idf, key):
+    """the field names of key in the idd, such as A1, N1. None if the idf
+    has no block"""
+    try:
+        return idf.block[idf.model.dtls.index(key.upper())]
+    except (TypeError, AttributeError):
+        return None
+
+
+def getcolumn(idfobjects, fieldname, inblock=None):
+    """the values of fieldname in idfobjects, all of the same key, as a
+    numpy array. A numeric field (see numericfields) gives a float array,
+    with nan for the values that are not numbers. Other fields give an
+    object array"""
+    if not idfobjects:
+        return np.zeros(0)
+    fields = fieldtypes(idfobjects, [fieldname])
+    i = fields[0][0]
+    numerics = [field[0] for field in numericfields(idfobjects, inblock)]
+    if i in numerics:
+        return readcolumns(idfobjects, fields)[0][:, 0]
+    values = np.empty(len(idfobjects), dtype=object)
+    for row, idfobject in enumerate(idfobjects):
+        try:
+            values[row] = idfobject.obj[i]
+        except IndexError:
+            values[row] = ''
+    return values
+
+
+def setcolumn(idfobjects, fieldname, values, inblock=None):
+    """set fieldname of each of idfobjects, all of the same key, to the
+    value in values, converted to the type of the field in the idd as
+    idfreader does. nan is written as a blank field"""
+    if not idfobjects:
+        return
+    i = fieldtypes(idfobjects, [fieldname])[0][0]
+    if hasattr(values, 'tolist'):
+        values = values.tolist()
+    values = list(values)
+    if len(values) != len(idfobjects):
+        astr = "%s values for %s objects" % (len(values), len(idfobjects))
+        raise ValueError(astr)
+    if not inblock:
+        inblock = ['does not start with N'] * len(idfobjects[0].objidd)
+    comm = idfobjects[0].objidd[i]
+    iddname = inblock[i]
+    isinteger = comm.get('type', [None])[0] == 'integer'
+    for idfobject, value in zip(idfobjects, values):
+        if value != value:  # nan
+            value = ''
+        elif isinteger and isinstance(value, float):
+            value = tofieldvalue(value, isinteger)
+        elif value != '':
+            value = convertafield(comm, value, iddname)
+        obj = idfobject.ownobj()
+        if i >= len(obj):
+            obj.extend([''] * (i + 1 - len(obj)))
+        obj[i] = value
+        # the value was written directly into obj
+        idfobject.invalidategeometry(i)
+        idfobject.fieldschanged(i)
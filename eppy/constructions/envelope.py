@@ -0,0 +1,135 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""Area, U factor and UA of every surface of a model in one pass.
+
+The constructions are looked up once by name and the U factor of each
+construction is calculated once, with the functions in
+thermal_properties. The areas of all the surfaces come from
+eppy.geometry.batch.
+
+This module needs numpy.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import numpy as np
+
+from eppy.geometry import batch
+
+
+ENVELOPE_KEYS = batch.SURFACE_KEYS[:5]  # surfaces that have a construction
+
+ENVELOPE_DTYPE = [
+    ('key', object),
+    ('name', object),
+    ('zone', object),
+    ('construction', object),
+    ('boundary', object),
+    ('grossarea', float),
+    ('area', float),
+    ('ufactor', float),
+    ('ua', float), ]
+
+
+def constructionufactors(idf, names):
+    """U factor of each construction name. nan if it cannot be calculated
+
+    Each construction is looked up and calculated once"""
+    constructions = dict([(construction.Name.upper(), construction)
+                          for construction in idf.idfobjects['CONSTRUCTION']])
+    ufactors = {}
+    for name in names:
+        upname = name.upper()
+        if upname in ufactors:
+            continue
+        try:
+            ufactors[upname] = constructions[upname].ufactor
+        except (KeyError, AttributeError, ZeroDivisionError, TypeError):
+            ufactors[upname] = np.nan
+    return np.array([ufactors[name.upper()] for name in names], dtype=float)
+
+
+def envelope_table(idf, keys=None):
+    """area, U factor and UA of every surface with a construction
+
+    The area of a base surface is net of the area of its subsurfaces.
+    The zone and the outside boundary condition of a subsurface are those
+    of its base surface. The U factor is nan for constructions that are
+    not in the idf or whose U factor cannot be calculated, such as
+    windows.
+
+    Parameters
+    ----------
+    idf : modeleditor.IDF
+        the model
+    keys : list, optional
+        the surface keys to use. Defaults to ENVELOPE_KEYS
+
+    Returns
+    -------
+    numpy.ndarray
+        structured array with one row per surface and the fields
+        key, name, zone, construction, boundary, grossarea, area,
+        ufactor and ua
+    """
+    if keys is None:
+        keys = ENVELOPE_KEYS
+    surfaces = batch.getsurfaces(idf, keys)
+    table = np.zeros(len(surfaces), dtype=ENVELOPE_DTYPE)
+    if not surfaces:
+        return table
+    verts, counts = batch.packsurfaces(surfaces)
+    grossareas = batch.areas(verts, counts)
+    rows = dict([(surface.Name.upper(), i)
+                 for i, surface in enumerate(surfaces)])
+    zones = []
+    boundaries = []
+    bases = []
+    for surface in surfaces:
+        if 'Building_Surface_Name' in surface.objls:  # a subsurface
+            base = rows.get(surface.Building_Surface_Name.upper(), -1)
+            bases.append(base)
+            if base >= 0:
+                zones.append(surfaces[base].Zone_Name)
+                boundaries.append(
+                    surfaces[base].Outside_Boundary_Condition)
+            else:
+                zones.append('')
+                boundaries.append('')
+        else:
+            bases.append(-1)
+            zones.append(surface.Zone_Name)
+            boundaries.append(surface.Outside_Boundary_Condition)
+    bases = np.array(bases, dtype=int)
+    issub = bases >= 0
+    subareas = np.bincount(bases[issub], weights=grossareas[issub],
+                           minlength=len(surfaces))
+    constructions = [surface.Construction_Name for surface in surfaces]
+    table['key'] = [surface.key.upper() for surface in surfaces]
+    table['name'] = [surface.Name for surface in surfaces]
+    table['zone'] = zones
+    table['construction'] = constructions
+    table['boundary'] = boundaries
+    table['grossarea'] = grossareas
+    table['area'] = grossareas - subareas
+    table['ufactor'] = constructionufactors(idf, constructions)
+    table['ua'] = table['ufactor'] * table['area']
+    return table
+
+
+def envelope_ua(idf, boundaries=('Outdoors', ), keys=None):
+    """total UA of the surfaces with these outside boundary conditions
+
+    Surfaces with an unknown U factor are left out"""
+    table = envelope_table(idf, keys=keys)
+    boundaries = [boundary.upper() for boundary in boundaries]
+    selected = np.array([boundary.upper() in boundaries
+                         for boundary in table['boundary']], dtype=bool)
+    selected &= np.isfinite(table['ua'])
+    return table['ua'][selected].sum()
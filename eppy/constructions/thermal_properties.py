@@ -21,6 +21,121 @@ INSIDE_FILM_R = 0.12
 OUTSIDE_FILM_R = 0.03
 
 
+class LayerSumMemo(object):
+    """the sums of _layersum, and the tables of the layer materials
+
+    Kept in idf._indexes for the keys of the constructions and of their
+    layer materials, so that each IDF, and each copy of an IDF, has its
+    own. See bunch_subclass.idfindexes. The sums of a construction are
+    dropped when the construction, or a material with the name of one of
+    its layers, is added, removed or changed. The material tables are
+    dropped when a material is added, removed or renamed"""
+    def __init__(self, idf):
+        super(LayerSumMemo, self).__init__()
+        self.idfobjects = idf.idfobjects
+        self.sums = {}  # {id(construction): {(propname, start): total}}
+        self.users = {}  # {MATERIALNAME: set of id(construction)}
+        self.matnames = {}  # {id(material): MATERIALNAME} of summed layers
+        self.tables = {}  # {keys: {MATERIALNAME: [material, ...]}}
+
+    def materialtable(self, keys):
+        """dict of {MATERIALNAME: [material, ...]} for the material keys
+
+        There is one material per key that has that name, as getobject
+        would find it"""
+        table = self.tables.get(keys)
+        if table is None:
+            table = {}
+            for key in keys:
+                found = set()
+                for material in self.idfobjects[key]:
+                    name = material.obj[1].upper()
+                    if name not in found:
+                        found.add(name)
+                        table.setdefault(name, []).append(material)
+            self.tables[keys] = table
+        return table
+
+    def keep(self, ddtt, propname, start, layers, layermaterials, total):
+        """keep the sum total of the construction ddtt"""
+        self.sums.setdefault(id(ddtt), {})[(propname, start)] = total
+        for layer, materials in zip(layers, layermaterials):
+            name = layer.upper()
+            self.users.setdefault(name, set()).add(id(ddtt))
+            for material in materials:
+                self.matnames[id(material)] = name
+
+    def dropname(self, name):
+        """drop the sums of the constructions with a layer called name"""
+        if name is None:
+            return
+        for conid in self.users.pop(name.upper(), ()):
+            self.sums.pop(conid, None)
+
+    def add(self, idfobject):
+        """an object was added"""
+        self.dropname(idfobject.obj[1])
+        self.tables.clear()
+
+    def remove(self, idfobject):
+        """an object was removed"""
+        self.sums.pop(id(idfobject), None)
+        self.dropname(self.matnames.pop(id(idfobject), None))
+        self.dropname(idfobject.obj[1])
+        self.tables.clear()
+
+    def update(self, idfobject, fieldindex=None):
+        """a field of an object changed"""
+        self.sums.pop(id(idfobject), None)
+        self.dropname(self.matnames.get(id(idfobject)))
+        if fieldindex in (None, 1):  # renamed
+            self.dropname(idfobject.obj[1])
+            self.tables.clear()
+
+
+def _layersummemo(idf, keys):
+    """the LayerSumMemo of the idf, kept for the keys"""
+    indexes = idf._indexes
+    memo = indexes.get('CONSTRUCTION', {}).get('layersum')
+    if memo is None or memo.idfobjects is not idf.idfobjects:
+        memo = LayerSumMemo(idf)
+    for key in keys:
+        indexes.setdefault(key, {})['layersum'] = memo
+    return memo
+
+
+def _layersum(ddtt, propname, start=0):
+    """start + the property propname of each layer of a construction
+
+    The sum is memoized on the idf (see LayerSumMemo). It is calculated
+    again only if the construction, or a material of its layers, change"""
+    idf = ddtt.theidf
+    layers = ddtt.obj[2:]
+    if idf is None:
+        raise AttributeError("%s material not found in IDF" % layers[0])
+    field_idd = ddtt.getfieldidd('Outside_Layer')
+    keys = tuple(sorted(field_idd['validobjects']))
+    memo = _layersummemo(idf, ('CONSTRUCTION', ddtt.key.upper()) + keys)
+    total = memo.sums.get(id(ddtt), {}).get((propname, start))
+    if total is not None:
+        return total
+    table = memo.materialtable(keys)
+    layermaterials = [table.get(layer.upper(), []) for layer in layers]
+    total = start
+    for layer, materials in zip(layers, layermaterials):
+        found = False
+        for material in materials:
+            try:
+                total += getattr(material, propname)
+                found = True
+            except AttributeError:
+                pass
+        if not found:
+            raise AttributeError("%s material not found in IDF" % layer)
+    memo.keep(ddtt, propname, start, layers, layermaterials, total)
+    return total
+
+
 def rvalue(ddtt):
     """
     R value (W/K) of a construction or material.
@@ -28,20 +143,7 @@ def rvalue(ddtt):
     """
     object_type = ddtt.obj[0]
     if object_type == 'Construction':
-        rvalue = INSIDE_FILM_R + OUTSIDE_FILM_R
-        layers = ddtt.obj[2:]
-        field_idd = ddtt.getfieldidd('Outside_Layer')
-        validobjects = field_idd['validobjects']
-        for layer in layers:
-            found = False
-            for key in validobjects:
-                try:
-                    rvalue += ddtt.theidf.getobject(key, layer).rvalue
-                    found = True
-                except AttributeError:
-                    pass
-            if not found:
-                raise AttributeError("%s material not found in IDF" % layer)
+        rvalue = _layersum(ddtt, 'rvalue', INSIDE_FILM_R + OUTSIDE_FILM_R)
     elif object_type == 'Material':
         thickness = ddtt.obj[ddtt.objls.index('Thickness')]
         conductivity = ddtt.obj[ddtt.objls.index('Conductivity')]
@@ -91,20 +193,7 @@ def heatcapacity(ddtt):
     """
     object_type = ddtt.obj[0]
     if object_type == 'Construction':
-        heatcapacity = 0
-        layers = ddtt.obj[2:]
-        field_idd = ddtt.getfieldidd('Outside_Layer')
-        validobjects = field_idd['validobjects']
-        for layer in layers:
-            found = False
-            for key in validobjects:
-                try:
-                    heatcapacity += ddtt.theidf.getobject(key, layer).heatcapacity
-                    found = True
-                except AttributeError:
-                    pass
-            if not found:
-                raise AttributeError("%s material not found in IDF" % layer)
+        heatcapacity = _layersum(ddtt, 'heatcapacity')
     elif object_type == 'Material':
         thickness = ddtt.obj[ddtt.objls.index('Thickness')]
         density = ddtt.obj[ddtt.objls.index('Density')]
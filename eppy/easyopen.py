@@ -23,6 +23,7 @@ from io import IOBase
 from six import StringIO
 import eppy
 import eppy.modeleditor
+from eppy import iddregistry
 import eppy.EPlusInterfaceFunctions.parse_idd
 import eppy.runner.run_functions
 
@@ -69,6 +70,66 @@ def getoldiddfile(versionid):
     iddfile = '{}/bin/Energy+.idd'.format(eplusfolder, )
     return iddfile
 
+
+def sniffversion(fhandle):
+    """read fhandle up to the end of the VERSION object and return
+    (versionid, lines). lines are the lines that were read, so that the
+    rest of the file can be read after them. versionid is None if there is
+    no VERSION object. Then all the file has been read"""
+    lines = []
+    objtxt = ''
+    while True:
+        line = fhandle.readline()
+        if not line:
+            break
+        lines.append(line)
+        # like parse_idd.nocomment
+        pnt = line.find('!')
+        if pnt != -1:
+            line = line[:pnt]
+        if ';' not in line:
+            objtxt += line
+            continue
+        objtxts = (objtxt + line).split(';')
+        for atxt in objtxts[:-1]:
+            fields = atxt.split(',')
+            if fields[0].strip().upper() == 'VERSION':
+                if len(fields) > 1:
+                    return fields[1].strip(), lines
+                return '', lines
+        objtxt = objtxts[-1]
+    return None, lines
+
+
+def getversionid(txt):
+    """get the version number from the VERSION object in the text of an
+    idf file. Scans all the text"""
+    ntxt = eppy.EPlusInterfaceFunctions.parse_idd.nocomment(txt, '!')
+    blocks = ntxt.split(';')
+    blocks = [block.strip()for block in blocks]
+    bblocks = [block.split(',') for block in blocks]
+    bblocks1 = [[item.strip() for item in block] for block in bblocks]
+    ver_blocks = [block for block in bblocks1 
+                    if block[0].upper() == 'VERSION']
+    ver_block = ver_blocks[0]
+    versionid = ver_block[1]
+    return versionid
+
+
+def idfwithidd(fname, iddname, epw=None):
+    """open the idf file with the IDD iddname.
+    The IDD of the IDF class is set to iddname if it is not set yet.
+    If the class has another IDD, the IDF is bound to iddname
+    (see IDF.bindidd), so that IDF files of several versions can be open
+    at the same time"""
+    IDF = eppy.modeleditor.IDF
+    if IDF.getiddname() == None:
+        IDF.setiddname(iddname)
+    if iddregistry.iddkey(IDF.getiddname()) == iddregistry.iddkey(iddname):
+        return IDF(fname, epw=epw)
+    return IDF(fname, epw=epw, idd=iddname)
+
+
 def easyopen(fname, idd=None, epw=None):
     """automatically set idd and open idf file. Uses version from idf to set correct idd
     It will work under the following circumstances:
@@ -77,6 +138,10 @@ def easyopen(fname, idd=None, epw=None):
     - Needs  the version of EnergyPlus installed that matches the IDF version.
     - Energyplus should be installed in the default location.
 
+    If an IDD of that version has been parsed already, it is used, even if
+    EnergyPlus is not installed (see eppy.iddregistry). IDF files of
+    different versions can be opened in the same process.
+
     Parameters
     ----------
     fname : str, StringIO or IOBase
@@ -92,31 +157,30 @@ def easyopen(fname, idd=None, epw=None):
         path name to the weather file. This arg is needed to run EneryPlus from eppy.
     """
     if idd:
-        eppy.modeleditor.IDF.setiddname(idd)
-        idf = eppy.modeleditor.IDF(fname, epw=epw)
-        return idf
+        return idfwithidd(fname, idd, epw=epw)
     # the rest of the code runs if idd=None
+    # - get the version number from the idf file
+    # only the start of the file is scanned. The text that was read is kept
+    # and parsed with the rest of the file, so the file is read only once
     if isinstance(fname, (IOBase, StringIO)):
-        fhandle = fname
+        versionid, lines = sniffversion(fname)
+        txt = ''.join(lines) + fname.read()
     else:
-        fhandle = io.open(fname, 'r', encoding='latin-1') # latin-1 seems to read most things
+        # latin-1 seems to read most things
+        with io.open(fname, 'r', encoding='latin-1') as fhandle:
+            versionid, lines = sniffversion(fhandle)
+            txt = ''.join(lines) + fhandle.read()
+    if versionid is None:
+        # no VERSION object found while scanning. Full scan of the text
+        versionid = getversionid(txt)
+
+    # - use the IDD of that version if it has been parsed already
+    parsed = iddregistry.iddforversion(versionid)
+    if parsed is not None:
+        idf = idfwithidd(StringIO(txt), parsed.iddname, epw=epw)
+        idf.idfname = fname
+        return idf
 
-    # - get the version number from the idf file
-    txt = fhandle.read()
-    # try:
-    #     txt = txt.decode('latin-1') # latin-1 seems to read most things
-    # except AttributeError:
-    #     pass
-    ntxt = eppy.EPlusInterfaceFunctions.parse_idd.nocomment(txt, '!')
-    blocks = ntxt.split(';')
-    blocks = [block.strip()for block in blocks]
-    bblocks = [block.split(',') for block in blocks]
-    bblocks1 = [[item.strip() for item in block] for block in bblocks]
-    ver_blocks = [block for block in bblocks1 
-                    if block[0].upper() == 'VERSION']
-    ver_block = ver_blocks[0]
-    versionid = ver_block[1]
-    
     # - get the E+ folder based on version number
     iddfile = getiddfile(versionid)
     if os.path.exists(iddfile):
@@ -127,12 +191,8 @@ def easyopen(fname, idd=None, epw=None):
     if os.path.exists(iddfile):
     # if True:
         # - set IDD and open IDF.
-        eppy.modeleditor.IDF.setiddname(iddfile)
-        if isinstance(fname, (IOBase, StringIO)):
-            fhandle.seek(0)
-            idf = eppy.modeleditor.IDF(fhandle, epw=epw)
-        else:
-            idf = eppy.modeleditor.IDF(fname, epw=epw)
+        idf = idfwithidd(StringIO(txt), iddfile, epw=epw)
+        idf.idfname = fname
         return idf
 
     else:
@@ -13,6 +13,10 @@ from __future__ import unicode_literals
 
 from six.moves import zip_longest
 import itertools
+try:
+    import numpy as np
+except ImportError as err:
+    np = None
 from eppy.constructions import thermal_properties
 from eppy.geometry import surface as g_surface
 import eppy.fanpower
@@ -31,30 +35,60 @@ def getcoords(ddtt):
     pts = ddtt.obj[first_x:]
     return list(grouper(3, pts))
 
+def getvertices(ddtt):
+    """return the vertices of the surface as a (n, 3) float array
+
+    The array is cached on the surface and is recalculated only when a
+    coordinate field is written. It is read only.
+    Without numpy it is a tuple of (x, y, z) tuples"""
+    return _geometry(ddtt)['vertices']
+
+def _geometry(ddtt):
+    """the geometry cache of the surface, with the vertices filled in"""
+    cache = ddtt._geometry
+    if not cache:
+        first_x = ddtt.objls.index('Number_of_Vertices') + 1
+        pts = ddtt.obj[first_x:]
+        num = len(pts) // 3
+        points = tuple(grouper(3, [float(pt) for pt in pts[:num * 3]]))
+        if np is None:
+            vertices = points
+        else:
+            vertices = np.array(points, dtype=float).reshape(num, 3)
+            vertices.flags.writeable = False
+        cache['first_x'] = first_x
+        cache['vertices'] = vertices
+        cache['points'] = points  # g_surface is faster on tuples than on rows
+    return cache
+
+def _cachedgeometry(ddtt, name, func):
+    """return func(vertices), calculated once until the vertices change"""
+    cache = _geometry(ddtt)
+    try:
+        return cache[name]
+    except KeyError:
+        cache[name] = func(cache['points'])
+        return cache[name]
+
 def area(ddtt):
     """area of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.area(coords)
+    return _cachedgeometry(ddtt, 'area', g_surface.area)
 
 def height(ddtt):
     """height of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.height(coords)
+    return _cachedgeometry(ddtt, 'height', g_surface.height)
 
 def width(ddtt):
     """width of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.width(coords)
+    return _cachedgeometry(ddtt, 'width', g_surface.width)
 
 def azimuth(ddtt):
     """azimuth of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.azimuth(coords)
+    return _cachedgeometry(ddtt, 'azimuth', g_surface.azimuth)
 
 def tilt(ddtt):
     """tilt of the surface"""
-    coords = getcoords(ddtt)
-    return g_surface.tilt(coords)
+    return _cachedgeometry(ddtt, 'tilt', g_surface.tilt)
 
 def buildingname(ddtt):
     """return building name"""
@@ -0,0 +1,352 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""Surface geometry for all the surfaces of a model in one vectorized pass.
+
+The functions in eppy.geometry.surface work on one polygon at a time.
+The functions here pack all the polygons into one padded numpy array
+and calculate area, normal, azimuth, tilt, height and width for all of
+them together. The results match those of eppy.geometry.surface.
+
+The volumes of all the zones are also calculated together, from the
+closed shell of surfaces around each zone.
+
+This module needs numpy. tinynumpy is not enough here.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import itertools
+
+import numpy as np
+
+
+SURFACE_KEYS = [
+    "BuildingSurface:Detailed",
+    "Wall:Detailed",
+    "RoofCeiling:Detailed",
+    "Floor:Detailed",
+    "FenestrationSurface:Detailed",
+    "Shading:Site:Detailed",
+    "Shading:Building:Detailed",
+    "Shading:Zone:Detailed", ]
+
+ZONE_SURFACE_KEYS = SURFACE_KEYS[:4]  # the keys that bound a zone
+
+PROPERTIES_DTYPE = [
+    ('key', object),
+    ('name', object),
+    ('area', float),
+    ('azimuth', float),
+    ('tilt', float),
+    ('height', float),
+    ('width', float),
+    ('normal', float, (3, )), ]
+
+
+def packcoords(flatcoords, counts):
+    """pack flat coordinates into a padded array of polygons
+
+    Parameters
+    ----------
+    flatcoords : array like
+        (sum(counts), 3) coordinates of all the polygons, one after the other
+    counts : array like
+        number of vertices in each polygon
+
+    Returns
+    -------
+    numpy.ndarray
+        (m, n, 3) array where n is the largest number of vertices.
+        The unused slots of a polygon are filled with its first vertex,
+        so that min/max over the vertices are not affected by the padding
+    """
+    counts = np.asarray(counts, dtype=int)
+    flatcoords = np.asarray(flatcoords, dtype=float).reshape(-1, 3)
+    num = len(counts)
+    nmax = max(counts.max(), 1) if num else 0
+    verts = np.zeros((num, nmax, 3))
+    if flatcoords.size == 0:
+        return verts
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    hasverts = counts > 0
+    verts[hasverts] = flatcoords[offsets[hasverts]][:, np.newaxis, :]
+    rows = np.repeat(np.arange(num), counts)
+    cols = np.arange(counts.sum()) - np.repeat(offsets, counts)
+    verts[rows, cols] = flatcoords
+    return verts
+
+
+def packpolygons(polys):
+    """pack a list of polygons into a padded array
+
+    Returns (verts, counts). See packcoords for the layout of verts"""
+    counts = [len(poly) for poly in polys]
+    flatcoords = list(itertools.chain.from_iterable(polys))
+    return packcoords(flatcoords, counts), np.asarray(counts, dtype=int)
+
+
+def _vertex(verts, index):
+    """the vertex at index (an array, one per polygon) of each polygon"""
+    return verts[np.arange(len(verts)), index]
+
+
+def unit_normals(pts_a, pts_b, pts_c):
+    """unit normals of the planes defined by points pts_a, pts_b and pts_c
+
+    Each argument is a (m, 3) array. Same as surface.unit_normal, including
+    returning (0, 0, 0) for degenerate planes"""
+    normals = np.cross(pts_b - pts_a, pts_c - pts_a)
+    magnitude = np.sqrt((normals ** 2).sum(axis=-1))
+    degenerate = magnitude < 0.00000001
+    magnitude[degenerate] = 1
+    normals = normals / magnitude[:, np.newaxis]
+    normals[degenerate] = 0
+    return normals
+
+
+def areas(verts, counts):
+    """areas of the packed polygons"""
+    num, nmax = verts.shape[:2]
+    if num == 0:
+        return np.zeros(0)
+    counts = np.asarray(counts, dtype=int)
+    index = np.arange(nmax)
+    nextindex = (index + 1) % np.maximum(counts, 1)[:, np.newaxis]
+    nextverts = verts[np.arange(num)[:, np.newaxis], nextindex]
+    prods = np.cross(verts, nextverts)
+    prods[index >= counts[:, np.newaxis]] = 0
+    total = prods.sum(axis=1)
+    pt_c = _vertex(verts, np.minimum(2, np.maximum(counts - 1, 0)))
+    normals = unit_normals(verts[:, 0], verts[:, min(1, nmax - 1)], pt_c)
+    result = np.abs((total * normals).sum(axis=-1) / 2)
+    result[counts < 3] = 0
+    return result
+
+
+def orientation_normals(verts, counts):
+    """unit normals from the first, second and last vertices
+
+    These are the normals used by surface.azimuth and surface.tilt"""
+    num, nmax = verts.shape[:2]
+    if num == 0:
+        return np.zeros((0, 3))
+    last = _vertex(verts, np.maximum(counts - 1, 0))
+    return unit_normals(verts[:, 0], verts[:, min(1, nmax - 1)], last)
+
+
+def _angle2vecs(vecs1, vec2):
+    """angles in degrees between the rows of vecs1 and vec2"""
+    modulus = np.sqrt((vecs1 ** 2).sum(axis=-1)) * np.sqrt(np.dot(vec2, vec2))
+    cos_angle = np.ones(len(vecs1))
+    nonzero = modulus != 0
+    cos_angle[nonzero] = np.dot(vecs1[nonzero], vec2) / modulus[nonzero]
+    return np.degrees(np.arccos(np.clip(cos_angle, -1, 1)))
+
+
+def azimuths(normals):
+    """azimuths from the orientation normals"""
+    vec_azi = normals * np.array([1, 1, 0])
+    angles = _angle2vecs(vec_azi, np.array([0, 1, 0]))
+    return np.where(vec_azi[:, 0] < 0, 360 - angles, angles)
+
+
+def tilts(normals):
+    """tilts from the orientation normals"""
+    return _angle2vecs(normals, np.array([0, 0, 1]))
+
+
+def _sides(verts, counts):
+    """lengths and vertical rises of the sides on each side of vertex 0"""
+    nmax = verts.shape[1]
+    first = verts[:, 0]
+    last = _vertex(verts, np.maximum(counts - 1, 0))
+    second = verts[:, min(1, nmax - 1)]
+    lastlen = np.sqrt(((last - first) ** 2).sum(axis=-1))
+    secondlen = np.sqrt(((second - first) ** 2).sum(axis=-1))
+    lastrise = np.abs(last[:, 2] - first[:, 2])
+    secondrise = np.abs(second[:, 2] - first[:, 2])
+    return lastlen, secondlen, lastrise, secondrise
+
+
+def widths(verts, counts):
+    """widths of the packed polygons. Same logic as surface.width"""
+    if len(verts) == 0:
+        return np.zeros(0)
+    lastlen, secondlen, lastrise, secondrise = _sides(verts, counts)
+    return np.where(
+        lastrise < secondrise, lastlen,
+        np.where(lastrise > secondrise, secondlen,
+                 np.maximum(lastlen, secondlen)))
+
+
+def heights(verts, counts):
+    """heights of the packed polygons. Same logic as surface.height"""
+    if len(verts) == 0:
+        return np.zeros(0)
+    lastlen, secondlen, lastrise, secondrise = _sides(verts, counts)
+    return np.where(
+        lastrise > secondrise, lastlen,
+        np.where(lastrise < secondrise, secondlen,
+                 np.minimum(lastlen, secondlen)))
+
+
+def polygon_properties(verts, counts):
+    """area, normal, azimuth, tilt, height and width of packed polygons
+
+    Returns a structured array with the fields of PROPERTIES_DTYPE.
+    key and name are left as None"""
+    counts = np.asarray(counts, dtype=int)
+    table = np.zeros(len(counts), dtype=PROPERTIES_DTYPE)
+    table['key'] = None
+    table['name'] = None
+    normals = orientation_normals(verts, counts)
+    table['area'] = areas(verts, counts)
+    table['normal'] = normals
+    table['azimuth'] = azimuths(normals)
+    table['tilt'] = tilts(normals)
+    table['height'] = heights(verts, counts)
+    table['width'] = widths(verts, counts)
+    return table
+
+
+def signed_volumes(verts, counts, groups, numgroups=None):
+    """signed volumes enclosed by groups of packed polygons
+
+    Uses the divergence theorem. Each polygon is split into a fan of
+    triangles from its first vertex, and each triangle adds the signed
+    volume of the tetrahedron it makes with a reference point of its group.
+    The volume is positive if the normals of the polygons point out of the
+    shell, as they do for EnergyPlus surfaces.
+    The polygons of a group have to make a closed shell.
+
+    Parameters
+    ----------
+    verts, counts : numpy.ndarray
+        packed polygons. See packcoords
+    groups : array like
+        the group number of each polygon, from 0 to numgroups - 1
+    numgroups : int, optional
+        defaults to max(groups) + 1
+
+    Returns
+    -------
+    numpy.ndarray
+        signed volume of each group
+    """
+    groups = np.asarray(groups, dtype=int)
+    if numgroups is None:
+        numgroups = groups.max() + 1 if len(groups) else 0
+    if verts.shape[1] < 3:
+        return np.zeros(numgroups)
+    # a reference point inside each group keeps the terms small
+    weights = np.bincount(groups, minlength=numgroups)
+    reference = np.zeros((numgroups, 3))
+    for axis in range(3):
+        reference[:, axis] = np.bincount(
+            groups, weights=verts[:, 0, axis], minlength=numgroups)
+    reference /= np.maximum(weights, 1)[:, np.newaxis]
+    relverts = verts - reference[groups][:, np.newaxis, :]
+    # the padding repeats the first vertex, giving empty triangles
+    fans = np.cross(relverts[:, 1:-1], relverts[:, 2:]).sum(axis=1)
+    terms = (relverts[:, 0] * fans).sum(axis=-1) / 6
+    return np.bincount(groups, weights=terms, minlength=numgroups)
+
+
+def firstcoordindex(idfobject):
+    """index of the first coordinate field of a surface"""
+    return idfobject.objls.index('Number_of_Vertices') + 1
+
+
+def getsurfaces(idf, keys=None):
+    """all the surfaces of the idf that have coordinates
+
+    keys defaults to SURFACE_KEYS"""
+    if keys is None:
+        keys = SURFACE_KEYS
+    surfaces = []
+    for key in keys:
+        surfaces.extend(idf.idfobjects[key.upper()])
+    return surfaces
+
+
+def packsurfaces(surfaces):
+    """pack the coordinates of the surfaces
+
+    Returns (verts, counts). See packcoords for the layout of verts"""
+    flatcoords = []
+    counts = []
+    firstindex = {}
+    for surface in surfaces:
+        key = surface.key.upper()
+        try:
+            first_x = firstindex[key]
+        except KeyError:
+            first_x = firstindex[key] = firstcoordindex(surface)
+        pts = surface.obj[first_x:]
+        num = len(pts) // 3
+        flatcoords.extend(pts[:num * 3])
+        counts.append(num)
+    return packcoords(flatcoords, counts), np.asarray(counts, dtype=int)
+
+
+def zone_volumes(idf, keys=None):
+    """volumes of all the zones of the idf, from the surfaces of each zone
+
+    The surfaces of a zone have to make a closed shell, with the vertices
+    in the EnergyPlus order (counter clockwise seen from outside).
+    The subsurfaces are not needed, since they lie in their base surfaces.
+
+    Parameters
+    ----------
+    idf : modeleditor.IDF
+        the model
+    keys : list, optional
+        the surface keys to use. Defaults to ZONE_SURFACE_KEYS
+
+    Returns
+    -------
+    dict
+        {zonename: volume, ...}. A zone with no surfaces has a volume of 0
+    """
+    zonenames = [zone.Name for zone in idf.idfobjects['ZONE']]
+    if keys is None:
+        keys = ZONE_SURFACE_KEYS
+    surfaces = getsurfaces(idf, keys)
+    zoneindex = dict([(name.upper(), i) for i, name in enumerate(zonenames)])
+    inzone = [surface for surface in surfaces
+              if surface.Zone_Name.upper() in zoneindex]
+    groups = [zoneindex[surface.Zone_Name.upper()] for surface in inzone]
+    verts, counts = packsurfaces(inzone)
+    volumes = signed_volumes(verts, counts, groups, len(zonenames))
+    return dict(zip(zonenames, np.abs(volumes)))
+
+
+def surface_properties(idf, keys=None):
+    """area, normal, azimuth, tilt, height and width of all the surfaces
+
+    Parameters
+    ----------
+    idf : modeleditor.IDF
+        the model
+    keys : list, optional
+        the surface keys to use. Defaults to SURFACE_KEYS
+
+    Returns
+    -------
+    numpy.ndarray
+        structured array with one row per surface and the fields
+        key, name, area, azimuth, tilt, height, width and normal
+    """
+    surfaces = getsurfaces(idf, keys)
+    verts, counts = packsurfaces(surfaces)
+    table = polygon_properties(verts, counts)
+    table['key'] = [surface.key.upper() for surface in surfaces]
+    table['name'] = [surface.Name for surface in surfaces]
+    return table
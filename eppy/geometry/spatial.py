@@ -0,0 +1,419 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""Spatial index of the surfaces of a model.
+
+The bounding boxes of the surfaces are put in a uniform grid, so that
+only the surfaces that share a grid cell are compared with each other.
+This is used to find coplanar and overlapping surfaces, the surfaces
+nearest to a point and to match the interzone surfaces of a model,
+without comparing every surface with every other surface.
+
+This module needs numpy.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import itertools
+
+import numpy as np
+
+from eppy.geometry import batch
+
+
+TOLERANCE = 0.01  # m. distance within which points are the same
+
+
+def newell_normals(verts):
+    """unit normals of packed polygons by Newell's method
+
+    Works for non convex polygons. The padding of packcoords adds only
+    zero length edges, so it does not change the result.
+    Degenerate polygons get a normal of (0, 0, 0)"""
+    if verts.shape[1] == 0:
+        return np.zeros((len(verts), 3))
+    nextverts = np.roll(verts, -1, axis=1)
+    normals = np.cross(verts, nextverts).sum(axis=1)
+    magnitude = np.sqrt((normals ** 2).sum(axis=-1))
+    degenerate = magnitude < 0.00000001
+    magnitude[degenerate] = 1
+    normals = normals / magnitude[:, np.newaxis]
+    normals[degenerate] = 0
+    return normals
+
+
+def _signedarea2d(poly):
+    """signed area of a 2D polygon. Positive if counter clockwise"""
+    total = 0.0
+    for (x_1, y_1), (x_2, y_2) in zip(poly, poly[1:] + poly[:1]):
+        total += x_1 * y_2 - x_2 * y_1
+    return total / 2
+
+
+def _isleft(pt_a, pt_b, pt_c):
+    """cross product of (pt_b - pt_a) and (pt_c - pt_a)"""
+    return ((pt_b[0] - pt_a[0]) * (pt_c[1] - pt_a[1]) -
+            (pt_b[1] - pt_a[1]) * (pt_c[0] - pt_a[0]))
+
+
+def _isconvex(poly):
+    """True if the counter clockwise 2D polygon is convex"""
+    num = len(poly)
+    for i in range(num):
+        if _isleft(poly[i - 2], poly[i - 1], poly[i]) < 0:
+            return False
+    return True
+
+
+def _triangulate(poly):
+    """split a counter clockwise 2D polygon into triangles by ear clipping"""
+    poly = list(poly)
+    triangles = []
+    while len(poly) > 3:
+        num = len(poly)
+        for i in range(num):
+            pt_a, pt_b, pt_c = poly[i - 1], poly[i], poly[(i + 1) % num]
+            if _isleft(pt_a, pt_b, pt_c) <= 0:
+                continue  # not convex at pt_b
+            others = [pt for pt in poly if pt not in (pt_a, pt_b, pt_c)]
+            if any(_isleft(pt_a, pt_b, pt) >= 0 and
+                   _isleft(pt_b, pt_c, pt) >= 0 and
+                   _isleft(pt_c, pt_a, pt) >= 0 for pt in others):
+                continue  # another vertex is inside the ear
+            triangles.append([pt_a, pt_b, pt_c])
+            del poly[i]
+            break
+        else:  # no ear found, degenerate polygon
+            break
+    if len(poly) == 3:
+        triangles.append(poly)
+    return triangles
+
+
+def _clip(subject, clipper):
+    """part of the 2D polygon subject inside the convex 2D polygon clipper
+
+    Sutherland-Hodgman clipping. clipper is counter clockwise"""
+    result = list(subject)
+    for edge_a, edge_b in zip(clipper, clipper[1:] + clipper[:1]):
+        if not result:
+            break
+        points = result
+        result = []
+        for pt_p, pt_q in zip(points[-1:] + points[:-1], points):
+            p_in = _isleft(edge_a, edge_b, pt_p) >= 0
+            q_in = _isleft(edge_a, edge_b, pt_q) >= 0
+            if p_in != q_in:
+                side_p = _isleft(edge_a, edge_b, pt_p)
+                side_q = _isleft(edge_a, edge_b, pt_q)
+                frac = side_p / (side_p - side_q)
+                result.append((pt_p[0] + frac * (pt_q[0] - pt_p[0]),
+                               pt_p[1] + frac * (pt_q[1] - pt_p[1])))
+            if q_in:
+                result.append(pt_q)
+    return result
+
+
+def overlaparea2d(poly1, poly2):
+    """area of overlap of two 2D polygons. They need not be convex"""
+    if abs(_signedarea2d(poly1)) == 0 or abs(_signedarea2d(poly2)) == 0:
+        return 0.0
+    if _signedarea2d(poly1) < 0:
+        poly1 = poly1[::-1]
+    if _signedarea2d(poly2) < 0:
+        poly2 = poly2[::-1]
+    if not _isconvex(poly2):
+        poly1, poly2 = poly2, poly1
+    if _isconvex(poly2):
+        clippers = [poly2]
+    else:
+        clippers = _triangulate(poly2)
+    return sum(abs(_signedarea2d(_clip(poly1, clipper)))
+               for clipper in clippers)
+
+
+def overlaparea(poly1, poly2, normal):
+    """area of overlap of two coplanar 3D polygons with the plane normal"""
+    # drop the coordinate with the largest normal component
+    drop = int(np.argmax(np.abs(normal)))
+    keep = [axis for axis in range(3) if axis != drop]
+    poly1 = [(pt[keep[0]], pt[keep[1]]) for pt in poly1]
+    poly2 = [(pt[keep[0]], pt[keep[1]]) for pt in poly2]
+    area2d = overlaparea2d(poly1, poly2)
+    return area2d / abs(normal[drop])
+
+
+class SurfaceIndex(object):
+    """Bounding boxes of surfaces in a uniform grid.
+
+    Parameters
+    ----------
+    surfaces : list
+        surfaces (epbunch) that have coordinates.
+        See batch.getsurfaces
+    cellsize : float, optional
+        size of the grid cells. Defaults to the median size of the
+        bounding boxes
+    tol : float, optional
+        distance within which two points are the same. The bounding boxes
+        are enlarged by tol
+    """
+    def __init__(self, surfaces, cellsize=None, tol=TOLERANCE):
+        self.surfaces = list(surfaces)
+        self.tol = tol
+        self.verts, self.counts = batch.packsurfaces(self.surfaces)
+        num = len(self.surfaces)
+        self.valid = self.counts >= 3
+        self.mins = np.full((num, 3), np.inf)
+        self.maxs = np.full((num, 3), -np.inf)
+        if self.valid.any():
+            validverts = self.verts[self.valid]
+            self.mins[self.valid] = validverts.min(axis=1) - tol
+            self.maxs[self.valid] = validverts.max(axis=1) + tol
+        self.normals = newell_normals(self.verts)
+        self.offsets = np.zeros(num)
+        if num and self.verts.shape[1]:
+            self.offsets = (self.normals * self.verts[:, 0]).sum(axis=-1)
+        self.areas = batch.areas(self.verts, self.counts)
+        if cellsize is None:
+            sizes = (self.maxs - self.mins)[self.valid].max(axis=-1)
+            cellsize = np.median(sizes) if len(sizes) else 1.0
+        self.cellsize = max(float(cellsize), 2 * tol)
+        self.cells = {}
+        for i in np.flatnonzero(self.valid):
+            for cell in self._cellsof(self.mins[i], self.maxs[i]):
+                self.cells.setdefault(cell, []).append(i)
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def _cellsof(self, mins, maxs):
+        """the grid cells covered by a bounding box"""
+        low = np.floor(mins / self.cellsize).astype(int)
+        high = np.floor(maxs / self.cellsize).astype(int)
+        return itertools.product(*[range(low[axis], high[axis] + 1)
+                                   for axis in range(3)])
+
+    def _boxesoverlap(self, index1, index2):
+        """True where the bounding boxes of index1 and index2 overlap"""
+        return np.all((self.mins[index1] <= self.maxs[index2]) &
+                      (self.mins[index2] <= self.maxs[index1]), axis=-1)
+
+    def polygon(self, index):
+        """vertices of a surface as a (n, 3) array"""
+        return self.verts[index, :self.counts[index]]
+
+    def intersect(self, mins, maxs):
+        """indices of the surfaces whose bounding box overlaps a box
+
+        Parameters
+        ----------
+        mins, maxs : array like
+            (x, y, z) corners of the box
+
+        Returns
+        -------
+        numpy.ndarray
+            sorted indices into self.surfaces
+        """
+        mins = np.asarray(mins, dtype=float)
+        maxs = np.asarray(maxs, dtype=float)
+        if not np.all(np.isfinite(mins)) or not np.all(np.isfinite(maxs)):
+            found = np.flatnonzero(self.valid)
+        else:
+            found = set()
+            for cell in self._cellsof(mins, maxs):
+                found.update(self.cells.get(cell, []))
+            found = np.array(sorted(found), dtype=int)
+        overlap = np.all((self.mins[found] <= maxs) &
+                         (mins <= self.maxs[found]), axis=-1)
+        return found[overlap]
+
+    def candidatepairs(self):
+        """pairs of surfaces whose bounding boxes overlap
+
+        Returns
+        -------
+        numpy.ndarray
+            (k, 2) array of indices, with the first index smaller
+        """
+        pairs = set()
+        for members in self.cells.values():
+            pairs.update(itertools.combinations(members, 2))
+        if not pairs:
+            return np.zeros((0, 2), dtype=int)
+        pairs = np.array(sorted(pairs), dtype=int)
+        return pairs[self._boxesoverlap(pairs[:, 0], pairs[:, 1])]
+
+    def coplanarpairs(self, opposite=None, angletol=1.0):
+        """pairs of surfaces that lie in the same plane
+
+        Parameters
+        ----------
+        opposite : bool, optional
+            True for only the pairs that face each other (as interzone
+            surfaces do), False for only the pairs that face the same way.
+            None for both
+        angletol : float, optional
+            largest angle in degrees between the normals
+
+        Returns
+        -------
+        numpy.ndarray
+            (k, 2) array of indices, with the first index smaller
+        """
+        pairs = self.candidatepairs()
+        first, second = pairs[:, 0], pairs[:, 1]
+        cosines = (self.normals[first] * self.normals[second]).sum(axis=-1)
+        mincos = np.cos(np.radians(angletol))
+        if opposite is None:
+            parallel = np.abs(cosines) >= mincos
+        elif opposite:
+            parallel = cosines <= -mincos
+        else:
+            parallel = cosines >= mincos
+        pairs = pairs[parallel]
+        first, second = pairs[:, 0], pairs[:, 1]
+        # distance of the vertices of the second from the plane of the first
+        distances = np.abs(
+            np.einsum('kj,kmj->km', self.normals[first], self.verts[second]) -
+            self.offsets[first][:, np.newaxis])
+        inplane = distances.max(axis=-1) <= self.tol
+        return pairs[inplane]
+
+    def overlappingpairs(self, opposite=None, minarea=0.001, angletol=1.0):
+        """pairs of coplanar surfaces that overlap
+
+        Surfaces that only touch along an edge do not overlap.
+
+        Parameters
+        ----------
+        opposite : bool, optional
+            see coplanarpairs
+        minarea : float, optional
+            smallest area of overlap
+        angletol : float, optional
+            see coplanarpairs
+
+        Returns
+        -------
+        list
+            [(index1, index2, overlaparea), ...]
+        """
+        result = []
+        for first, second in self.coplanarpairs(opposite, angletol):
+            area = overlaparea(self.polygon(first), self.polygon(second),
+                               self.normals[first])
+            if area >= minarea:
+                result.append((int(first), int(second), area))
+        return result
+
+    def distances(self, point):
+        """distance from a point to each surface
+
+        Surfaces with fewer than 3 vertices are at an infinite distance"""
+        point = np.asarray(point, dtype=float)
+        num, nmax = self.verts.shape[:2]
+        result = np.full(num, np.inf)
+        if num == 0 or nmax == 0:
+            return result
+        # distance to the edges
+        starts = self.verts
+        ends = np.roll(self.verts, -1, axis=1)
+        edges = ends - starts
+        lengths2 = (edges ** 2).sum(axis=-1)
+        lengths2[lengths2 == 0] = 1
+        frac = np.clip(((point - starts) * edges).sum(axis=-1) / lengths2,
+                       0, 1)
+        nearest = starts + frac[..., np.newaxis] * edges
+        edgedist = np.sqrt(((point - nearest) ** 2).sum(axis=-1)).min(axis=1)
+        # distance to the plane, if the point is over the polygon
+        planedist = (self.normals * point).sum(axis=-1) - self.offsets
+        projected = point - planedist[:, np.newaxis] * self.normals
+        vec1 = starts - projected[:, np.newaxis]
+        vec2 = ends - projected[:, np.newaxis]
+        sines = (np.cross(vec1, vec2) *
+                 self.normals[:, np.newaxis]).sum(axis=-1)
+        cosines = (vec1 * vec2).sum(axis=-1)
+        winding = np.arctan2(sines, cosines).sum(axis=-1)
+        inside = (np.abs(winding) > np.pi) & np.any(self.normals, axis=-1)
+        result = np.where(inside, np.abs(planedist), edgedist)
+        result[~self.valid] = np.inf
+        return result
+
+    def nearest(self, point, num=1):
+        """indices of the num surfaces nearest to a point, nearest first"""
+        distances = self.distances(point)
+        order = np.argsort(distances, kind='mergesort')
+        order = order[np.isfinite(distances[order])]
+        return order[:num]
+
+
+def surfaceindex(idf, keys=None, cellsize=None, tol=TOLERANCE):
+    """SurfaceIndex of the surfaces of the idf
+
+    keys defaults to batch.SURFACE_KEYS"""
+    return SurfaceIndex(batch.getsurfaces(idf, keys), cellsize=cellsize,
+                        tol=tol)
+
+
+def matchboundaries(idf, tol=TOLERANCE, areatol=0.01, setfields=True):
+    """match the interzone surfaces of the idf
+
+    Two surfaces match if they are in different zones, lie in the same
+    plane facing each other and overlap over nearly all their area.
+    Each surface is matched at most once, best overlap first.
+
+    Parameters
+    ----------
+    idf : modeleditor.IDF
+        the model
+    tol : float, optional
+        distance within which two points are the same
+    areatol : float, optional
+        the overlap has to be at least (1 - areatol) times the area of
+        each surface
+    setfields : bool, optional
+        if True, Outside_Boundary_Condition is set to 'Surface',
+        Outside_Boundary_Condition_Object to the name of the other
+        surface, and Sun_Exposure and Wind_Exposure to 'NoSun' and 'NoWind'
+
+    Returns
+    -------
+    list
+        [(surface1, surface2), ...]
+    """
+    surfaces = [surface for surface in batch.getsurfaces(idf)
+                if 'Outside_Boundary_Condition_Object' in surface.objls and
+                'Zone_Name' in surface.objls]
+    index = SurfaceIndex(surfaces, tol=tol)
+    zones = [surface.Zone_Name.upper() for surface in surfaces]
+    candidates = []
+    for first, second, area in index.overlappingpairs(opposite=True):
+        if zones[first] == zones[second]:
+            continue
+        fraction = area / max(index.areas[first], index.areas[second])
+        if fraction >= 1 - areatol:
+            candidates.append((fraction, first, second))
+    candidates.sort(key=lambda candidate: -candidate[0])
+    matched = set()
+    pairs = []
+    for fraction, first, second in candidates:
+        if first in matched or second in matched:
+            continue
+        matched.update((first, second))
+        pairs.append((surfaces[first], surfaces[second]))
+    if setfields:
+        for surf1, surf2 in pairs:
+            for surf, other in ((surf1, surf2), (surf2, surf1)):
+                surf.Outside_Boundary_Condition = 'Surface'
+                surf.Outside_Boundary_Condition_Object = other.Name
+                surf.Sun_Exposure = 'NoSun'
+                surf.Wind_Exposure = 'NoWind'
+    return pairs
@@ -15,13 +15,15 @@ import copy
 
 import eppy.bunch_subclass as bunch_subclass
 from eppy.modeleditor import IDF
-import eppy.modeleditor as modeleditor
 from six.moves import xrange
 
 
 class WhichLoopError(Exception):
     pass
 
+class NoSuchBranchError(Exception):
+    pass
+
 class SomeFields(object):
     """Some fields"""
     c_fields = ['Condenser Side Inlet Node Name',
@@ -134,32 +136,132 @@ def getbranchcomponents(idf, branch, utest=False):
     else:
         return [idf.getobject(ot, on) for ot, on in complist]
 
-def renamenodes(idf, fieldtype):
-    """rename all the changed nodes"""
-    renameds = []
+# cache of the indexes of the fields of a given type in each object type
+# {(id(objidd), fieldtype): (objidd, [index, ...])}
+# objidd is kept in the cache so that its id is not reused
+_TYPEDFIELDS = {}
+
+
+def typedfieldindexes(idfobject, fieldtype):
+    """return the indexes of the fields of idfobject of type fieldtype
+    calculated once for each object type and cached"""
+    objidd = idfobject.objidd
+    try:
+        cached, indexes = _TYPEDFIELDS[(id(objidd), fieldtype)]
+        if cached is objidd:
+            return indexes
+    except KeyError:
+        pass
+    indexes = [i for i, itsidd in enumerate(objidd)
+               if 'type' in itsidd and itsidd['type'][0] == fieldtype]
+    _TYPEDFIELDS[(id(objidd), fieldtype)] = (objidd, indexes)
+    return indexes
+
+
+def _allidfobjects(idf):
+    """all the idfobjects in the model"""
     for key in idf.model.dtls:
         for idfobject in idf.idfobjects[key]:
-            for fieldvalue in idfobject.obj:
-                if type(fieldvalue) is list:
-                    if fieldvalue not in renameds:
-                        cpvalue = copy.copy(fieldvalue)
-                        renameds.append(cpvalue)
+            yield idfobject
+
+
+def _typedfields(idfobject, fieldtype):
+    """(idfobject, index) of the fields of idfobject of type fieldtype"""
+    numfields = len(idfobject.obj)
+    for i in typedfieldindexes(idfobject, fieldtype):
+        if i >= numfields:
+            break
+        yield idfobject, i
+
+
+class NodeIndex(object):
+    """index of the node fields in the model by node name
+
+    Make it once and pass it to renamenodes or replacebranch, so that
+    the nodes are renamed without looking at every object in the model.
+    The entries are checked when they are used, so an index that is out
+    of date will not rename the wrong field. But it will not find the
+    nodes of objects made or changed after the index was made, unless
+    they are added with NodeIndex.add"""
+    def __init__(self, idf, fieldtype='node'):
+        super(NodeIndex, self).__init__()
+        self.fieldtype = fieldtype
+        self.nodes = {}  # {nodename: {(id(obj), index): idfobject}}
+        for idfobject in _allidfobjects(idf):
+            self.add(idfobject)
+
+    def add(self, idfobject):
+        """add the node fields of idfobject to the index"""
+        for _, i in _typedfields(idfobject, self.fieldtype):
+            self.addfield(idfobject, i)
+
+    def addfield(self, idfobject, i):
+        """add the field i of idfobject to the index"""
+        fieldvalue = idfobject.obj[i]
+        if type(fieldvalue) is not list:
+            self.nodes.setdefault(
+                fieldvalue, {})[(id(idfobject.obj), i)] = idfobject
+
+    def idfobjectfields(self, nodename):
+        """(idfobject, index) of the fields that have this node name"""
+        return [(idfobject, i)
+                for (_, i), idfobject in self.nodes.get(nodename, {}).items()
+                if i < len(idfobject.obj) and idfobject.obj[i] == nodename]
+
+    def fields(self, nodename):
+        """(obj, index) of the fields that have this node name"""
+        return [(idfobject.obj, i)
+                for idfobject, i in self.idfobjectfields(nodename)]
+
+
+def renamenodes(idf, fieldtype, idfobjects=None, nodeindex=None):
+    """rename all the changed nodes
+
+    A changed node is a field with the value [oldname, newname]. Every
+    field of type fieldtype with the value oldname is renamed to newname.
+
+    idfobjects are the objects with the changed nodes. Defaults to all the
+    objects in the model. nodeindex is a NodeIndex used to find the fields
+    to rename. Without it every object in the model is looked at. The
+    renamed nodes are added to nodeindex."""
+    if idfobjects is None:
+        idfobjects = list(_allidfobjects(idf))
+    renameds = {}
+    for idfobject in idfobjects:
+        for fieldvalue in idfobject.obj:
+            if type(fieldvalue) is list:
+                renameds[fieldvalue[0]] = fieldvalue[-1]
+
+    # gather the fields, each one only once
+    if nodeindex is None:
+        allfields = (field
+                     for idfobject in _allidfobjects(idf)
+                     for field in _typedfields(idfobject, fieldtype))
+    else:
+        allfields = [field
+                     for idfobject in idfobjects
+                     for field in _typedfields(idfobject, fieldtype)]
+        for oldname in renameds:
+            allfields.extend(nodeindex.idfobjectfields(oldname))
+    fields = {}
+    for idfobject, i in allfields:
+        fields[(id(idfobject.obj), i)] = (idfobject, i)
 
     # do the renaming
-    for key in idf.model.dtls:
-        for idfobject in idf.idfobjects[key]:
-            for i, fieldvalue in enumerate(idfobject.obj):
-                itsidd = idfobject.objidd[i]
-                if 'type' in itsidd:
-                    if itsidd['type'][0] == fieldtype:
-                        tempdct = dict(renameds)
-                        if type(fieldvalue) is list:
-                            fieldvalue = fieldvalue[-1]
-                            idfobject.obj[i] = fieldvalue
-                        else:
-                            if fieldvalue in tempdct:
-                                fieldvalue = tempdct[fieldvalue]
-                                idfobject.obj[i] = fieldvalue
+    changeds = {}
+    for idfobject, i in fields.values():
+        fieldvalue = idfobject.obj[i]
+        if type(fieldvalue) is list:
+            idfobject.ownobj()[i] = fieldvalue[-1]
+        elif fieldvalue in renameds:
+            idfobject.ownobj()[i] = renameds[fieldvalue]
+        else:
+            continue
+        changeds[id(idfobject)] = idfobject
+        if nodeindex is not None:
+            nodeindex.addfield(idfobject, i)
+    for idfobject in changeds.values():
+        idfobject.fieldschanged()
 
 def getfieldnamesendswith(idfobject, endswith):
     """get the filednames for the idfobject based on endswith"""
@@ -269,13 +371,15 @@ def componentsintobranch(idf, branch, listofcomponents, fluid=None):
     componentlist = [item[0] for item in listofcomponents]
     # assumes that the nodes of the component connect to each other
     # empty branch if it has existing components
-    thebranchname = branch.Name
-    thebranch = idf.removeextensibles('BRANCH', thebranchname)  # empty the branch
+    thebranch = branch
+    # empty the branch. the branch is used as it is, without looking it up
+    # by name with idf.removeextensibles, which looks at all the branches
+    extensible_i = [i for i, itsidd in enumerate(thebranch.objidd)
+                    if 'begin-extensible' in itsidd]
+    theobj = thebranch.ownobj()
+    if extensible_i:
+        del theobj[extensible_i[0]:]
     # fill in the new components with the node names into this branch
-        # find the first extensible field and fill in the data in obj.
-    e_index = idf.getextensibleindex('BRANCH', thebranchname)
-    theobj = thebranch.obj
-    modeleditor.extendlist(theobj, e_index)  # just being careful here
     for comp, compnode in listofcomponents:
         theobj.append(comp.key)
         theobj.append(comp.Name)
@@ -286,7 +390,7 @@ def componentsintobranch(idf, branch, listofcomponents, fluid=None):
                                           fluid=fluid, startswith=compnode)
         theobj.append(comp[outletnodename])
         theobj.append('')
-
+    thebranch.fieldschanged()  # the nodes were written directly in obj
     return thebranch
 
 def doingtesting(testing, testn, result=None):
@@ -358,9 +462,11 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
     # -------- testing ---------
     # supply side
     sbranchs = []
+    sducts = []  # the ducts made by makeductbranch
     for bname in sbranchnames:
         branch = makeductbranch(idf, bname)
         sbranchs.append(branch)
+        sducts.append(idf.idfobjects['DUCT'][-1])
     # -------- testing ---------
     testn = doingtesting(testing, testn, newairloop)
     if testn == None:
@@ -379,11 +485,9 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
         returnnone()
     # -------- testing ---------
     # rename inlet outlet of endpoints of loop - rename in pipe
-    dname = sbranchs[0]['Component_1_Name']  # get the duct name
-    aduct = idf.getobject('duct'.upper(), dname)  # get duct
+    aduct = sducts[0]  # get duct
     aduct.Inlet_Node_Name = newairloop[sameinnode]
-    dname = sbranchs[-1]['Component_1_Name']  # get the duct name
-    aduct = idf.getobject('duct'.upper(), dname)  # get duct
+    aduct = sducts[-1]  # get duct
     aduct.Outlet_Node_Name = newairloop[sameoutnode]
     # -------- testing ---------
     testn = doingtesting(testing, testn, newairloop)
@@ -439,14 +543,14 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
     if testn == None:
         returnnone()
     # -------- testing ---------
+    # the first ZoneHVAC:EquipmentConnections of each zone
+    equipconns = {}
+    for equipconn in idf.idfobjects["ZoneHVAC:EquipmentConnections".upper()]:
+        equipconns.setdefault(equipconn.Zone_Name.upper(), equipconn)
     # make ZoneHVAC:EquipmentList
     for zone in dloop:
         z_equiplst = idf.newidfobject("ZoneHVAC:EquipmentList".upper())
-        z_equipconn = modeleditor.getobjects(
-            idf.idfobjects,
-            idf.model, idf.idd_info,
-            "ZoneHVAC:EquipmentConnections".upper(),  # places=7,
-            **dict(Zone_Name=zone))[0]
+        z_equipconn = equipconns[zone.upper()]
         z_equiplst.Name = z_equipconn.Zone_Conditioning_Equipment_List_Name
         fld = "Zone_Equipment_1_Object_Type"
         z_equiplst[fld] = "AirTerminal:SingleDuct:Uncontrolled"
@@ -460,11 +564,7 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
     # -------- testing ---------
     # make AirTerminal:SingleDuct:Uncontrolled
     for zone in dloop:
-        z_equipconn = modeleditor.getobjects(
-            idf.idfobjects,
-            idf.model, idf.idd_info,
-            "ZoneHVAC:EquipmentConnections".upper(),  # places=7,
-            **dict(Zone_Name=zone))[0]
+        z_equipconn = equipconns[zone.upper()]
         key = "AirTerminal:SingleDuct:Uncontrolled".upper()
         z_airterm = idf.newidfobject(key)
         z_airterm.Name = "%sDirectAir" % (zone,)
@@ -489,11 +589,7 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
     z_splitter.Name = "%s Demand Side Splitter" % (loopname,)
     z_splitter.Inlet_Node_Name = newairloop.Demand_Side_Inlet_Node_Names
     for i, zone in enumerate(dloop):
-        z_equipconn = modeleditor.getobjects(
-            idf.idfobjects,
-            idf.model, idf.idd_info,
-            "ZoneHVAC:EquipmentConnections".upper(),  # places=7,
-            **dict(Zone_Name=zone))[0]
+        z_equipconn = equipconns[zone.upper()]
         fld = "Outlet_%s_Node_Name" % (i + 1,)
         z_splitter[fld] = z_equipconn.Zone_Air_Inlet_Node_or_NodeList_Name
     # -------- testing ---------
@@ -541,11 +637,7 @@ def makeairloop(idf, loopname, sloop, dloop, testing=None):
         returnnone()
     # -------- testing ---------
     for i, zone in enumerate(dloop):
-        z_equipconn = modeleditor.getobjects(
-            idf.idfobjects,
-            idf.model, idf.idd_info,
-            "ZoneHVAC:EquipmentConnections".upper(),  # places=7,
-            **dict(Zone_Name=zone))[0]
+        z_equipconn = equipconns[zone.upper()]
         fld = "Inlet_%s_Node_Name" % (i + 1,)
         z_mixer[fld] = z_equipconn.Zone_Return_Air_Node_Name
     # -------- testing ---------
@@ -647,9 +739,11 @@ def makeplantloop(idf, loopname, sloop, dloop, testing=None):
 
     # supply side
     sbranchs = []
+    spipes = []  # the pipes made by makepipebranch
     for bname in sbranchnames:
         branch = makepipebranch(idf, bname)
         sbranchs.append(branch)
+        spipes.append(idf.idfobjects['PIPE:ADIABATIC'][-1])
     # -------- <testing ---------
     testn = doingtesting(testing, testn, newplantloop)
     if testn == None:
@@ -668,11 +762,9 @@ def makeplantloop(idf, loopname, sloop, dloop, testing=None):
         returnnone()
     # -------- testing> ---------
     # rename inlet outlet of endpoints of loop - rename in pipe
-    pname = sbranchs[0]['Component_1_Name']  # get the pipe name
-    apipe = idf.getobject('Pipe:Adiabatic'.upper(), pname)  # get pipe
+    apipe = spipes[0]  # get pipe
     apipe.Inlet_Node_Name = newplantloop[sameinnode]
-    pname = sbranchs[-1]['Component_1_Name']  # get the pipe name
-    apipe = idf.getobject('Pipe:Adiabatic'.upper(), pname)  # get pipe
+    apipe = spipes[-1]  # get pipe
     apipe.Outlet_Node_Name = newplantloop[sameoutnode]
     # -------- <testing ---------
     testn = doingtesting(testing, testn, newplantloop)
@@ -682,9 +774,11 @@ def makeplantloop(idf, loopname, sloop, dloop, testing=None):
 
     # demand side
     dbranchs = []
+    dpipes = []  # the pipes made by makepipebranch
     for bname in dbranchnames:
         branch = makepipebranch(idf, bname)
         dbranchs.append(branch)
+        dpipes.append(idf.idfobjects['PIPE:ADIABATIC'][-1])
     # -------- <testing ---------
     testn = doingtesting(testing, testn, newplantloop)
     if testn == None:
@@ -703,11 +797,9 @@ def makeplantloop(idf, loopname, sloop, dloop, testing=None):
         returnnone()
     # -------- testing> ---------
     # rename inlet outlet of endpoints of loop - rename in pipe
-    pname = dbranchs[0]['Component_1_Name']  # get the pipe name
-    apipe = idf.getobject('Pipe:Adiabatic'.upper(), pname)  # get pipe
+    apipe = dpipes[0]  # get pipe
     apipe.Inlet_Node_Name = newplantloop[sameinnode]
-    pname = dbranchs[-1]['Component_1_Name']  # get the pipe name
-    apipe = idf.getobject('Pipe:Adiabatic'.upper(), pname)  # get pipe
+    apipe = dpipes[-1]  # get pipe
     apipe.Outlet_Node_Name = newplantloop[sameoutnode]
     # -------- <testing ---------
     testn = doingtesting(testing, testn, newplantloop)
@@ -833,9 +925,11 @@ def makecondenserloop(idf, loopname, sloop, dloop, testing=None):
 
     # supply side
     sbranchs = []
+    spipes = []  # the pipes made by makepipebranch
     for bname in sbranchnames:
         branch = makepipebranch(idf, bname)
         sbranchs.append(branch)
+        spipes.append(idf.idfobjects['PIPE:ADIABATIC'][-1])
     # -------- <testing ---------
     testn = doingtesting(testing, testn, newcondenserloop)
     if testn == None:
@@ -854,11 +948,9 @@ def makecondenserloop(idf, loopname, sloop, dloop, testing=None):
         returnnone()
     # -------- testing> ---------
     # rename inlet outlet of endpoints of loop - rename in pipe
-    pname = sbranchs[0]['Component_1_Name']  # get the pipe name
-    apipe = idf.getobject('Pipe:Adiabatic'.upper(), pname)  # get pipe
+    apipe = spipes[0]  # get pipe
     apipe.Inlet_Node_Name = newcondenserloop[sameinnode]
-    pname = sbranchs[-1]['Component_1_Name']  # get the pipe name
-    apipe = idf.getobject('Pipe:Adiabatic'.upper(), pname)  # get pipe
+    apipe = spipes[-1]  # get pipe
     apipe.Outlet_Node_Name = newcondenserloop[sameoutnode]
     # -------- <testing ---------
     testn = doingtesting(testing, testn, newcondenserloop)
@@ -868,9 +960,11 @@ def makecondenserloop(idf, loopname, sloop, dloop, testing=None):
 
     # demand side
     dbranchs = []
+    dpipes = []  # the pipes made by makepipebranch
     for bname in dbranchnames:
         branch = makepipebranch(idf, bname)
         dbranchs.append(branch)
+        dpipes.append(idf.idfobjects['PIPE:ADIABATIC'][-1])
     # -------- <testing ---------
     testn = doingtesting(testing, testn, newcondenserloop)
     if testn == None:
@@ -889,11 +983,9 @@ def makecondenserloop(idf, loopname, sloop, dloop, testing=None):
         returnnone()
     # -------- testing> ---------
     # rename inlet outlet of endpoints of loop - rename in pipe
-    pname = dbranchs[0]['Component_1_Name']  # get the pipe name
-    apipe = idf.getobject('Pipe:Adiabatic'.upper(), pname)  # get pipe
+    apipe = dpipes[0]  # get pipe
     apipe.Inlet_Node_Name = newcondenserloop[sameinnode]
-    pname = dbranchs[-1]['Component_1_Name']  # get the pipe name
-    apipe = idf.getobject('Pipe:Adiabatic'.upper(), pname)  # get pipe
+    apipe = dpipes[-1]  # get pipe
     apipe.Outlet_Node_Name = newcondenserloop[sameoutnode]
     # -------- <testing ---------
     testn = doingtesting(testing, testn, newcondenserloop)
@@ -988,7 +1080,7 @@ def getmakeidfobject(idf, key, name):
         return idfobject
 
 def replacebranch1(idf, loop, branchname, listofcomponents_tuples, fluid=None,
-                   debugsave=False):
+                   debugsave=False, nodeindex=None):
     """do I even use this ? .... yup! I do"""
     if fluid is None:
         fluid = ''
@@ -999,15 +1091,21 @@ def replacebranch1(idf, loop, branchname, listofcomponents_tuples, fluid=None,
         comp = getmakeidfobject(idf, comp_type.upper(), comp_name)
         listofcomponents.append((comp, compnode))
     newbr = replacebranch(idf, loop, branch, listofcomponents,
-                          debugsave=debugsave, fluid=fluid)
+                          debugsave=debugsave, fluid=fluid,
+                          nodeindex=nodeindex)
     return newbr
 
 def replacebranch(idf, loop, branch,
                   listofcomponents, fluid=None,
                   debugsave=False,
-                  testing=None):
+                  testing=None,
+                  nodeindex=None):
     """It will replace the components in the branch with components in
-    listofcomponents"""
+    listofcomponents
+
+    When replacing many branches, make a NodeIndex of the idf once and
+    pass it as nodeindex. The nodes are then renamed through the index
+    instead of looking at all the objects in the model each time"""
     if fluid is None:
         fluid = ''
     # -------- testing ---------
@@ -1023,6 +1121,10 @@ def replacebranch(idf, loop, branch,
     listofcomponents = _clean_listofcomponents(listofcomponents)
 
     components = [item[0] for item in listofcomponents]
+    if nodeindex is None:
+        changedobjects = None  # look at all the objects
+    else:
+        changedobjects = components + [branch]
     connectcomponents(idf, listofcomponents, fluid=fluid)
     if debugsave:
         idf.savecopy("hhh3.idf")
@@ -1045,7 +1147,7 @@ def replacebranch(idf, loop, branch,
 
     # # gather all renamed nodes
     # # do the renaming
-    renamenodes(idf, 'node')
+    renamenodes(idf, 'node', idfobjects=changedobjects, nodeindex=nodeindex)
     if debugsave:
         idf.savecopy("hhh7.idf")
     # -------- testing ---------
@@ -1167,7 +1269,7 @@ def replacebranch(idf, loop, branch,
 
     # # gather all renamed nodes
     # # do the renaming
-    renamenodes(idf, 'node')
+    renamenodes(idf, 'node', idfobjects=changedobjects, nodeindex=nodeindex)
     # -------- testing ---------
     testn = doingtesting(testing, testn)
     if testn == None:
@@ -1177,6 +1279,128 @@ def replacebranch(idf, loop, branch,
         idf.savecopy("hhh9.idf")
     return thebranch
 
+_LOOPMAKERS = {
+    'PLANTLOOP': (makeplantloop, 'Water'),
+    'CONDENSERLOOP': (makecondenserloop, 'Water'),
+    'AIRLOOPHVAC': (makeairloop, 'Air'), }
+
+
+def _objectcounts(idf):
+    """{key: number of objects} of the model"""
+    return dict((key, len(idfobjects))
+                for key, idfobjects in idf.model.dt.items())
+
+
+def _newobjects(idf, counts):
+    """the objects made since the counts were taken"""
+    newobjects = []
+    for key in idf.model.dtls:
+        count = counts.get(key, 0)
+        if len(idf.model.dt[key]) > count:
+            newobjects.extend(idf.idfobjects[key][count:])
+    return newobjects
+
+
+def buildloop(idf, loopkey, loopname, sloop, dloop, branches=None,
+              fluid=None, nodeindex=None):
+    """make a loop and put the components into its branches
+
+    Parameters
+    ----------
+    idf : modeleditor.IDF
+        the model
+    loopkey : str
+        PLANTLOOP, CONDENSERLOOP or AIRLOOPHVAC
+    loopname, sloop, dloop :
+        same as in makeplantloop, makecondenserloop and makeairloop
+    branches : dict, optional
+        {branchname: listofcomponents_tuples}. The components of each
+        branch, as in replacebranch1. A component that is not in the
+        model is made
+    fluid : str, optional
+        as in replacebranch. Defaults to Water, or Air for an AIRLOOPHVAC
+    nodeindex : NodeIndex, optional
+        used to rename the nodes. It is made if not given
+
+    Returns
+    -------
+    list
+        all the objects made, the loop first
+    """
+    return _buildloop(idf, {}, loopkey, loopname, sloop, dloop,
+                      branches=branches, fluid=fluid, nodeindex=nodeindex)
+
+
+def _buildloop(idf, components, loopkey, loopname, sloop, dloop,
+               branches=None, fluid=None, nodeindex=None):
+    """buildloop. components is {KEY: {NAME: idfobject}} of the
+    components already looked up"""
+    loopkey = loopkey.upper()
+    try:
+        makeloop, defaultfluid = _LOOPMAKERS[loopkey]
+    except KeyError:
+        raise WhichLoopError("%s is not a loop" % (loopkey, ))
+    if fluid is None:
+        fluid = defaultfluid
+    if branches is None:
+        branches = {}
+    counts = _objectcounts(idf)
+    loop = makeloop(idf, loopname, sloop, dloop)
+    newobjects = _newobjects(idf, counts)
+    if nodeindex is None:
+        nodeindex = NodeIndex(idf)
+    else:
+        for idfobject in newobjects:
+            nodeindex.add(idfobject)
+    branchobjects = {}
+    for idfobject in reversed(newobjects):
+        if idfobject.key.upper() == 'BRANCH':
+            branchobjects[idfobject.Name.upper()] = idfobject
+    for idfobject in newobjects:
+        key = idfobject.key.upper()
+        if key in components:
+            # looked up for an earlier loop. the first object of a name
+            # is used, as when the components are looked up
+            components[key].setdefault(idfobject.Name.upper(), idfobject)
+    missing = [branchname for branchname in branches
+               if branchname.upper() not in branchobjects]
+    if missing:
+        astr = "branches %s are not in the loop %s" % (
+            ', '.join(missing), loopname)
+        raise NoSuchBranchError(astr)
+    for branchname, listofcomponents_tuples in branches.items():
+        listofcomponents = []
+        for comp_type, comp_name, compnode in _clean_listofcomponents_tuples(
+                listofcomponents_tuples):
+            key = comp_type.upper()
+            if key not in components:
+                components[key] = dict(
+                    [(idfobject.Name.upper(), idfobject)
+                     for idfobject in reversed(idf.idfobjects[key])])
+            try:
+                comp = components[key][comp_name.upper()]
+            except KeyError:
+                comp = idf.newidfobject(key, Name=comp_name)
+                components[key][comp_name.upper()] = comp
+                nodeindex.add(comp)
+            listofcomponents.append((comp, compnode))
+        replacebranch(idf, loop, branchobjects[branchname.upper()],
+                      listofcomponents, fluid=fluid, nodeindex=nodeindex)
+    return [loop] + [idfobject for idfobject in _newobjects(idf, counts)
+                     if idfobject is not loop]
+
+
+def buildloops(idf, loopspecs):
+    """make many loops with buildloop
+
+    loopspecs is a list of dicts with the arguments of buildloop.
+    The nodes of all the loops are renamed with one NodeIndex.
+    Returns a list with the objects made for each loop"""
+    nodeindex = NodeIndex(idf)
+    components = {}
+    return [_buildloop(idf, components, nodeindex=nodeindex, **loopspec)
+            for loopspec in loopspecs]
+
 def main():
     """the main routine"""
     from six import StringIO
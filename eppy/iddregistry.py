@@ -0,0 +1,161 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""A registry of the parsed IDD files, so that one process can work with
+several versions of EnergyPlus.
+
+Each IDD file is parsed once. All the IDF instances that use it share the
+parsed data. An IDF can be bound to its own IDD with IDF(fname, idd=iddname),
+instead of the IDD set for the class with IDF.setiddname.
+
+The IDDs are keyed by the absolute path of the IDD file. An IDD given as a
+file handle is keyed by a hash of its text, so that handles with the same
+text, such as StringIO(iddtxt) made for each IDF, share one entry.
+
+For a pool of forked workers, parse the IDDs in the parent with preloadidd
+and call freezeidds just before the fork. The workers then use the parsed
+IDDs of the parent, that stay in memory pages shared with the parent.
+See eppy/useful_scripts/iddpreload_benchmark.py.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+import hashlib
+import os
+import weakref
+
+from six import StringIO
+from six import string_types
+
+
+class ParsedIDD(object):
+    """the data of a parsed IDD, as set on the IDF by IDF.setidd"""
+    def __init__(self, iddname, idd_info, block, idd_index, idd_version):
+        super(ParsedIDD, self).__init__()
+        self.iddname = iddname
+        self.idd_info = idd_info
+        self.block = block
+        self.idd_index = idd_index
+        self.idd_version = idd_version
+
+    def __repr__(self):
+        return "ParsedIDD(%r, version=%r)" % (self.iddname, self.idd_version)
+
+
+_IDDS = {}  # {iddkey(iddname): ParsedIDD}
+_HANDLEKEYS = weakref.WeakKeyDictionary()  # {fhandle: handlekey(fhandle)}
+
+
+def handlekey(fhandle):
+    """the key of the IDD in the file handle fhandle, a hash of all its
+    text. fhandle itself if its text cannot be read without moving in it"""
+    try:
+        text = fhandle.getvalue()
+    except AttributeError:
+        try:
+            position = fhandle.tell()
+            fhandle.seek(0)
+            text = fhandle.read()
+            fhandle.seek(position)
+        except (AttributeError, IOError, ValueError):
+            return fhandle
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    return ('md5', hashlib.md5(text).hexdigest())
+
+
+def iddkey(iddname):
+    """the key of iddname in the registry. The key of a file handle is
+    kept, so that its text is hashed once"""
+    if isinstance(iddname, string_types):
+        return os.path.abspath(iddname)
+    try:
+        return _HANDLEKEYS[iddname]
+    except (KeyError, TypeError):
+        pass
+    key = handlekey(iddname)
+    try:
+        _HANDLEKEYS[iddname] = key
+    except TypeError:  # no weak references to this handle
+        pass
+    return key
+
+
+def registeridd(iddname, idd_info, block, idd_index, idd_version):
+    """add the parsed IDD iddname to the registry and return its
+    ParsedIDD. Replaces the IDD already registered for iddname"""
+    parsed = ParsedIDD(iddname, idd_info, block, idd_index, idd_version)
+    _IDDS[iddkey(iddname)] = parsed
+    return parsed
+
+
+def getidd(iddname):
+    """the ParsedIDD of iddname. None if it has not been parsed"""
+    if iddname is None:
+        return None
+    return _IDDS.get(iddkey(iddname))
+
+
+def iddforversion(versionid):
+    """the ParsedIDD of a registered IDD of the EnergyPlus version
+    versionid, such as '8.9' or '8.9.0'. Only the first two numbers are
+    compared. None if there is none"""
+    wanted = versionid.strip().split('.')[:2]
+    for parsed in _IDDS.values():
+        version = [str(num) for num in parsed.idd_version[:2]]
+        if len(wanted) == 1:
+            version = version[:1]
+        if version == wanted:
+            return parsed
+    return None
+
+
+def registeredidds():
+    """the ParsedIDD of all the registered IDDs"""
+    return list(_IDDS.values())
+
+
+def clearidds():
+    """empty the registry. The IDF instances keep the IDD they use"""
+    _IDDS.clear()
+
+
+def preloadidd(iddname=None):
+    """parse the IDD iddname, if it is not in the registry already, and
+    return its ParsedIDD. iddname defaults to the IDD of the IDF class"""
+    from eppy.modeleditor import IDDNotSetError  # modeleditor imports this
+    from eppy.modeleditor import IDF
+    if iddname is None:
+        iddname = IDF.getiddname()
+        if iddname is None:
+            errortxt = ("no IDD to preload. "
+                        "Set it using IDF.setiddname(iddfile)")
+            raise IDDNotSetError(errortxt)
+    parsed = getidd(iddname)
+    if parsed is None:
+        IDF(StringIO(''), idd=iddname)
+        parsed = getidd(iddname)
+    return parsed
+
+
+def freezeidds():
+    """move all the objects that the garbage collector tracks, the parsed
+    IDDs among them, to a generation that it does not scan (gc.freeze).
+
+    Call it in the parent just before forking the workers. Collections in
+    the workers then do not write into the memory pages of the parsed IDDs,
+    so these pages stay shared with the parent. Pages still get copied
+    when the reference count of an object in them changes. Returns False
+    if gc.freeze is not available (python 3.7 and later)"""
+    try:
+        freeze = gc.freeze
+    except AttributeError:
+        return False
+    freeze()
+    return True
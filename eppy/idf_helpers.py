@@ -20,6 +20,9 @@ from past.builtins import basestring    # pip install future
 
 from eppy.modeleditor import IDF
 from eppy.bunch_subclass import BadEPFieldError
+from eppy.bunch_subclass import EpBunch
+from eppy.bunchhelpers import makefieldname
+from eppy.idf_msequence import ModelOrder
 
 def idfobjectkeys(idf):
     """returns the object keys in the order they were in the IDD file
@@ -59,56 +62,182 @@ def getobject_use_prevfield(idf, idfobject, fieldname):
         return None
     return foundobj
     
+# cache of the Node_Name fields of each IDD
+# {id(idd_info): (idd_info, [(KEY, [index, ...]), ...])}
+# idd_info is kept in the cache so that its id is not reused
+_NODEFIELDS = {}
+
+
+def nodefieldindexes(idf):
+    """return [(KEY, [index, ...]), ...] for the keys that have fields
+    ending with Node_Name, in the order of the IDD.
+    calculated once for each IDD and cached"""
+    idd_info = idf.idd_info
+    try:
+        cached, nodefields = _NODEFIELDS[id(idd_info)]
+        if cached is idd_info:
+            return nodefields
+    except KeyError:
+        pass
+    nodefields = []
+    for key, objidd in zip(idf.model.dtls, idd_info):
+        indexes = [i for i, comm in enumerate(objidd)
+                   if i > 0 and makefieldname(
+                       comm.get('field', [''])[0]).endswith('Node_Name')]
+        if indexes:
+            nodefields.append((key, indexes))
+    _NODEFIELDS[id(idd_info)] = (idd_info, nodefields)
+    return nodefields
+
+
 def getidfkeyswithnodes():
     """return a list of keys of idfobjects that hve 'None Name' fields"""
     idf = IDF(StringIO(""))
-    keys = idfobjectkeys(idf)
-    keysfieldnames = ((key, idf.newidfobject(key.upper()).fieldnames) 
-                for key in keys)
-    keysnodefdnames = ((key,  (name for name in fdnames 
-                                if (name.endswith('Node_Name')))) 
-                            for key, fdnames in keysfieldnames)
-    nodekeys = [key for key, fdnames in keysnodefdnames if list(fdnames)]
-    return nodekeys
+    return [key for key, _ in nodefieldindexes(idf)]
+
+
+class NodeObjectIndex(object):
+    """node name -> the objects that have the node in a Node_Name field
+
+    Use nodeindex(idf) to get it. Once made, it is kept up to date by
+    Idf_MSequence when objects are added or removed and by EpBunch when a
+    field is set. After changing the node names directly in
+    idfobject.obj, call idfobject.fieldschanged()"""
+    def __init__(self, idf):
+        super(NodeObjectIndex, self).__init__()
+        self.idfobjects = idf.idfobjects
+        self.positions = dict(nodefieldindexes(idf))
+        self.nodes = {}  # {nodename: {id(idfobject): idfobject}}
+        self.objnodes = {}  # {id(idfobject): nodenames}
+        self.orders = {}  # {KEY: ModelOrder} of the keys with nodes
+        for key in self.positions:
+            self.orders[key] = ModelOrder(idf.idfobjects[key])
+            for idfobject in idf.idfobjects[key]:
+                self.index(idfobject)
+
+    def nodenames(self, idfobject):
+        """the node names in the Node_Name fields of idfobject"""
+        obj = idfobject.obj
+        indexes = self.positions.get(obj[0].upper(), ())
+        return set(obj[i] for i in indexes
+                   if i < len(obj) and isinstance(obj[i], basestring))
+
+    def add(self, idfobject):
+        """add idfobject to the index"""
+        if not isinstance(idfobject, EpBunch):
+            return
+        order = self.orders.get(idfobject.obj[0].upper())
+        if order is not None:
+            order.add(idfobject)
+        self.index(idfobject)
+
+    def remove(self, idfobject):
+        """remove idfobject from the index"""
+        if isinstance(idfobject, EpBunch):
+            order = self.orders.get(idfobject.obj[0].upper())
+            if order is not None:
+                order.remove(idfobject)
+        self.unindex(idfobject)
+
+    def index(self, idfobject):
+        """index the node names of idfobject"""
+        nodenames = self.nodenames(idfobject)
+        if not nodenames:
+            return
+        self.objnodes[id(idfobject)] = nodenames
+        for nodename in nodenames:
+            self.nodes.setdefault(nodename, {})[id(idfobject)] = idfobject
+
+    def unindex(self, idfobject):
+        """drop the node names of idfobject from the index"""
+        for nodename in self.objnodes.pop(id(idfobject), ()):
+            objects = self.nodes[nodename]
+            objects.pop(id(idfobject), None)
+            if not objects:
+                del self.nodes[nodename]
+
+    def update(self, idfobject, fieldindex=None):
+        """update the index after the field fieldindex of idfobject
+        changed. None if any field could have changed"""
+        if fieldindex is not None:
+            indexes = self.positions.get(idfobject.obj[0].upper(), ())
+            if fieldindex not in indexes:
+                return
+        # the object keeps its place in self.orders
+        self.unindex(idfobject)
+        self.index(idfobject)
+
+    def sort(self, key, idfobjects):
+        """idfobjects of key in model order"""
+        return self.orders[key.upper()].sort(idfobjects)
+
+    def objects(self, nodename):
+        """the objects with this node name"""
+        found = self.nodes.get(nodename, {}).values()
+        # checked, in case obj was changed without fieldschanged
+        return [idfobject for idfobject in found
+                if nodename in self.nodenames(idfobject)]
+
+
+def nodeindex(idf):
+    """return the NodeObjectIndex of the idf
+
+    It is made the first time and kept in the idf. It is made again if the
+    idf is read again"""
+    indexes = idf._indexes.setdefault(None, {})
+    index = indexes.get('nodes')
+    if index is None or index.idfobjects is not idf.idfobjects:
+        index = NodeObjectIndex(idf)
+        indexes['nodes'] = index
+    return index
+
 
 def getobjectswithnode(idf, nodekeys, nodename):
     """return all objects that mention this node name"""
-    keys = nodekeys
-    # TODO getidfkeyswithnodes needs to be done only once. take out of here
-    listofidfobjects = (idf.idfobjects[key.upper()] 
-                for key in keys if idf.idfobjects[key.upper()])
-    idfobjects = [idfobj 
-                    for idfobjs in listofidfobjects 
-                        for idfobj in idfobjs]
+    keys = [key.upper() for key in nodekeys]
+    keyorder = dict((key, i) for i, key in enumerate(keys))
+    index = nodeindex(idf)
+    bykey = {}  # {KEY: {id(idfobject): idfobject}}
+    for idfobject in index.objects(nodename):
+        key = idfobject.key.upper()
+        if key in keyorder:
+            bykey.setdefault(key, {})[id(idfobject)] = idfobject
     objwithnodes = []
-    for obj in idfobjects:
-        values = obj.fieldvalues
-        fdnames = obj.fieldnames
-        for value, fdname in zip(values, fdnames):
-            if fdname.endswith('Node_Name'):
-                if value == nodename:
-                    objwithnodes.append(obj)
-                    break
+    for key in sorted(bykey, key=lambda key: keyorder[key]):
+        objwithnodes.extend(index.sort(key, list(bykey[key].values())))
     return objwithnodes
     
 def name2idfobject(idf, groupnamess=None, objkeys=None, **kwargs):
     """return the object, if the Name or some other field is known.
     send filed in **kwargs as Name='a name', Roughness='smooth'
-    Returns the first find (field search is unordered)
+    Returns the first object that matches one of the fields
     objkeys -> if objkeys=['ZONE', 'Material'], search only those
     groupnames -> not yet coded"""
-    # TODO : this is a very slow search. revist to speed it up.
     if not objkeys:
         objkeys = idfobjectkeys(idf)
     for objkey in objkeys:
         idfobjs = idf.idfobjects[objkey.upper()]
-        for idfobj in idfobjs:
-            for key, val in kwargs.items():
-                try:
-                    if idfobj[key] == val:
-                        return idfobj
-                except BadEPFieldError as e:
-                    continue
+        if not idfobjs:
+            continue
+        found = []
+        for key, val in kwargs.items():
+            if callable(val) or key in ('key', 'places'):
+                # query would not take these, so compare each field
+                found.extend(idfobj for idfobj in idfobjs
+                             if key in idfobj.objls and idfobj[key] == val)
+                continue
+            try:
+                # query finds all the objects that match, ignoring case
+                # and to some decimal places. keep only the exact ones
+                idfobjsfound = idf.query(objkey, **{key: val})
+            except BadEPFieldError as e:
+                continue
+            found.extend(idfobj for idfobj in idfobjsfound
+                         if idfobj[key] == val)
+        if found:
+            positions = dict((id(idfobj), i)
+                             for i, idfobj in enumerate(idfobjs))
+            return min(found, key=lambda idfobj: positions[id(idfobj)])
 
 def getidfobjectlist(idf):
     """return a list of all idfobjects in idf"""
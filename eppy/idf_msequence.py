@@ -22,6 +22,7 @@ from __future__ import unicode_literals
 import collections
 
 from eppy.bunch_subclass import EpBunch
+from eppy.bunch_subclass import idfindexes
 
 
 class Idf_MSequence(collections.MutableSequence):
@@ -51,10 +52,20 @@ class Idf_MSequence(collections.MutableSequence):
         """Gets an idfobject (bunch) from list1."""
         return self.list1[i]
 
+    def _indexes(self, v):
+        """The indexes of the IDF for v. See bunch_subclass.idfindexes."""
+        if isinstance(v, EpBunch):
+            return idfindexes(self.theidf, v.obj[0])
+        return []
+
     def __setitem__(self, i, v):
         """Sets an idfobject (bunch) to list1 and its object to list2."""
+        for index in self._indexes(self.list1[i]):
+            index.remove(self.list1[i])
         self.list1[i] = v
         self.list2[i] = v.obj
+        for index in self._indexes(v):
+            index.add(v)
 
     def __delitem__(self, i):
         """Deletes an idfobject (bunch) from list1 and its object from list2."""
@@ -63,6 +74,8 @@ class Idf_MSequence(collections.MutableSequence):
             v.theidf = None
         del self.list1[i]
         del self.list2[i]
+        for index in self._indexes(v):
+            index.remove(v)
 
     def __len__(self):
         """Number of idfobjects (bunches)."""
@@ -74,6 +87,62 @@ class Idf_MSequence(collections.MutableSequence):
         self.list2.insert(i, v.obj)
         if isinstance(v, EpBunch):
             v.theidf = self.theidf
+        for index in self._indexes(v):
+            index.add(v)
+
+    def extend(self, values):
+        """Append idfobjects (bunches) to list1 and their objects to list2,
+        all at once."""
+        values = list(values)
+        self.list1.extend(values)
+        self.list2.extend(v.obj for v in values)
+        for v in values:
+            if isinstance(v, EpBunch):
+                v.theidf = self.theidf
+            for index in self._indexes(v):
+                index.add(v)
+
+    def removeall(self, values):
+        """Remove idfobjects (bunches) from list1 and their objects from
+        list2, in one pass. The idfobjects are found by identity, not by
+        equality as in remove."""
+        ids = set(id(v) for v in values)
+        if not ids:
+            return
+        kept1, kept2, removed = [], [], []
+        for v, obj in zip(self.list1, self.list2):
+            if id(v) in ids:
+                removed.append(v)
+            else:
+                kept1.append(v)
+                kept2.append(obj)
+        # list2 is also in IDF.model.dt, so it is changed in place
+        self.list1[:] = kept1
+        self.list2[:] = kept2
+        for v in removed:
+            v.theidf = None
+            for index in self._indexes(v):
+                index.remove(v)
+
+    def column(self, fieldname):
+        """The values of fieldname of all the idfobjects, as a numpy array.
+        Numeric fields give a float array, with nan for the values that are
+        not numbers. See columnar.getcolumn. Needs numpy."""
+        from eppy import columnar  # numpy is needed only here
+        if not self.list1:
+            return columnar.getcolumn(self.list1, fieldname)
+        inblock = columnar.keyblock(self.theidf, self.list1[0].obj[0])
+        return columnar.getcolumn(self.list1, fieldname, inblock)
+
+    def set_column(self, fieldname, values):
+        """Set fieldname of each of the idfobjects to the value in values,
+        in one pass. The values are converted to the type of the field in
+        the IDD. See columnar.setcolumn. Needs numpy."""
+        from eppy import columnar  # numpy is needed only here
+        if not self.list1:
+            return columnar.setcolumn(self.list1, fieldname, values)
+        inblock = columnar.keyblock(self.theidf, self.list1[0].obj[0])
+        columnar.setcolumn(self.list1, fieldname, values, inblock)
 
     def __str__(self):
         """String representation of the list of idfobjects (bunches)."""
@@ -86,3 +155,47 @@ class Idf_MSequence(collections.MutableSequence):
     def __eq__(self, other):
         """Test for equality uses the IDF.model.dt list, list2."""
         return self.list2 == other.list2
+
+
+class ModelOrder(object):
+    """The positions of the idfobjects of an Idf_MSequence, to put some of
+    them in model order without looking at all of them.
+
+    Used by the indexes of the IDF (see bunch_subclass.idfindexes), that
+    call add and remove when the sequence changes. An object appended to
+    the sequence gets the next position. If an object is put anywhere else,
+    the positions are made again the next time they are needed."""
+    def __init__(self, idfobjects):
+        super(ModelOrder, self).__init__()
+        self.idfobjects = idfobjects
+        self.positions = None  # {id(idfobject): position}, made when needed
+        self.last = 0  # the position of the last object
+
+    def add(self, idfobject):
+        """idfobject was added to the sequence"""
+        if self.positions is None:
+            return
+        list1 = self.idfobjects.list1
+        if list1 and list1[-1] is idfobject:
+            self.last += 1
+            self.positions[id(idfobject)] = self.last
+        else:
+            self.positions = None
+
+    def remove(self, idfobject):
+        """idfobject was removed from the sequence"""
+        if self.positions is not None:
+            self.positions.pop(id(idfobject), None)
+
+    def sort(self, idfobjects):
+        """idfobjects, all in the sequence, in the order of the sequence"""
+        if len(idfobjects) < 2:
+            return list(idfobjects)
+        if self.positions is None:
+            self.positions = dict(
+                (id(idfobject), position)
+                for position, idfobject in enumerate(self.idfobjects.list1))
+            self.last = len(self.positions)
+        positions = self.positions
+        return sorted(idfobjects,
+                      key=lambda idfobject: positions[id(idfobject)])
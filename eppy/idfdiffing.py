@@ -0,0 +1,86 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""Find the objects that differ between two idfs.
+
+Used by eppy/useful_scripts/idfdiff.py and by json_functions.makepatch"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+try:
+    from itertools import zip_longest as zip_longest
+except ImportError:
+    from itertools import izip_longest as zip_longest
+
+from eppy.bunch_subclass import BadEPFieldError
+
+
+def getobjname(item):
+    """return obj name or blank """
+    try:
+        objname = item.Name
+    except BadEPFieldError as e:
+        objname = ' '
+    return objname
+
+
+def normalobj(obj):
+    """return obj as a tuple that can be hashed, with the key in upper case"""
+    return (obj[0].upper(), ) + tuple(obj[1:])
+
+
+def namedobjs(idfobjs):
+    """return {name: [normalized objs]} of the idfobjs of one key"""
+    named = {}
+    for idfobj in idfobjs:
+        named.setdefault(getobjname(idfobj), []).append(
+            normalobj(idfobj.obj))
+    return named
+
+
+def keydiffs(args):
+    """return the diffs between the objects of one key.
+    args is (akey, fieldnames, named1, named2, idfname1, idfname2), where
+    named1 and named2 are from namedobjs. Only plain lists and strings are
+    used, so that keydiffs can run in another process"""
+    akey, fieldnames, named1, named2, idfname1, idfname2 = args
+    thediffs = {}
+    for name in sorted(set(named1) | set(named2)):
+        objs1 = named1.get(name, [])
+        objs2 = named2.get(name, [])
+        if collections.Counter(objs1) == collections.Counter(objs2):
+            continue  # the same objects, in any order
+        for obj1, obj2 in zip_longest(sorted(objs1), sorted(objs2)):
+            if obj1 == None:
+                thediffs[(obj2[0], name)] = (None, idfname2)
+                break
+            if obj2 == None:
+                thediffs[(obj1[0], name)] = (idfname1, None)
+                break
+            if obj1 == obj2:
+                continue
+            for i, (f1, f2) in enumerate(zip(obj1, obj2)):
+                if f1 != f2:
+                    thediffs[(akey, name, fieldnames[i])] = (f1, f2)
+    return thediffs
+
+
+def changedkeys(idf1, idf2):
+    """yield (akey, objidd, named1, named2) for the keys whose objects are
+    not the same in the two idfs. named1 and named2 are from namedobjs"""
+    keys = idf1.model.dtls # undocumented variable
+    for akey, objidd in zip(keys, idf1.idd_info):
+        idfobjs1 = idf1.idfobjects[akey]
+        idfobjs2 = idf2.idfobjects[akey]
+        if not idfobjs1 and not idfobjs2:
+            continue
+        named1 = namedobjs(idfobjs1)
+        named2 = namedobjs(idfobjs2)
+        if named1 != named2:
+            yield akey, objidd, named1, named2
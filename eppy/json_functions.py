@@ -11,6 +11,12 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import multiprocessing
+
+from eppy import modeleditor
+from eppy.bunchhelpers import makefieldname
+from eppy import idfdiffing
+
 def key2elements(key):
     """split key to elements"""
     # words = key.split('.')
@@ -36,16 +42,216 @@ def key2elements(key):
     
 def updateidf(idf, dct):
     """update idf using dct"""
+    # {OBJKEY: {NAME: idfobj}}, made as the keys are used
+    named = {}
     for key in list(dct.keys()):
         if key.startswith('idf.'):
             idftag, objkey, objname, field = key2elements(key)
-            if objname == '':
-                try:
-                    idfobj = idf.idfobjects[objkey.upper()][0]
-                except IndexError as e:
-                    idfobj = idf.newidfobject(objkey.upper())
-            else:
-                idfobj = idf.getobject(objkey.upper(), objname)
-                if idfobj == None:
-                    idfobj = idf.newidfobject(objkey.upper(), Name=objname)
-            idfobj[field] = dct[key]
\ No newline at end of file
+            idfobj = keyobject(idf, named, objkey.upper(), objname)
+            idfobj[field] = dct[key]
+
+
+def keyobject(idf, named, objkey, objname):
+    """return the object that updateidf changes for objkey and objname.
+    It is made if it is not in idf. named is as in getnamed"""
+    if objname == '':
+        try:
+            idfobj = idf.idfobjects[objkey][0]
+        except IndexError as e:
+            idfobj = idf.newidfobject(objkey)
+    else:
+        idfobj = getnamed(idf, named, objkey, objname)
+        if idfobj == None:
+            idfobj = idf.newidfobject(objkey, Name=objname)
+            named[objkey].setdefault(objname.upper(), idfobj)
+    return idfobj
+
+
+def objectname(idfobj):
+    """the value of the second field of idfobj, as used by getobject"""
+    try:
+        return idfobj.obj[1]
+    except IndexError:
+        return ''
+
+
+def getnamed(idf, named, objkey, objname):
+    """same as idf.getobject(objkey, objname), looked up in named
+    named is {OBJKEY: {NAME: idfobj}}. it is made for objkey if needed"""
+    try:
+        objects = named[objkey]
+    except KeyError:
+        objects = {}
+        for idfobj in reversed(idf.idfobjects[objkey]):
+            objects[objectname(idfobj).upper()] = idfobj
+        named[objkey] = objects
+    idfobj = objects.get(objname.upper())
+    if idfobj is not None and objectname(idfobj).upper() == objname.upper():
+        return idfobj
+    # the name has changed since named was made
+    idfobj = idf.getobject(objkey, objname)
+    if idfobj is not None:
+        objects[objname.upper()] = idfobj
+    return idfobj
+
+
+def makepatch(idf1, idf2):
+    """return the patch that changes idf1 into idf2
+
+    The patch is a dict that can be saved as json::
+
+        {'removed': [[OBJKEY, name], ...],
+         'added': [[OBJKEY, field1, field2, ...], ...],
+         'changed': {'idf.OBJKEY.name.Field_Name': value, ...}}
+
+    The objects are matched by key and name as in idfdiffing.keydiffs.
+    An object whose fields changed is in 'changed', in the format of
+    updateidf. Objects that are not in both idfs, that have more or less
+    fields or that share their name with other objects are removed by name
+    and added again"""
+    removed = []
+    added = []
+    changed = {}
+    for objkey, objidd, named1, named2 in idfdiffing.changedkeys(idf1, idf2):
+        fieldnames = [makefieldname(comm.get('field', [''])[0])
+                      for comm in objidd]
+        for name in sorted(set(named1) | set(named2)):
+            objs1 = named1.get(name, [])
+            objs2 = named2.get(name, [])
+            if sorted(objs1) == sorted(objs2):
+                continue
+            name = name.strip()  # idfdiffing.getobjname gives ' '
+            if len(objs1) == len(objs2) == 1:
+                obj1, obj2 = objs1[0], objs2[0]
+                # unnamed objects are found by updateidf if they are alone
+                found = name or len(idf1.idfobjects[objkey]) == 1
+                if found and len(obj1) == len(obj2) <= len(fieldnames):
+                    for i, (f1, f2) in enumerate(zip(obj1, obj2)):
+                        if f1 != f2:
+                            changed['idf.%s.%s.%s' % (
+                                objkey, name, fieldnames[i])] = f2
+                    continue
+            if objs1:
+                removed.append([objkey, name])
+            added.extend(list(obj) for obj in objs2)
+    return dict(removed=removed, added=added, changed=changed)
+
+
+def applypatch(idf, patch):
+    """change idf with a patch from makepatch
+
+    The objects are removed and added for each key at a time, and the
+    changed fields are set with updateidf"""
+    removednames = {}
+    for objkey, name in patch.get('removed', []):
+        removednames.setdefault(objkey.upper(), set()).add(name)
+    for objkey, names in removednames.items():
+        idf.filter(objkey, lambda idfobj:
+                   idfdiffing.getobjname(idfobj).strip() not in names)
+    for obj in patch.get('added', []):
+        abunch = modeleditor.obj2bunch(idf.model, idf.idd_info, list(obj))
+        idf.idfobjects[obj[0].upper()].append(abunch)
+    updateidf(idf, patch.get('changed', {}))
+    return idf
+
+
+class Sweep(object):
+    """variants of an idf, made by changing the same fields with updateidf
+    keys, such as 'idf.MATERIAL.Brick.Thickness'
+
+    The fields are found once, when the sweep is made. The objects that
+    the keys name and that are not in the idf are made, as in updateidf.
+    The variants are made from an IDF.template of the idf, so a sweep
+    can be sent to other processes.
+    Later changes to the idf are not seen by the sweep"""
+    def __init__(self, idf, keys):
+        super(Sweep, self).__init__()
+        self.keys = list(keys)
+        named = {}
+        fields = []
+        for key in self.keys:
+            idftag, objkey, objname, field = key2elements(key)
+            idfobj = keyobject(idf, named, objkey.upper(), objname)
+            fields.append((idfobj, field))
+        self.template = idf.template(fields)
+
+    def values(self, row):
+        """the values of the keys in row, a dict or a sequence of values in
+        the order of keys. Keys missing from a dict keep their value"""
+        if not isinstance(row, dict):
+            return list(row)
+        return [row.get(key, value)
+                for key, value in zip(self.keys, self.template.basevalues)]
+
+    def variantstr(self, row):
+        """the text of the variant with the values of row. see values"""
+        return self.template.idfstr(self.values(row))
+
+    def save(self, row, filename, lineendings='default', encoding='latin-1'):
+        """save the variant with the values of row, as IDF.save does"""
+        self.template.save(self.values(row), filename, lineendings, encoding)
+
+
+# the sweep of the processes of a pool in sweep
+_SWEEP = None
+
+
+def _initsweep(asweep):
+    """keep the sweep in the process"""
+    global _SWEEP
+    _SWEEP = asweep
+
+
+def _savevariant(args):
+    """save one variant with the sweep of the process"""
+    row, filename, lineendings, encoding = args
+    _SWEEP.save(row, filename, lineendings, encoding)
+    return filename
+
+
+def sweep(idf, table, filenames, processes=1,
+          lineendings='default', encoding='latin-1'):
+    """save a variant of idf for each row of table
+
+    Parameters
+    ----------
+    idf : modeleditor.IDF
+        the base idf
+    table : list or numpy.ndarray
+        a list of dicts {updateidf key: value}, or a numpy structured
+        array whose field names are updateidf keys
+    filenames : list
+        a file name for each row
+    processes : int, optional
+        the variants are saved in this many processes. If 0 is passed then
+        all CPUs are used, -1 means one less than all CPUs, etc.
+
+    Returns
+    -------
+    list
+        the file names
+    """
+    names = getattr(getattr(table, 'dtype', None), 'names', None)
+    if names:
+        keys = list(names)
+        rows = [list(row) for row in table.tolist()]
+    else:
+        keys = []
+        for row in table:
+            keys.extend(key for key in row if key not in keys)
+        rows = table
+    asweep = Sweep(idf, keys)
+    jobs = [(row, filename, lineendings, encoding)
+            for row, filename in zip(rows, filenames)]
+    if processes <= 0:
+        processes = max(1, multiprocessing.cpu_count() + processes)
+    if processes == 1 or len(jobs) < 2:
+        for row, filename, lineendings, encoding in jobs:
+            asweep.save(row, filename, lineendings, encoding)
+        return [job[1] for job in jobs]
+    pool = multiprocessing.Pool(processes, _initsweep, (asweep, ))
+    try:
+        return pool.map(_savevariant, jobs)
+    finally:
+        pool.close()
+        pool.join()
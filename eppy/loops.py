@@ -18,6 +18,31 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 
+# cache of the field indexes of each object type
+# {id(objcomm): (objcomm, {fieldname: index})}
+# objcomm is kept in the cache so that its id is not reused
+_FIELDINDEXES = {}
+
+
+def fieldindexes(commdct, objindex):
+    """return {fieldname: index} for the object at objindex in commdct
+    calculated once for each object type and cached"""
+    objcomm = commdct[objindex]
+    try:
+        cached, indexes = _FIELDINDEXES[id(objcomm)]
+        if cached is objcomm:
+            return indexes
+    except KeyError as err:
+        pass
+    indexes = {}
+    for i, dct in enumerate(objcomm):
+        try:
+            indexes.setdefault(dct['field'][0], i)
+        except KeyError as err:
+            pass
+    _FIELDINDEXES[id(objcomm)] = (objcomm, indexes)
+    return indexes
+
 def extractfields(data, commdct, objkey, fieldlists):
     """get all the objects of objkey.
     fieldlists will have a fieldlist for each of those objects.
@@ -27,30 +52,26 @@ def extractfields(data, commdct, objkey, fieldlists):
     # So we should have a field list for each instance of the object
     # and map them with a zip
     objindex = data.dtls.index(objkey)
-    objcomm = commdct[objindex]
-    objfields = []
-    # get the field names of that object
-    for dct in objcomm[0:]:
-        try:
-            thefieldcomms = dct['field']
-            objfields.append(thefieldcomms[0])
-        except KeyError as err:
-            objfields.append(None)
-    fieldindexes = []
+    objfields = fieldindexes(commdct, objindex)
+    fieldindexes_ = {}  # the same fieldlist is often repeated
     for fieldlist in fieldlists:
+        if id(fieldlist) in fieldindexes_:
+            continue
         fieldindex = []
         for item in fieldlist:
             if isinstance(item, int):
                 fieldindex.append(item)
             else:
-                fieldindex.append(objfields.index(item) + 0)
-                # the index starts at 1, not at 0
-        fieldindexes.append(fieldindex)
+                try:
+                    fieldindex.append(objfields[item])
+                except KeyError as err:
+                    raise ValueError("%s is not in list" % (item, ))
+        fieldindexes_[id(fieldlist)] = fieldindex
     theobjects = data.dt[objkey]
     fieldcontents = []
-    for theobject, fieldindex in zip(theobjects, fieldindexes):
+    for theobject, fieldlist in zip(theobjects, fieldlists):
         innerlst = []
-        for item in fieldindex:
+        for item in fieldindexes_[id(fieldlist)]:
             try:
                 innerlst.append(theobject[item])
             except IndexError as err:
@@ -91,6 +112,19 @@ def branchlist2branches(data, commdct, branchlist):
                    if name == branchlist]
     return thebranches[0]
 
+def branches_inlet_outlet(data, commdct):
+    """return {branchname: [inlet, outlet]} for all the branches
+    same as branch_inlet_outlet for each branch, in one pass"""
+    objkey = 'Branch'.upper()
+    theobjects = data.dt[objkey]
+    inletindex = 6
+    result = {}
+    for theobject in theobjects:
+        outletindex = len(theobject) - 2
+        result.setdefault(
+            theobject[1], [theobject[inletindex], theobject[outletindex]])
+    return result
+
 def branch_inlet_outlet(data, commdct, branchname):
     """return the inlet and outlet of a branch"""
     objkey = 'Branch'.upper()
@@ -161,13 +195,8 @@ def getfieldindex(data, commdct, objkey, fname):
     """given objkey and fieldname, return its index"""
     objindex = data.dtls.index(objkey)
     objcomm = commdct[objindex]
-    for i_index, item in enumerate(objcomm):
-        try:
-            if item['field'] == [fname]:
-                break
-        except KeyError as err:
-            pass
-    return i_index
+    # the last index if fname is not found
+    return fieldindexes(commdct, objindex).get(fname, len(objcomm) - 1)
 
 def getadistus(data, commdct):
     """docstring for fname"""
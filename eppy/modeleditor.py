@@ -12,6 +12,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import bisect
 import copy
 import itertools
 import os
@@ -20,10 +21,20 @@ import warnings
 
 from six import StringIO
 from six import iteritems
+from six import string_types
 
+from eppy.EPlusInterfaceFunctions.structures import CaseInsensitiveDict
 import eppy.EPlusInterfaceFunctions.iddgroups as iddgroups
+from eppy.bunch_subclass import BadEPFieldError
+from eppy.bunch_subclass import EpBunch
+from eppy.bunch_subclass import fieldline
+from eppy.bunch_subclass import idfobjectstr
+from eppy.bunchhelpers import makefieldname
 import eppy.function_helpers
 from eppy.iddcurrent import iddcurrent
+from eppy import iddregistry
+from eppy.idf_msequence import Idf_MSequence
+from eppy.idf_msequence import ModelOrder
 from eppy.idfreader import idfreader1
 from eppy.idfreader import convertafield
 from eppy.idfreader import makeabunch
@@ -229,15 +240,172 @@ def __objecthasfields(bunchdt, data, commdct, idfobject, places=7, **kwargs):
 def getobjects(bunchdt, data, commdct, key, places=7, **kwargs):
     """get all the objects of key that matches the fields in **kwargs"""
     idfobjects = bunchdt[key]
+    if not idfobjects:
+        return []
+    # look up the idd of each field once, not for every object
+    fieldtests = [(fieldname, value) + fieldcompare(data, commdct, key,
+                                                    fieldname)[1:]
+                  for fieldname, value in kwargs.items()]
     allobjs = []
     for obj in idfobjects:
-        if __objecthasfields(
-                bunchdt, data, commdct,
-                obj, places=places, **kwargs):
+        for fieldname, value, isnumeric, retaincase in fieldtests:
+            if not _isfieldvalue(obj[fieldname], value,
+                                 isnumeric, retaincase, places):
+                break
+        else:
             allobjs.append(obj)
     return allobjs
 
 
+# cache of the bunch field names of each object type
+# {id(objidd): (objidd, {fieldname: index})}
+# objidd is kept in the cache so that its id is not reused
+_FIELDINDEXES = {}
+
+
+def fieldcompare(data, commdct, key, fieldname):
+    """return (fieldindex, isnumeric, retaincase) of the field of key.
+    How the values of the field are compared in getobjects and IDF.query.
+    raises BadEPFieldError if key does not have the field"""
+    objidd = commdct[data.dtls.index(key.upper())]
+    try:
+        cached, fieldindexes = _FIELDINDEXES[id(objidd)]
+        if cached is not objidd:
+            raise KeyError
+    except KeyError:
+        fieldindexes = {'key': 0}
+        for i, comm in enumerate(objidd[1:], 1):
+            name = makefieldname(comm.get('field', [''])[0])
+            fieldindexes.setdefault(name, i)
+        _FIELDINDEXES[id(objidd)] = (objidd, fieldindexes)
+    try:
+        fieldindex = fieldindexes[fieldname]
+    except KeyError:
+        astr = "unknown field %s" % (fieldname, )
+        raise BadEPFieldError(astr)
+    comm = objidd[fieldindex]
+    isnumeric = comm.get('type', [None])[0] in ('real', 'integer')
+    return fieldindex, isnumeric, 'retaincase' in comm
+
+
+def _isfieldvalue(fieldvalue, value, isnumeric, retaincase, places=7):
+    """same as isfieldvalue, with the idd of the field looked up before"""
+    if isnumeric:
+        # test for autocalculate
+        try:
+            if fieldvalue.upper() == 'AUTOCALCULATE':
+                if value.upper() == 'AUTOCALCULATE':
+                    return True
+        except AttributeError:
+            pass
+        return almostequal(float(fieldvalue), float(value), places, False)
+    if retaincase:
+        return fieldvalue == value
+    else:
+        return fieldvalue.upper() == value.upper()
+
+
+def _queryvalue(value, isnumeric, retaincase):
+    """the value that is indexed and looked up in a FieldIndex"""
+    if isnumeric:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+    if isinstance(value, string_types) and not retaincase:
+        return value.upper()
+    return value
+
+
+class FieldIndex(object):
+    """the objects of a key by the value of one of their fields
+
+    Made by IDF.query and kept in idf._indexes, so that it is kept up to
+    date when the objects change. See bunch_subclass.idfindexes.
+    Text is compared ignoring case, unless the field is retaincase.
+    Numbers are compared to a number of decimal places"""
+    def __init__(self, idf, key, fieldindex, isnumeric, retaincase):
+        super(FieldIndex, self).__init__()
+        self.fieldindex = fieldindex
+        self.isnumeric = isnumeric
+        self.retaincase = retaincase
+        self.values = {}  # {id(idfobject): value}
+        self.objects = {}  # {value: {id(idfobject): idfobject}}
+        self.numbers = None  # the sorted numeric values, made when needed
+        self.order = ModelOrder(idf.idfobjects[key])
+        for idfobject in idf.idfobjects[key]:
+            self.index(idfobject)
+
+    def value(self, idfobject):
+        """the value of the field of idfobject, as it is indexed"""
+        try:
+            fieldvalue = idfobject.obj[self.fieldindex]
+        except IndexError:
+            fieldvalue = ''
+        return _queryvalue(fieldvalue, self.isnumeric, self.retaincase)
+
+    def add(self, idfobject):
+        """add idfobject to the index"""
+        self.order.add(idfobject)
+        self.index(idfobject)
+
+    def remove(self, idfobject):
+        """remove idfobject from the index"""
+        self.order.remove(idfobject)
+        self.unindex(idfobject)
+
+    def index(self, idfobject):
+        """index the value of the field of idfobject"""
+        value = self.value(idfobject)
+        self.values[id(idfobject)] = value
+        self.objects.setdefault(value, {})[id(idfobject)] = idfobject
+        if isinstance(value, float):
+            self.numbers = None
+
+    def unindex(self, idfobject):
+        """drop the value of the field of idfobject from the index"""
+        try:
+            value = self.values.pop(id(idfobject))
+        except KeyError:
+            return
+        objects = self.objects[value]
+        del objects[id(idfobject)]
+        if not objects:
+            del self.objects[value]
+            if isinstance(value, float):
+                self.numbers = None
+
+    def update(self, idfobject, fieldindex=None):
+        """update the index after the field fieldindex of idfobject
+        changed. None if any field could have changed"""
+        if fieldindex is None or fieldindex == self.fieldindex:
+            # the object keeps its place in self.order
+            self.unindex(idfobject)
+            self.index(idfobject)
+
+    def find(self, value, places=7):
+        """the objects that have this value, in the order they are in the
+        model"""
+        value = _queryvalue(value, self.isnumeric, self.retaincase)
+        if isinstance(value, float):
+            if self.numbers is None:
+                self.numbers = sorted(number for number in self.objects
+                                      if isinstance(number, float))
+            tolerance = 10 ** -places
+            first = bisect.bisect_left(self.numbers, value - tolerance)
+            last = bisect.bisect_right(self.numbers, value + tolerance)
+            found = [idfobject
+                     for number in self.numbers[first:last]
+                     if almostequal(number, value, places, False)
+                     for idfobject in self.objects[number].values()]
+        else:
+            found = list(self.objects.get(value, {}).values())
+        # checked, in case obj was changed without fieldschanged
+        found = [idfobject for idfobject in found
+                 if self.value(idfobject) == self.values[id(idfobject)]]
+        return self.order.sort(found)
+
+
 def iddofobject(data, commdct, key):
     """from commdct, return the idd of the object key"""
     dtls = data.dtls
@@ -271,6 +439,7 @@ def removeextensibles(bunchdt, data, commdct, key, objname):
         extensible_i = extensible_i[0]
     except IndexError:
         return theobject
+    theobject.ownobj()
     while True:
         try:
             popped = theobject.obj.pop(extensible_i)
@@ -489,17 +658,323 @@ def zone_floor2roofheight(idf, zonename, debug=False):
 
 def zonevolume(idf, zonename):
     """zone volume"""
-    area = zonearea(idf, zonename)
-    height = zoneheight(idf, zonename)
-    volume = area * height
+    index = zonegeometryindex(idf)
+    name = index.zonename(zonename)
+    if name is None:
+        zone = idf.getobject('ZONE', zonename)
+        name = zone.Name  # no such zone. Fails as it did before the index
+    if name in index.noheight:
+        # as zoneheight, that takes the max of no coordinates
+        astr = "zone %s has no surfaces" % (zonename, )
+        raise ValueError(astr)
+    return index.gettable()[name]['volume']
+
+
+def _zonegeometry(zone_surfs):
+    """(geometry, hascoords) from the surfaces of one zone. geometry is
+    the area, height and volume, with the same rules as zonearea,
+    zoneheight and zonevolume. hascoords is False if the height could not
+    be calculated"""
+    floors = []
+    tops = []
+    roofs = []
+    for surf in zone_surfs:
+        surface_type = surf.Surface_Type.upper()
+        if surface_type == 'FLOOR':
+            floors.append(surf)
+        elif surface_type in ('ROOF', 'CEILING'):
+            tops.append(surf)
+            if surface_type == 'ROOF':
+                roofs.append(surf)
+    if floors != []:
+        area = sum([floor.area for floor in floors])
+    else:
+        area = sum([top.area for top in tops])
+    if floors == [] or roofs == []:
+        top_zs = [coord[-1] for surf in zone_surfs
+                  for coord in eppy.function_helpers.getvertices(surf)]
+        bot_zs = top_zs
+    else:
+        top_zs = [coord[-1] for surf in tops
+                  for coord in eppy.function_helpers.getvertices(surf)]
+        bot_zs = [coord[-1] for surf in floors
+                  for coord in eppy.function_helpers.getvertices(surf)]
+    hascoords = top_zs != [] and bot_zs != []
+    if hascoords:
+        height = max(top_zs) - min(bot_zs)
+    else:
+        height = 0
+    return dict(area=area, height=height, volume=area * height), hascoords
+
+
+class ZoneGeometryIndex(object):
+    """the area, height and volume of the zones, for zone_geometry_table
+
+    Use zonegeometryindex(idf) to get it. It is kept in idf._indexes for
+    the ZONE and BUILDINGSURFACE:DETAILED objects, and is emptied when
+    one of them is added, removed or changed, so that the table is made
+    again the next time. See bunch_subclass.idfindexes. After changing
+    a field directly in idfobject.obj, call idfobject.fieldschanged()"""
+    def __init__(self, idf):
+        super(ZoneGeometryIndex, self).__init__()
+        self.idfobjects = idf.idfobjects
+        self.table = None  # {zonename: {'area':, 'height':, 'volume':}}
+        self.names = None  # {ZONENAME: zonename}, as getobject finds them
+        self.noheight = None  # the zones with no surface coordinates
+
+    def add(self, idfobject):
+        """a zone or a surface was added"""
+        self.table = None
+
+    def remove(self, idfobject):
+        """a zone or a surface was removed"""
+        self.table = None
+
+    def update(self, idfobject, fieldindex=None):
+        """a field of a zone or of a surface changed"""
+        self.table = None
+
+    def gettable(self):
+        """the table, made if the zones or the surfaces changed"""
+        if self.table is not None:
+            return self.table
+        zones = self.idfobjects['ZONE']
+        surfs = self.idfobjects['BuildingSurface:Detailed'.upper()]
+        zone_surfs = {}
+        for surf in surfs:
+            zone_surfs.setdefault(surf.Zone_Name, []).append(surf)
+        table = {}
+        names = {}
+        noheight = set()
+        for zone in zones:
+            name = zone.Name
+            table[name], hascoords = _zonegeometry(
+                zone_surfs.get(name, []))
+            names.setdefault(name.upper(), name)
+            if not hascoords:
+                noheight.add(name)
+        self.table, self.names, self.noheight = table, names, noheight
+        return table
+
+    def zonename(self, zonename):
+        """the name of the zone zonename in the table, ignoring case.
+        None if there is no such zone"""
+        self.gettable()
+        return self.names.get(zonename.upper())
+
+
+def zonegeometryindex(idf):
+    """return the ZoneGeometryIndex of the idf
+
+    It is made the first time and kept in the idf. It is made again if the
+    idf is read again"""
+    indexes = idf._indexes.setdefault('ZONE', {})
+    index = indexes.get('zonegeometry')
+    if index is None or index.idfobjects is not idf.idfobjects:
+        index = ZoneGeometryIndex(idf)
+        indexes['zonegeometry'] = index
+        surfindexes = idf._indexes.setdefault(
+            'BuildingSurface:Detailed'.upper(), {})
+        surfindexes['zonegeometry'] = index
+    return index
+
+
+def zone_geometry_table(idf):
+    """area, height and volume of every zone in the idf
+
+    The surfaces are grouped by zone in one pass, instead of rescanning
+    all the surfaces for each zone. The table is kept in the idf (see
+    ZoneGeometryIndex) and is made again only after the zones or the
+    BuildingSurface:Detailed objects have changed.
 
-    return volume
+    Returns
+    -------
+    dict
+        {zonename: {'area': area, 'height': height, 'volume': volume}, ...}
+        A zone with no surfaces has all values as 0. zonevolume raises a
+        ValueError for such a zone, as it did before the table
+    """
+    table = zonegeometryindex(idf).gettable()
+    return dict([(name, dict(values)) for name, values in iteritems(table)])
 
 def refname2key(idf, refname):
     """return all keys that have the reference name"""
     return [item[0] for item in getallobjlists(idf, refname)]
 
 
+def savestr(s, filename, lineendings='default', encoding='latin-1'):
+    """save the idf text s as IDF.save does. filename can be a file handle"""
+    if lineendings == 'default':
+        system = platform.system()
+        s = '!- {} Line endings \n'.format(system) + s
+        slines = s.splitlines()
+        s = os.linesep.join(slines)
+    elif lineendings == 'windows':
+        s = '!- Windows Line endings \n' + s
+        slines = s.splitlines()
+        s = '\r\n'.join(slines)
+    elif lineendings == 'unix':
+        s = '!- Unix Line endings \n' + s
+        slines = s.splitlines()
+        s = '\n'.join(slines)
+
+    s = s.encode(encoding)
+    try:
+        with open(filename, 'wb') as idf_out:
+            idf_out.write(s)
+    except TypeError:  # in the case that filename is a file handle
+        try:
+            filename.write(s)
+        except TypeError:
+            filename.write(s.decode(encoding))
+
+
+OUTPUTTYPES = ('standard', 'nocomment', 'nocomment1', 'nocomment2',
+               'compressed')
+
+
+def outputline(line, outputtype):
+    """line of the idf text as IDF.idfstr writes it for outputtype.
+    None if it is left out"""
+    if outputtype in ('standard', 'nocomment'):
+        return line
+    line = line.strip()
+    if outputtype == 'nocomment2' and line == '':
+        return None
+    return line
+
+
+def rawfieldline(val, first, last):
+    """the line of a field in model.__repr__, the text of the outputtypes
+    other than 'standard'"""
+    if last:
+        return '     %s;' % (val, )
+    if first:
+        return '%s,' % (val, )
+    return '     %s,' % (val, )
+
+
+def objectlines(obj, objls, comments):
+    """the lines of an object in the text of the idf. comments is True for
+    the 'standard' outputtype"""
+    if comments:
+        return idfobjectstr(obj, objls).split('\n')[1:-1]
+    return [rawfieldline(val, i == 0, i == len(obj) - 1)
+            for i, val in enumerate(obj)]
+
+
+class IDFTemplate(object):
+    """the text of an idf, with slots for the values of some fields
+
+    Made by IDF.template. The text of the idf is made once, in the
+    outputtype of the idf. The text of a variant is made by writing the
+    values into the slots, without making the text of the other objects
+    again. Only plain lists and strings are kept, so that a template can be
+    sent to other processes.
+    Later changes to the idf are not seen by the template"""
+    def __init__(self, idf, fields):
+        super(IDFTemplate, self).__init__()
+        if idf.outputtype not in OUTPUTTYPES:
+            raise ValueError("%s is not a valid outputtype" % idf.outputtype)
+        self.outputtype = idf.outputtype
+        self.comments = self.outputtype == 'standard'
+        if self.outputtype == 'compressed':
+            self.separator = ' '
+        else:
+            self.separator = '\n'
+        self.basevalues = []  # the values of the fields in idf
+        slotfields = {}  # {id(idfobject): {fieldindex: valueindex}}
+        for valueindex, (idfobject, fieldname) in enumerate(fields):
+            try:
+                fieldindex = idfobject.objls.index(fieldname)
+            except ValueError:
+                astr = "unable to find field %s" % (fieldname, )
+                raise BadEPFieldError(astr)
+            objfields = slotfields.setdefault(id(idfobject), {})
+            objfields[fieldindex] = valueindex  # the last one is used
+            try:
+                self.basevalues.append(idfobject.obj[fieldindex])
+            except IndexError:
+                self.basevalues.append('')
+        # the text is the lines joined by the separator. Each line, and
+        # each slot, is kept with the separator in front of it
+        self.statics = []  # the text before each slot, and after the last
+        self.slots = []
+        static = []
+        # the 'standard' text starts with a blank line. The others end with
+        # one more
+        if self.comments:
+            self.addline(static, '')
+        for objkey in idf.model.dtls:
+            for idfobject in idf.idfobjects[objkey]:
+                obj = idfobject.obj
+                objfields = slotfields.get(id(idfobject))
+                if objfields and max(objfields) >= len(obj):
+                    # the object gets more fields. it is all one slot
+                    self.statics.append(''.join(static))
+                    static = []
+                    self.slots.append(
+                        ('object', (list(obj), idfobject.objls),
+                         sorted(objfields.items())))
+                else:
+                    objfields = objfields or {}
+                    lines = objectlines(obj, idfobject.objls, self.comments)
+                    for fieldindex, line in enumerate(lines):
+                        if fieldindex in objfields:
+                            self.statics.append(''.join(static))
+                            static = []
+                            self.slots.append(
+                                ('field',
+                                 (idfobject.objls[fieldindex],
+                                  fieldindex == len(obj) - 1),
+                                 objfields[fieldindex]))
+                        else:
+                            self.addline(static, line)
+                self.addline(static, '')
+        if not self.comments:
+            self.addline(static, '')
+        self.statics.append(''.join(static))
+
+    def addline(self, pieces, line):
+        """add line to pieces, as written for the outputtype"""
+        line = outputline(line, self.outputtype)
+        if line is not None:
+            pieces.append(self.separator + line)
+
+    def idfstr(self, values):
+        """the text of the idf with values in the slots of the fields"""
+        pieces = []
+        for static, (kind, data, valueindex) in zip(self.statics,
+                                                    self.slots):
+            pieces.append(static)
+            if kind == 'field':
+                fieldname, last = data
+                value = values[valueindex]
+                if self.comments:
+                    self.addline(pieces, fieldline(value, fieldname, last))
+                else:
+                    self.addline(pieces, rawfieldline(value, False, last))
+            else:
+                obj, objls = data
+                obj = list(obj)
+                for fieldindex, index in valueindex:
+                    if fieldindex >= len(obj):
+                        if values[index] == '':
+                            continue  # no blank fields at the end
+                        obj.extend([''] * (fieldindex + 1 - len(obj)))
+                    obj[fieldindex] = values[index]
+                for line in objectlines(obj, objls, self.comments):
+                    self.addline(pieces, line)
+        pieces.append(self.statics[-1])
+        # no separator in front of the first line
+        return ''.join(pieces)[len(self.separator):]
+
+    def save(self, values, filename, lineendings='default',
+             encoding='latin-1'):
+        """save the text of the idf with values, as IDF.save does"""
+        savestr(self.idfstr(values), filename, lineendings, encoding)
+
+
 class IDF(object):
 
     """
@@ -509,8 +984,9 @@ class IDF(object):
     ---------------
     iddname : str
         Name of the IDD currently being used by eppy. As a class attribute, this
-        is set for all IDFs which are currently being processed and cannot be
-        changed for an individual IDF.
+        is set for all IDFs which are currently being processed. An IDF that
+        uses another IDD is bound to it with IDF(idfname, idd=iddname). Its
+        IDD data are then instance attributes.
     iddinfo : list
         Comments and metadata about fields in the IDD.
     block : list
@@ -534,7 +1010,7 @@ class IDF(object):
     idd_info = None
     block = None
 
-    def __init__(self, idfname=None, epw=None):
+    def __init__(self, idfname=None, epw=None, idd=None):
         """
         Parameters
         ----------
@@ -542,9 +1018,15 @@ class IDF(object):
             Path to an IDF file (which does not have to exist yet).
         epw : str, optional
             File path to the EPW file to use if running the IDF.
+        idd : str, optional
+            Path to the IDD file of this IDF only. Defaults to the IDD set
+            with IDF.setiddname. See IDF.bindidd
 
         """
         # import pdb; pdb.set_trace()
+        self._indexes = {}  # see bunch_subclass.idfindexes
+        if idd != None:
+            self.bindidd(idd)
         if idfname != None:
             self.idfname = idfname
             self.read()
@@ -570,6 +1052,8 @@ class IDF(object):
         Raises
         ------
         IDDAlreadySetError
+            To use another IDD for some of the IDFs, bind them to it with
+            IDF.bindidd.
 
         """
         if cls.iddname == None:
@@ -583,6 +1067,45 @@ class IDF(object):
                 errortxt = "IDD file is set to: %s" % (cls.iddname,)
                 raise IDDAlreadySetError(errortxt)
 
+    def bindidd(self, iddname):
+        """
+        Use the IDD iddname for this IDF, instead of the IDD of the class.
+        IDFs of different versions of EnergyPlus can then be used in the
+        same process. The IDD is parsed once and shared by all the IDFs
+        that use it. See eppy.iddregistry.
+
+        Parameters
+        ----------
+        iddname : str
+            Path to the IDD file.
+
+        """
+        self.iddname = iddname
+        parsed = iddregistry.getidd(iddname)
+        if parsed is None:
+            self.idd_info = None
+            self.block = None
+        else:
+            self.setinstanceidd(parsed)
+
+    def setinstanceidd(self, parsed):
+        """Set the IDD data of an IDF bound to its own IDD.
+
+        Parameters
+        ----------
+        parsed : iddregistry.ParsedIDD
+            The parsed IDD.
+
+        """
+        self.idd_info = parsed.idd_info
+        self.block = parsed.block
+        self.idd_index = parsed.idd_index
+        self.idd_version = parsed.idd_version
+
+    def hasownidd(self):
+        """True if the IDF is bound to its own IDD with IDF.bindidd"""
+        return 'iddname' in self.__dict__
+
     @classmethod
     def getiddname(cls):
         """Get the name of the current IDD used by eppy.
@@ -628,7 +1151,7 @@ class IDF(object):
             # raise nonexistent file error early if idfname doesn't exist
             pass
         iddfhandle = StringIO(iddcurrent.iddtxt)
-        if self.getiddname() == None:
+        if self.iddname == None:
             self.setiddname(iddfhandle)
         self.idfname = idfname
         self.read()
@@ -645,7 +1168,7 @@ class IDF(object):
 
         """
         iddfhandle = StringIO(iddcurrent.iddtxt)
-        if self.getiddname() == None:
+        if self.iddname == None:
             self.setiddname(iddfhandle)
         idfhandle = StringIO(idftxt)
         self.idfname = idfhandle
@@ -664,16 +1187,33 @@ class IDF(object):
         - idd_index : dict
 
         """
-        if self.getiddname() == None:
+        if self.iddname == None:
             errortxt = ("IDD file needed to read the idf file. "
                         "Set it using IDF.setiddname(iddfile)")
             raise IDDNotSetError(errortxt)
+        parsed = iddregistry.getidd(self.iddname)
+        if self.idd_info is None and parsed is not None:
+            # parsed already, for another IDF
+            commdct, block = parsed.idd_info, parsed.block
+        else:
+            commdct, block = self.idd_info, self.block
         readout = idfreader1(
             self.idfname, self.iddname, self,
-            commdct=self.idd_info, block=self.block)
+            commdct=commdct, block=block)
         (self.idfobjects, block, self.model,
             idd_info, idd_index, idd_version) = readout
-        self.__class__.setidd(idd_info, idd_index, block, idd_version)
+        self._indexes = {}
+        if parsed is None or parsed.idd_info is not idd_info:
+            if not idd_index:
+                # idfreader1 gives no idd_index if the idd was parsed already
+                idd_index = getattr(self, 'idd_index', idd_index)
+            parsed = iddregistry.registeridd(
+                self.iddname, idd_info, block, idd_index, idd_version)
+        if self.hasownidd():
+            self.setinstanceidd(parsed)
+        else:
+            self.__class__.setidd(parsed.idd_info, parsed.idd_index,
+                                  parsed.block, parsed.idd_version)
 
     """Methods to do with creating a new blank IDF object."""
 
@@ -700,7 +1240,7 @@ class IDF(object):
 
         """
         iddfhandle = StringIO(iddcurrent.iddtxt)
-        if self.getiddname() == None:
+        if self.iddname == None:
             self.setiddname(iddfhandle)
         idfhandle = StringIO('')
         self.idfname = idfhandle
@@ -754,6 +1294,91 @@ class IDF(object):
             abunch[k] = v
         return abunch
 
+    def newidfobjects(self, key, rows, fieldnames=None, defaultvalues=True):
+        """
+        Add many new idfobjects of the same type to the model. The same as
+        calling newidfobject for each row, but the default values are made
+        once and the objects are added to the model all at once.
+
+        For example ::
+
+            newidfobjects("MATERIAL:AIRGAP",
+                [dict(Name='Argon'), dict(Name='Krypton')])
+            newidfobjects("MATERIAL:AIRGAP",
+                [['Argon', 0.1], ['Krypton', 0.2]],
+                fieldnames=['Name', 'Thermal_Resistance'])
+
+        Parameters
+        ----------
+        key : str
+            The type of IDF object.
+        rows : list or numpy.ndarray
+            A dict `{field: value}` or a list of values for each object.
+            A 2D or structured numpy array can be used.
+        fieldnames : list, optional
+            The fields of the values in each row, if they are not dicts.
+            The default is the fields of the object in order, from the
+            first one after the key, or the field names of a structured
+            numpy array.
+        defaultvalues: boolean
+            default is True. If True default values WILL be set.
+            If False, default values WILL NOT be set
+
+        Returns
+        -------
+        list of EpBunch objects
+
+        """
+        key = key.upper()
+        if fieldnames is None:
+            fieldnames = getattr(getattr(rows, 'dtype', None), 'names', None)
+        if hasattr(rows, 'tolist'):
+            rows = rows.tolist()
+        template = newrawobject(self.model, self.idd_info,
+                                key, block=self.block,
+                                defaultvalues=defaultvalues)
+        objidd = self.idd_info[self.model.dtls.index(key)]
+        objls = [makefieldname(comm.get('field', [''])[0])
+                 for comm in objidd]
+        objls[0] = 'key'
+        fieldindexes = dict((fieldname, i)
+                            for i, fieldname in reversed(list(enumerate(
+                                objls))))
+
+        def fieldindex(fieldname):
+            """the index of fieldname in objls"""
+            try:
+                return fieldindexes[fieldname]
+            except KeyError:
+                astr = "unknown field %s" % (fieldname, )
+                raise BadEPFieldError(astr)
+
+        if fieldnames is not None:
+            rowindexes = [fieldindex(fieldname) for fieldname in fieldnames]
+        else:
+            rowindexes = list(range(1, len(objls)))
+        # the other objects are copies of the first one
+        prototype = EpBunch(list(template), objls, objidd)
+        abunches = []
+        for row in rows:
+            obj = list(template)
+            if isinstance(row, dict):
+                items = [(fieldindex(fieldname), value)
+                         for fieldname, value in row.items()]
+            else:
+                row = list(row)
+                if len(row) > len(rowindexes):
+                    astr = "%s has only %s fields" % (key, len(rowindexes))
+                    raise BadEPFieldError(astr)
+                items = zip(rowindexes, row)
+            for i, value in items:
+                if i >= len(obj):
+                    obj.extend([''] * (i + 1 - len(obj)))
+                obj[i] = value
+            abunches.append(prototype.copywithobj(obj))
+        self.idfobjects[key].extend(abunches)
+        return abunches
+
     def popidfobject(self, key, index):
         """Pop an IDF object from the IDF.
 
@@ -783,6 +1408,48 @@ class IDF(object):
         key = idfobject.key.upper()
         self.idfobjects[key].remove(idfobject)
 
+    def removeidfobjects(self, idfobjects):
+        """Remove many IDF objects from the IDF. The objects of each key are
+        removed in one pass, instead of one at a time.
+
+        Parameters
+        ----------
+        idfobjects : iterable of EpBunch objects
+            The IDF objects to remove.
+
+        """
+        keysobjects = {}
+        for idfobject in idfobjects:
+            keysobjects.setdefault(idfobject.key.upper(), []).append(
+                idfobject)
+        for key, keyobjects in keysobjects.items():
+            self.idfobjects[key].removeall(keyobjects)
+
+    def filter(self, key, predicate):
+        """Keep only the IDF objects of key for which predicate is True.
+
+        For example ::
+
+            filter("MATERIAL", lambda material: material.Thickness > 0.1)
+
+        Parameters
+        ----------
+        key : str
+            The type of IDF object.
+        predicate : function
+            Takes an IDF object and returns True to keep it.
+
+        Returns
+        -------
+        list of the EpBunch objects that were removed.
+
+        """
+        idfobjects = self.idfobjects[key.upper()]
+        removed = [idfobject for idfobject in idfobjects
+                   if not predicate(idfobject)]
+        idfobjects.removeall(removed)
+        return removed
+
     def copyidfobject(self, idfobject):
         """Add an IDF object to the IDF.
 
@@ -798,6 +1465,33 @@ class IDF(object):
                      self.idd_info,
                      idfobject, self)
 
+    def copy(self):
+        """Make a copy of the IDF.
+
+        The objects of the copy share their field values with the objects
+        of this IDF. The values of an object are copied the first time a
+        field of the object is written, in either IDF. Code that writes
+        directly into idfobject.obj must call idfobject.ownobj() first.
+
+        Returns
+        -------
+        IDF object.
+
+        """
+        theidf = copy.copy(self)
+        theidf._indexes = {}
+        theidf.model = copy.copy(self.model)
+        theidf.model.dt = {}
+        theidf.idfobjects = CaseInsensitiveDict()
+        for key in self.model.dtls:
+            idfobjects = [idfobject.sharedcopy(position)
+                          for position, idfobject in enumerate(
+                              self.idfobjects[key])]
+            objs = [idfobject.obj for idfobject in idfobjects]
+            theidf.model.dt[key] = objs
+            theidf.idfobjects[key] = Idf_MSequence(idfobjects, objs, theidf)
+        return theidf
+
     def getobject(self, key, name):
         """Fetch an IDF object given key and name.
 
@@ -815,6 +1509,85 @@ class IDF(object):
         """
         return getobject(self.idfobjects, key, name)
 
+    def query(self, key, places=7, **kwargs):
+        """Fetch the IDF objects of key whose fields have these values.
+
+        Like getobjects, but the objects are looked up in an index of the
+        values of each field. The index is made the first time a field is
+        queried and is kept up to date as the objects change.
+
+        Parameters
+        ----------
+        key : str
+            The type of IDF object.
+        places : int, optional
+            Decimal places to which numeric fields are compared.
+        **kwargs
+            fieldname=value. Text is compared ignoring case, unless the
+            field is retaincase in the IDD. value can also be a function
+            that takes the value of the field and returns True or False.
+
+        Returns
+        -------
+        list of EpBunch objects, in the order they are in the model.
+
+        Raises
+        ------
+        BadEPFieldError
+            if key does not have one of the fields.
+
+        """
+        key = key.upper()
+        idfobjects = self.idfobjects[key]
+        if not idfobjects:
+            return []
+        indexes = self._indexes.setdefault(key, {})
+        found = None
+        tests = []
+        for fieldname, value in kwargs.items():
+            fieldindex, isnumeric, retaincase = fieldcompare(
+                self.model, self.idd_info, key, fieldname)
+            if callable(value):
+                tests.append((fieldindex, value))
+                continue
+            index = indexes.get(('field', fieldindex))
+            if index is None:
+                index = FieldIndex(self, key, fieldindex,
+                                   isnumeric, retaincase)
+                indexes[('field', fieldindex)] = index
+            objects = index.find(value, places)
+            if found is None:
+                found = objects
+            else:
+                ids = set(id(idfobject) for idfobject in objects)
+                found = [idfobject for idfobject in found
+                         if id(idfobject) in ids]
+        if found is None:
+            found = list(idfobjects)
+        for fieldindex, test in tests:
+            found = [idfobject for idfobject in found
+                     if test(idfobject[idfobject.objls[fieldindex]])]
+        return found
+
+    def template(self, fields):
+        """Make the text of the IDF once, with slots for some fields.
+
+        The text of a variant of the IDF that only changes these fields is
+        then made by writing the values into the slots. See IDFTemplate.
+
+        Parameters
+        ----------
+        fields : list
+            A list of (idfobject, fieldname) for each slot.
+
+        Returns
+        -------
+        IDFTemplate object. Its idfstr(values) and save(values, filename)
+        take a list of values in the order of fields.
+
+        """
+        return IDFTemplate(self, fields)
+
     def getextensibleindex(self, key, name):
         """
         Get the index of the first extensible item.
@@ -927,30 +1700,7 @@ class IDF(object):
         """
         if filename is None:
             filename = self.idfname
-        s = self.idfstr()
-        if lineendings == 'default':
-            system = platform.system()
-            s = '!- {} Line endings \n'.format(system) + s
-            slines = s.splitlines()
-            s = os.linesep.join(slines)
-        elif lineendings == 'windows':
-            s = '!- Windows Line endings \n' + s
-            slines = s.splitlines()
-            s = '\r\n'.join(slines)
-        elif lineendings == 'unix':
-            s = '!- Unix Line endings \n' + s
-            slines = s.splitlines()
-            s = '\n'.join(slines)
-
-        s = s.encode(encoding)
-        try:
-            with open(filename, 'wb') as idf_out:
-                idf_out.write(s)
-        except TypeError:  # in the case that filename is a file handle
-            try:
-                filename.write(s)
-            except TypeError:
-                filename.write(s.decode(encoding))
+        savestr(self.idfstr(), filename, lineendings, encoding)
 
     def saveas(self, filename, lineendings='default', encoding='latin-1'):
         """ Save the IDF as a text file with the filename passed.
@@ -0,0 +1,200 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""pytest for batch.py"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+from six import StringIO
+
+np = pytest.importorskip('numpy')
+
+import eppy.geometry.batch as batch
+import eppy.geometry.int2lines as int2lines
+import eppy.geometry.surface as surface
+import eppy.geometry.volume_zone as volume_zone
+from eppy.iddcurrent import iddcurrent
+from eppy import modeleditor
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+polys = [
+    [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+    [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],
+    [(0, 0, 0), (0, 1, 0), (0, 1, 1), (0, 0, 1)],
+    [(0, 0, 0), (0, 1, 0), (0, 2, 0), (0, 3, 0)],
+    [(0, 0, 0), (8, 0, 0), (11, 0, 4), (3, 0, 4)],
+    [(0, 0, 0), (1, 0, 0), (1, 1, 1), (0, 1, 1)],
+    [(0.0, 0.0, 3.0), (0.0, 0.0, 2.4), (30.5, 0.0, 2.4), (30.5, 0.0, 3.0)],
+    [(0, 0, 0), (5, 0, 0), (5, 0, 8), (0, 0, 8)],
+    [(0, 0, 0), (4, 0, 0), (0, 3, 0)],
+    [(0, 0, 0), (2, 0, 0), (2, 1, 0), (1, 1, 0), (1, 2, 0), (0, 2, 0)],
+    [
+        (3.571913, -9.390334, 1.487381),
+        (10.905826, -6.194443, 1.487381),
+        (8.998819, -1.818255, 0.0),
+        (1.664906, -5.014146, 0.0)],
+    [
+        (-4.611479, 6.729214, -0.332978),
+        (-0.694944, 4.990984, 2.243709),
+        (-2.147088, 0.302854, 1.288344),
+        (-6.063622, 2.041084, -1.288344)],
+    ]
+
+
+def test_packpolygons():
+    """py.test for packpolygons"""
+    data = (
+        (
+            [[(0, 0, 0), (1, 0, 0), (1, 1, 0)], [(5, 5, 5), (6, 6, 6)]],
+            [
+                [(0, 0, 0), (1, 0, 0), (1, 1, 0)],
+                [(5, 5, 5), (6, 6, 6), (5, 5, 5)]],
+            [3, 2]),
+        # polys, verts, counts
+        ([], np.zeros((0, 0, 3)), []),
+        )
+    for thepolys, theverts, thecounts in data:
+        verts, counts = batch.packpolygons(thepolys)
+        assert verts.shape == np.asarray(theverts).shape
+        assert np.allclose(verts, theverts)
+        assert list(counts) == thecounts
+
+
+def test_polygon_properties():
+    """py.test for polygon_properties matching surface.py"""
+    verts, counts = batch.packpolygons(polys)
+    result = batch.polygon_properties(verts, counts)
+    for poly, row in zip(polys, result):
+        assert almostequal(row['area'], surface.area(poly))
+        assert almostequal(row['azimuth'], surface.azimuth(poly))
+        assert almostequal(row['tilt'], surface.tilt(poly))
+        assert almostequal(row['height'], surface.height(poly))
+        assert almostequal(row['width'], surface.width(poly))
+        normal = surface.unit_normal(poly[0], poly[1], poly[-1])
+        assert np.allclose(row['normal'], normal)
+
+
+def test_surface_properties():
+    """py.test for surface_properties"""
+    idftxt = """BuildingSurface:Detailed, F7289B, Floor, Exterior Floor,
+        473222, Ground, , NoSun, NoWind, , 4, 2.23, 2.56, 0.0, 2.23, 0.0,
+        0.0, 0.0, 0.0, 0.0, 0.0, 2.56, 0.0;
+        BuildingSurface:Detailed, 570C2E, Wall, Exterior Wall, 473222,
+        Outdoors, , SunExposed, WindExposed, , 4, 0.0, 0.0, 1.49, 0.0, 0.0,
+        0.0, 2.23, 0.0, 0.0, 2.23, 0.0, 1.49;
+        FenestrationSurface:Detailed, W1, Window, , 570C2E, , , , , 1, 3,
+        0.5, 0.0, 1.0, 0.5, 0.0, 0.5, 1.5, 0.0, 0.5;"""
+    idf = IDF(StringIO(idftxt))
+    result = batch.surface_properties(idf)
+    surfaces = batch.getsurfaces(idf)
+    assert len(result) == 3
+    assert list(result['name']) == ['F7289B', '570C2E', 'W1']
+    assert list(result['key']) == [
+        'BUILDINGSURFACE:DETAILED',
+        'BUILDINGSURFACE:DETAILED',
+        'FENESTRATIONSURFACE:DETAILED']
+    for surf, row in zip(surfaces, result):
+        assert almostequal(row['area'], surf.area)
+        assert almostequal(row['azimuth'], surf.azimuth)
+        assert almostequal(row['tilt'], surf.tilt)
+        assert almostequal(row['height'], surf.height)
+        assert almostequal(row['width'], surf.width)
+    # only one key
+    result = batch.surface_properties(
+        idf, keys=['FenestrationSurface:Detailed'])
+    assert list(result['name']) == ['W1']
+    assert almostequal(result['area'][0], 0.25)
+    # no surfaces
+    idf = IDF(StringIO(""))
+    result = batch.surface_properties(idf)
+    assert len(result) == 0
+
+
+def prismfaces(poly1, poly2):
+    """faces of the prism between the bases poly1 and poly2, facing out.
+    poly1 is the bottom and is counter clockwise seen from above"""
+    num = len(poly1)
+    faces = [poly1[::-1], poly2]
+    for i in range(num):
+        j = (i + 1) % num
+        faces.append([poly1[i], poly1[j], poly2[j], poly2[i]])
+    return faces
+
+
+def test_signed_volumes():
+    """py.test for signed_volumes against volume_zone and int2lines"""
+    data = (
+        (
+            [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+            [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)]),  # poly1, poly2
+        (
+            [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+            [(0, 0, 0), (1, 0, 0), (1, 1, 2), (0, 1, 2)]),
+        (
+            [(10, 10, 5), (14, 10, 5), (15, 13, 5), (11, 12, 5)],
+            [(10, 10, 8), (14, 10, 8), (15, 13, 8), (11, 12, 8)]),
+        (
+            [(0, 0, 0), (3, 0, 0), (0, 4, 0)],
+            [(0, 0, 2.5), (3, 0, 2.5), (0, 4, 2.5)]),
+        )
+    faces = []
+    groups = []
+    for i, (poly1, poly2) in enumerate(data):
+        thefaces = prismfaces(poly1, poly2)
+        faces.extend(thefaces)
+        groups.extend([i] * len(thefaces))
+    verts, counts = batch.packpolygons(faces)
+    volumes = batch.signed_volumes(verts, counts, groups)
+    assert len(volumes) == len(data)
+    for (poly1, poly2), volume in zip(data, volumes):
+        expected = volume_zone.vol(list(poly1), list(poly2))
+        assert almostequal(volume, expected, places=4)
+        if poly1[0][2] == poly2[0][2]:  # int2lines fails on sloping bases
+            continue
+        assert almostequal(
+            volume, int2lines.vol_zone(poly1, poly2), places=4)
+    # reversed faces give a negative volume
+    faces = [face[::-1] for face in prismfaces(*data[0])]
+    verts, counts = batch.packpolygons(faces)
+    volumes = batch.signed_volumes(verts, counts, [0] * len(faces))
+    assert almostequal(volumes[0], -1)
+    # a group with no polygons
+    volumes = batch.signed_volumes(verts, counts, [1] * len(faces), 3)
+    assert volumes[0] == 0
+    assert almostequal(volumes[1], -1)
+    assert volumes[2] == 0
+
+
+def test_zone_volumes():
+    """py.test for zone_volumes"""
+    poly1 = [(0, 0, 0), (2, 0, 0), (2, 3, 0), (0, 3, 0)]
+    poly2 = [(0, 0, 4), (2, 0, 4), (2, 3, 4), (0, 3, 4)]
+    lines = ["Zone, Box;", "Zone, Empty;"]
+    surfacetypes = ['Floor', 'Roof', 'Wall', 'Wall', 'Wall', 'Wall']
+    for i, face in enumerate(prismfaces(poly1, poly2)):
+        coords = ", ".join(["%s, %s, %s" % pt for pt in face])
+        lines.append(
+            "BuildingSurface:Detailed, S%s, %s, , Box, Outdoors, , , , , "
+            "4, %s;" % (i, surfacetypes[i], coords))
+    lines.append(
+        "FenestrationSurface:Detailed, W1, Window, , S2, , , , , 1, 3, "
+        "0.5, 0.0, 1.0, 0.5, 0.0, 0.5, 1.5, 0.0, 0.5;")
+    idf = IDF(StringIO("\n".join(lines)))
+    volumes = batch.zone_volumes(idf)
+    assert sorted(volumes.keys()) == ['Box', 'Empty']
+    assert almostequal(volumes['Box'], 24)
+    assert volumes['Empty'] == 0
+    assert almostequal(volumes['Box'], modeleditor.zonevolume(idf, 'Box'))
@@ -0,0 +1,156 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""pytest for spatial.py"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+from six import StringIO
+
+np = pytest.importorskip('numpy')
+
+import eppy.geometry.spatial as spatial
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+# two zones side by side, sharing the plane x = 2
+# W_A faces +x, W_B faces -x and covers the top half of W_A
+# W_C is next to W_B, touching it along an edge
+idftxt = """Zone, A; Zone, B;
+    BuildingSurface:Detailed, W_A, Wall, , A, Outdoors, , SunExposed,
+    WindExposed, , 4, 2, 0, 3, 2, 0, 0, 2, 4, 0, 2, 4, 3;
+    BuildingSurface:Detailed, W_B, Wall, , B, Outdoors, , SunExposed,
+    WindExposed, , 4, 2, 4, 3, 2, 4, 1.5, 2, 0, 1.5, 2, 0, 3;
+    BuildingSurface:Detailed, W_C, Wall, , B, Outdoors, , SunExposed,
+    WindExposed, , 4, 2, 4, 1.5, 2, 4, 0, 2, 0, 0, 2, 0, 1.5;
+    BuildingSurface:Detailed, F_A, Floor, , A, Ground, , NoSun,
+    NoWind, , 4, 0, 4, 0, 2, 4, 0, 2, 0, 0, 0, 0, 0;
+    BuildingSurface:Detailed, F_FAR, Floor, , B, Ground, , NoSun,
+    NoWind, , 4, 50, 54, 0, 52, 54, 0, 52, 50, 0, 50, 50, 0;"""
+
+
+def test_overlaparea2d():
+    """py.test for overlaparea2d"""
+    square = [(0, 0), (2, 0), (2, 2), (0, 2)]
+    ell = [(0, 0), (2, 0), (2, 1), (1, 1), (1, 2), (0, 2)]
+    data = (
+        (square, [(1, 1), (3, 1), (3, 3), (1, 3)], 1),  # poly1, poly2, area
+        (square, [(2, 0), (4, 0), (4, 2), (2, 2)], 0),  # touching
+        (square, square[::-1], 4),  # clockwise
+        (ell, [(0.5, 0.5), (1.5, 0.5), (1.5, 1.5), (0.5, 1.5)], 0.75),
+        (ell, ell, 3),  # both non convex
+        )
+    for poly1, poly2, area in data:
+        assert almostequal(spatial.overlaparea2d(poly1, poly2), area)
+        assert almostequal(spatial.overlaparea2d(poly2, poly1), area)
+
+
+def test_SurfaceIndex():
+    """py.test for SurfaceIndex"""
+    idf = IDF(StringIO(idftxt))
+    index = spatial.surfaceindex(idf)
+    names = [surface.Name for surface in index.surfaces]
+    assert names == ['W_A', 'W_B', 'W_C', 'F_A', 'F_FAR']
+    assert np.allclose(index.normals[0], (1, 0, 0))
+    assert np.allclose(index.normals[1], (-1, 0, 0))
+
+    def namepairs(pairs):
+        return sorted([(names[first], names[second])
+                       for first, second in pairs])
+
+    # W_B is above the floor and F_FAR is far away
+    assert namepairs(index.candidatepairs()) == [
+        ('W_A', 'F_A'), ('W_A', 'W_B'), ('W_A', 'W_C'), ('W_B', 'W_C'),
+        ('W_C', 'F_A')]
+    assert namepairs(index.coplanarpairs()) == [
+        ('W_A', 'W_B'), ('W_A', 'W_C'), ('W_B', 'W_C')]
+    assert namepairs(index.coplanarpairs(opposite=False)) == [
+        ('W_B', 'W_C')]
+    overlapping = index.overlappingpairs()
+    assert len(overlapping) == 2
+    assert namepairs([pair[:2] for pair in overlapping]) == [
+        ('W_A', 'W_B'), ('W_A', 'W_C')]
+    for first, second, area in overlapping:
+        assert almostequal(area, index.areas[second])
+    # intersect
+    found = index.intersect((49, 49, -1), (60, 60, 1))
+    assert [names[i] for i in found] == ['F_FAR']
+    assert len(index.intersect((100, 100, 100), (101, 101, 101))) == 0
+    # nearest
+    assert [names[i] for i in index.nearest((51, 51, 5))] == ['F_FAR']
+    assert almostequal(index.distances((51, 51, 5))[4], 5)
+    assert almostequal(index.distances((5, 2, 1))[0], 3)  # over W_A
+    assert almostequal(index.distances((1, -3, 0))[3], 3)  # off F_A edge
+    nearest = [names[i] for i in index.nearest((2.5, 2, 2.5), num=2)]
+    assert nearest == ['W_A', 'W_B']
+
+
+def test_surfaceindex_brute():
+    """py.test for candidatepairs against comparing all the boxes"""
+    rand = np.random.RandomState(42)
+    num = 200
+    corners = rand.uniform(0, 100, (num, 3))
+    sizes = rand.uniform(0.5, 8, (num, 2))
+    polys = []
+    for (x_0, y_0, z_0), (width, height) in zip(corners, sizes):
+        polys.append([
+            (x_0, y_0, z_0 + height), (x_0, y_0, z_0),
+            (x_0 + width, y_0, z_0), (x_0 + width, y_0, z_0 + height)])
+    idf = IDF(StringIO(""))
+    for i, poly in enumerate(polys):
+        surface = idf.newidfobject(
+            'BuildingSurface:Detailed'.upper(), Name='S%s' % (i, ))
+        surface.Number_of_Vertices = 4
+        for j, (x_val, y_val, z_val) in enumerate(poly):
+            surface['Vertex_%s_Xcoordinate' % (j + 1, )] = x_val
+            surface['Vertex_%s_Ycoordinate' % (j + 1, )] = y_val
+            surface['Vertex_%s_Zcoordinate' % (j + 1, )] = z_val
+    index = spatial.surfaceindex(idf)
+    brute = []
+    for first in range(num):
+        for second in range(first + 1, num):
+            if np.all((index.mins[first] <= index.maxs[second]) &
+                      (index.mins[second] <= index.maxs[first])):
+                brute.append((first, second))
+    assert [tuple(pair) for pair in index.candidatepairs()] == brute
+
+
+def test_matchboundaries():
+    """py.test for matchboundaries"""
+    idf = IDF(StringIO(idftxt))
+    # a wall in zone B that matches W_A exactly
+    idf.newidfobject(
+        'BuildingSurface:Detailed'.upper(), Name='W_AB', Surface_Type='Wall',
+        Zone_Name='B', Outside_Boundary_Condition='Outdoors',
+        Number_of_Vertices=4,
+        Vertex_1_Xcoordinate=2, Vertex_1_Ycoordinate=4,
+        Vertex_1_Zcoordinate=3, Vertex_2_Xcoordinate=2,
+        Vertex_2_Ycoordinate=4, Vertex_2_Zcoordinate=0,
+        Vertex_3_Xcoordinate=2, Vertex_3_Ycoordinate=0,
+        Vertex_3_Zcoordinate=0, Vertex_4_Xcoordinate=2,
+        Vertex_4_Ycoordinate=0, Vertex_4_Zcoordinate=3)
+    pairs = spatial.matchboundaries(idf, setfields=False)
+    assert [(surf1.Name, surf2.Name) for surf1, surf2 in pairs] == [
+        ('W_A', 'W_AB')]
+    w_a = idf.getobject('BuildingSurface:Detailed'.upper(), 'W_A')
+    assert w_a.Outside_Boundary_Condition == 'Outdoors'
+    pairs = spatial.matchboundaries(idf)
+    w_ab = idf.getobject('BuildingSurface:Detailed'.upper(), 'W_AB')
+    assert w_a.Outside_Boundary_Condition == 'Surface'
+    assert w_a.Outside_Boundary_Condition_Object == 'W_AB'
+    assert w_ab.Outside_Boundary_Condition_Object == 'W_A'
+    assert w_ab.Sun_Exposure == 'NoSun'
+    assert w_ab.Wind_Exposure == 'NoWind'
@@ -20,6 +20,8 @@ from eppy.modeleditor import IDF
 def test_IDF():
     """py.test for class IDF"""
     stored_idd = IDF.iddname
+    stored_idd_info = IDF.idd_info
+    stored_block = IDF.block
     IDF.iddname = None
     assert IDF.iddname == None
     IDF.setiddname("gumby", testing=True)
@@ -28,6 +30,8 @@ def test_IDF():
     assert IDF.iddname != "karamba"
     assert IDF.iddname == "gumby"
     IDF.iddname = stored_idd
+    IDF.idd_info = stored_idd_info
+    IDF.block = stored_block
 
 iddsnippet = iddcurrent.iddtxt
 iddfhandle = StringIO(iddsnippet)
@@ -0,0 +1,100 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for columnar.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+from six import StringIO
+
+np = pytest.importorskip('numpy')
+
+from eppy import columnar
+from eppy.bunch_subclass import BadEPFieldError
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """BuildingSurface:Detailed, W1, Wall, , Z1, Outdoors, , SunExposed,
+    WindExposed, autocalculate, 4, 0, 0, 3, 0, 0, 0, 4, 0, 0, 4, 0, 3;
+    BuildingSurface:Detailed, W2, Wall, , Z1, Outdoors, , SunExposed,
+    WindExposed, 0.5, 3, 4, 0, 3, 4, 0, 0, 4, 2, 0;"""
+
+
+def test_getcolumn_setcolumn():
+    """py.test for getcolumn and setcolumn"""
+    idf = IDF(StringIO(idftxt))
+    key = 'BuildingSurface:Detailed'.upper()
+    walls = idf.idfobjects[key]
+    wall1, wall2 = walls
+    area = wall1.area
+    inblock = columnar.keyblock(idf, key)
+    fieldnames = [fieldname for i, fieldname, isinteger
+                  in columnar.numericfields(walls, inblock)]
+    assert fieldnames[:3] == [
+        'View_Factor_to_Ground', 'Number_of_Vertices',
+        'Vertex_1_Xcoordinate']
+    viewfactors = columnar.getcolumn(walls, 'View_Factor_to_Ground', inblock)
+    assert np.isnan(viewfactors[0])  # autocalculate
+    assert viewfactors[1] == 0.5
+    vertices = columnar.getcolumn(walls, 'Number_of_Vertices', inblock)
+    assert list(vertices) == [4, 3]
+    assert np.isnan(columnar.getcolumn(
+        walls, 'Vertex_4_Xcoordinate', inblock)[1])  # missing
+    zs = columnar.getcolumn(walls, 'Vertex_1_Zcoordinate', inblock)
+    columnar.setcolumn(walls, 'Vertex_1_Zcoordinate', zs + 1, inblock)
+    assert wall1.Vertex_1_Zcoordinate == 4
+    assert wall1.area != area  # the geometry cache was emptied
+    columnar.setcolumn(walls, 'Vertex_4_Xcoordinate', [4, 4], inblock)
+    assert wall2.Vertex_4_Xcoordinate == 4
+    assert wall2.Vertex_4_Ycoordinate == ''
+    with pytest.raises(BadEPFieldError):
+        columnar.getcolumn(walls, 'Not_A_Field', inblock)
+
+
+def test_column():
+    """py.test for getcolumn and setcolumn, through Idf_MSequence"""
+    idftxt = """Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Material, Other, Rough, autosize, 1.7, 2300, 900;
+    Building, B1, 0, City, 0.04, 0.4, FullExterior, 25, 6;
+    Building, B2, 0, City, 0.04, 0.4, FullExterior, 25, 6;"""
+    idf = IDF(StringIO(idftxt))
+    materials = idf.idfobjects['MATERIAL']
+    conductivities = materials.column('Conductivity')
+    assert np.allclose(conductivities, [0.9, 1.7, 1.7])
+    materials.set_column('Conductivity', conductivities * 1.1)
+    assert almostequal(materials[0].Conductivity, 0.99)
+    assert almostequal(materials[2].Conductivity, 1.87)
+    thicknesses = materials.column('Thickness')
+    assert np.isnan(thicknesses[2])
+    assert list(materials.column('Name')) == ['Brick', 'Concrete', 'Other']
+    materials.set_column('Roughness', np.array(['Smooth'] * 3))
+    assert materials[1].Roughness == 'Smooth'
+    # text is converted as in idfreader
+    materials.set_column('Density', ['2000', '2100', np.nan])
+    assert materials[0].Density == 2000.0
+    assert materials[2].Density == ''
+    assert idf.model.dt['MATERIAL'][0][5] == 2000.0
+    # integer fields
+    buildings = idf.idfobjects['BUILDING']
+    buildings.set_column('Maximum_Number_of_Warmup_Days', [24.9999999, 10])
+    assert buildings[0].Maximum_Number_of_Warmup_Days == 25
+    assert isinstance(buildings[0].Maximum_Number_of_Warmup_Days, int)
+    with pytest.raises(ValueError):
+        materials.set_column('Density', [1, 2])
+    with pytest.raises(BadEPFieldError):
+        materials.column('Not_A_Field')
+    assert len(idf.idfobjects['ZONE'].column('Name')) == 0
@@ -39,6 +39,30 @@ def test_cleanupversion():
         assert result == expected
     
 
+def test_sniffversion():
+    """py.test for sniffversion and getversionid"""
+    txt = """! Version, 1.0; in a comment
+    Building, Version Building, ! version in a comment, 8.1;
+    ;
+    Zone, Z1; Version,
+      8.9.0;  ! the version
+    Zone, Z2;
+    Zone, Z3;
+    """
+    fhandle = StringIO(txt)
+    versionid, lines = easyopen.sniffversion(fhandle)
+    assert versionid == '8.9.0'
+    assert easyopen.getversionid(txt) == '8.9.0'
+    # stops after the VERSION object
+    assert len(lines) == 5
+    assert ''.join(lines) + fhandle.read() == txt
+    # no VERSION object
+    fhandle = StringIO("Zone, Z1;\nZone, Z2;")
+    versionid, lines = easyopen.sniffversion(fhandle)
+    assert versionid is None
+    assert ''.join(lines) == "Zone, Z1;\nZone, Z2;"
+
+
 @pytest.mark.skipif(
     not do_integration_tests(), reason="$EPPY_INTEGRATION env var not set")
 def test_easyopen_idfopen():
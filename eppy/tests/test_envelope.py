@@ -0,0 +1,74 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""Tests for envelope.py
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+from six import StringIO
+
+np = pytest.importorskip('numpy')
+
+from eppy.constructions import envelope
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """
+  Construction, Wall, TestMaterial;
+  Construction, Glass, Clear;
+  Material, TestMaterial, Rough, 0.10, 0.5, 1000.0, 1200, 0.9, 0.6, 0.6;
+  WindowMaterial:Glazing, Clear;
+  BuildingSurface:Detailed, W1, Wall, Wall, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 0.0, 0.0, 3.0, 0.0, 0.0, 0.0, 4.0, 0.0, 0.0,
+    4.0, 0.0, 3.0;
+  BuildingSurface:Detailed, W2, Wall, Wall, Z1, Adiabatic, , NoSun,
+    NoWind, , 4, 4.0, 0.0, 3.0, 4.0, 0.0, 0.0, 4.0, 2.0, 0.0,
+    4.0, 2.0, 3.0;
+  BuildingSurface:Detailed, W3, Wall, Nowhere, Z1, Outdoors, , SunExposed,
+    WindExposed, , 4, 0.0, 2.0, 3.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0,
+    0.0, 0.0, 3.0;
+  FenestrationSurface:Detailed, Win1, Window, Glass, W1, , , , , 1, 4,
+    1.0, 0.0, 2.0, 1.0, 0.0, 1.0, 2.0, 0.0, 1.0, 2.0, 0.0, 2.0;
+  Shading:Site:Detailed, Shade1, , 4, 0, 0, 5, 0, 0, 0, 4, 0, 0, 4, 0, 5;
+"""
+
+
+def test_envelope_table():
+    """py.test for envelope_table"""
+    idf = IDF(StringIO(idftxt))
+    table = envelope.envelope_table(idf)
+    assert list(table['name']) == ['W1', 'W2', 'W3', 'Win1']
+    assert list(table['zone']) == ['Z1', 'Z1', 'Z1', 'Z1']
+    assert list(table['construction']) == ['Wall', 'Wall', 'Nowhere', 'Glass']
+    assert list(table['boundary']) == [
+        'Outdoors', 'Adiabatic', 'Outdoors', 'Outdoors']
+    assert np.allclose(table['grossarea'], [12, 6, 6, 1])
+    assert np.allclose(table['area'], [11, 6, 6, 1])
+    wall = idf.getobject('CONSTRUCTION', 'Wall')
+    assert almostequal(table['ufactor'][0], wall.ufactor)
+    assert almostequal(table['ufactor'][1], wall.ufactor)
+    assert np.isnan(table['ufactor'][2])  # construction not in idf
+    assert np.isnan(table['ufactor'][3])  # no U factor for glazing
+    assert almostequal(table['ua'][0], 11 * wall.ufactor)
+    # only the outdoor walls with a known U factor
+    assert almostequal(envelope.envelope_ua(idf), 11 * wall.ufactor)
+    assert almostequal(
+        envelope.envelope_ua(idf, boundaries=['Outdoors', 'Adiabatic']),
+        17 * wall.ufactor)
+    # no surfaces
+    idf = IDF(StringIO(""))
+    assert len(envelope.envelope_table(idf)) == 0
+    assert envelope.envelope_ua(idf) == 0
@@ -0,0 +1,60 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+
+"""py.test for function_helpers"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+import eppy.function_helpers as fh
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.pytest_helpers import almostequal
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt = """BuildingSurface:Detailed, 570C2E, Wall, Exterior Wall, 473222,
+    Outdoors, , SunExposed, WindExposed, , 4, 0.0, 0.0, 1.49, 0.0, 0.0,
+    0.0, 2.23, 0.0, 0.0, 2.23, 0.0, 1.49;"""
+
+
+def test_getvertices():
+    """py.test for getvertices"""
+    idf = IDF(StringIO(idftxt))
+    wall = idf.idfobjects['BuildingSurface:Detailed'.upper()][0]
+    vertices = fh.getvertices(wall)
+    assert len(vertices) == 4
+    assert [tuple(vertex) for vertex in vertices] == [
+        (0.0, 0.0, 1.49), (0.0, 0.0, 0.0), (2.23, 0.0, 0.0),
+        (2.23, 0.0, 1.49)]
+    assert [tuple(vertex) for vertex in wall.vertices] == [
+        tuple(coord) for coord in wall.coords]
+    # cached until a coordinate is written
+    assert wall.vertices is vertices
+    assert almostequal(wall.area, 2.23 * 1.49)
+    wall.Name = 'newname'
+    assert wall.vertices is vertices
+    wall.Vertex_1_Zcoordinate = 3.0
+    wall['Vertex_4_Zcoordinate'] = 3.0
+    assert wall.vertices is not vertices
+    assert almostequal(wall.area, 2.23 * 3.0)
+    assert almostequal(wall.height, 3.0)
+    assert almostequal(wall.width, 2.23)
+    assert almostequal(wall.azimuth, 180)
+    assert almostequal(wall.tilt, 90)
+    # writing directly into obj needs invalidategeometry
+    wall.obj[wall.objls.index('Vertex_1_Zcoordinate')] = 1.49
+    wall.obj[wall.objls.index('Vertex_4_Zcoordinate')] = 1.49
+    assert almostequal(wall.area, 2.23 * 3.0)
+    wall.invalidategeometry()
+    assert almostequal(wall.area, 2.23 * 1.49)
@@ -11,6 +11,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import pytest
 from six import StringIO
 
 import eppy.hvacbuilder as hvacbuilder
@@ -272,6 +273,20 @@ def test_renamenodes():
     outidf = IDF(StringIO(outtxt))
     result = idf.idfobjects['PIPE:ADIABATIC'][0].obj
     assert result == outidf.idfobjects['PIPE:ADIABATIC'][0].obj
+    # with a NodeIndex
+    idf = IDF(StringIO(idftxt))
+    nodeindex = hvacbuilder.NodeIndex(idf)
+    branch = idf.idfobjects['BRANCH'][0]
+    pipe = idf.idfobjects['PIPE:ADIABATIC'][0]
+    assert sorted(nodeindex.fields('np1_outlet')) == [
+        (branch.obj, 7), (pipe.obj, 3)]
+    pipe.Outlet_Node_Name = ['np1_outlet', 'np1_np2_node']
+    hvacbuilder.renamenodes(idf, fieldtype='node', idfobjects=[pipe],
+                            nodeindex=nodeindex)
+    assert pipe.obj == outidf.idfobjects['PIPE:ADIABATIC'][0].obj
+    assert branch.obj == outidf.idfobjects['BRANCH'][0].obj
+    assert nodeindex.fields('np1_outlet') == []
+    assert len(nodeindex.fields('np1_np2_node')) == 2
 
 def test_getfieldnamesendswith():
     """py.test for getfieldnamesendswith"""
@@ -539,6 +554,18 @@ def test_replacebranch():
         newbr = hvacbuilder.replacebranch(idf, loop, branch,
                                           components_thisnodes, fluid=fluid)
         assert newbr.obj == outbranch
+        # with a NodeIndex
+        idf1 = IDF(StringIO(""))
+        loop = hvacbuilder.makeplantloop(idf1, loopname, sloop, dloop)
+        nodeindex = hvacbuilder.NodeIndex(idf1)
+        components_thisnodes = [(idf1.newidfobject(key, Name=nm), thisnode)
+                                for key, nm, thisnode in componenttuple]
+        branch = idf1.getobject('BRANCH', branchname)
+        newbr = hvacbuilder.replacebranch(idf1, loop, branch,
+                                          components_thisnodes, fluid=fluid,
+                                          nodeindex=nodeindex)
+        assert newbr.obj == outbranch
+        assert str(idf1.model) == str(idf.model)
 
 def test_makepipecomponent():
     """py.test for makepipecomponent"""
@@ -649,3 +676,55 @@ def test_clean_listofcomponents_tuples():
         result = hvacbuilder._clean_listofcomponents_tuples(lst)
         assert result == clst
 
+
+def test_buildloops():
+    """py.test for buildloop and buildloops"""
+    sloop = ['sb0', ['sb1', 'sb2', 'sb3'], 'sb4']
+    dloop = ['db0', ['db1', 'db2', 'db3'], 'db4']
+    branches = {
+        'sb0': [("Chiller:Electric", 'Central_Chiller', 'Chilled_Water_'),
+                ("PIPE:ADIABATIC", 'np1', None)],
+        'sb2': [("PIPE:ADIABATIC", 'np2', None),
+                ("PIPE:ADIABATIC", 'np3', None)],
+        'db4': [("PIPE:ADIABATIC", 'np4', None)], }
+    # the same as making the loop and replacing the branches one by one
+    idf = IDF(StringIO(""))
+    loop = hvacbuilder.makeplantloop(idf, "p_loop", sloop, dloop)
+    for branchname, componenttuple in branches.items():
+        hvacbuilder.replacebranch1(idf, loop, branchname, componenttuple,
+                                   fluid='Water')
+    idf1 = IDF(StringIO(""))
+    newobjects = hvacbuilder.buildloop(
+        idf1, 'PlantLoop', "p_loop", sloop, dloop, branches=branches)
+    assert str(idf1.model) == str(idf.model)
+    assert newobjects[0].key == 'PLANTLOOP'
+    assert newobjects[0].Name == 'p_loop'
+    allobjects = [idfobject for key in idf1.model.dtls
+                  for idfobject in idf1.idfobjects[key]]
+    assert len(newobjects) == len(allobjects)
+    # many loops
+    idf2 = IDF(StringIO(""))
+    loopspecs = [
+        dict(loopkey='PLANTLOOP', loopname='p_loop', sloop=sloop,
+             dloop=dloop, branches=branches),
+        dict(loopkey='CONDENSERLOOP', loopname='c_loop',
+             sloop=['cb0', ['cb1'], 'cb2'], dloop=['cd0', ['cd1'], 'cd2']), ]
+    results = hvacbuilder.buildloops(idf2, loopspecs)
+    assert [result[0].Name for result in results] == ['p_loop', 'c_loop']
+    assert len(results[0]) == len(newobjects)
+    assert idf2.getobject('BRANCH', 'sb2').obj == idf.getobject(
+        'BRANCH', 'sb2').obj
+    with pytest.raises(hvacbuilder.WhichLoopError):
+        hvacbuilder.buildloop(idf2, 'ZONE', 'z', sloop, dloop)
+    # components made by an earlier loop of buildloops are found
+    idf3 = IDF(StringIO(""))
+    loopspecs[1]['branches'] = {
+        'cb1': [("PIPE:ADIABATIC", 'cd1_pipe', None)]}
+    hvacbuilder.buildloops(idf3, loopspecs)
+    pipenames = [pipe.Name for pipe in idf3.idfobjects['PIPE:ADIABATIC']]
+    assert pipenames.count('cd1_pipe') == 1
+    # a branch that is not in the loop
+    with pytest.raises(hvacbuilder.NoSuchBranchError):
+        hvacbuilder.buildloop(
+            IDF(StringIO("")), 'PlantLoop', "p_loop", sloop, dloop,
+            branches={'nobranch': [("PIPE:ADIABATIC", 'np9', None)]})
@@ -0,0 +1,111 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for iddregistry.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import gc
+
+from six import StringIO
+
+from eppy import easyopen
+from eppy import iddregistry
+from eppy import iddv7
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+iddv7handle = StringIO(iddv7.iddtxt)
+
+
+def test_bindidd():
+    """py.test for IDF.bindidd and the registry"""
+    classidd = IDF.getiddname()
+    idf8 = IDF(StringIO("Version, 8.0; Zone, Z1;"))
+    idf7 = IDF(StringIO("Version, 7.2; Zone, Z7;"), idd=iddv7handle)
+    assert IDF.getiddname() is classidd  # the class IDD did not change
+    assert not idf8.hasownidd()
+    assert idf7.hasownidd()
+    assert idf7.iddname is iddv7handle
+    assert idf7.idd_version[:2] == (7, 2)
+    assert idf8.idd_version[:2] == (8, 0)
+    assert idf7.idd_info is not idf8.idd_info
+    assert idf7.idfobjects['ZONE'][0].Name == 'Z7'
+    assert idf8.idfobjects['ZONE'][0].Name == 'Z1'
+    # the parsed IDD is shared
+    another7 = IDF(StringIO("Zone, Z71;"), idd=iddv7handle)
+    assert another7.idd_info is idf7.idd_info
+    assert another7.block is idf7.block
+    parsed = iddregistry.getidd(iddv7handle)
+    assert parsed.idd_info is idf7.idd_info
+    assert sorted(parsed.idd_index.keys()) == ['name2refs', 'ref2names']
+    # new objects use the IDD of the IDF
+    idf7.newidfobject('ZONE', Name='Z72')
+    assert idf7.idfobjects['ZONE'][1].objidd is idf7.idd_info[
+        idf7.model.dtls.index('ZONE')]
+    # copies keep the IDD
+    assert idf7.copy().idd_info is idf7.idd_info
+
+
+def test_iddforversion():
+    """py.test for iddforversion"""
+    IDF(StringIO(""), idd=iddv7handle)
+    parsed = iddregistry.getidd(iddv7handle)
+    assert iddregistry.iddforversion('7.2') is parsed
+    assert iddregistry.iddforversion('7.2.0') is parsed
+    assert iddregistry.iddforversion('7') is parsed
+    assert iddregistry.iddforversion('8.0').idd_version[:2] == (8, 0)
+    assert iddregistry.iddforversion('1.1') is None
+    assert iddregistry.iddkey('a.idd') == iddregistry.iddkey('./a.idd')
+
+
+def test_easyopen_registered():
+    """py.test for easyopen with an IDD in the registry"""
+    IDF(StringIO(""), idd=iddv7handle)
+    idf = easyopen.easyopen(StringIO("Version, 7.2; Zone, Z7;"))
+    assert idf.idd_info is iddregistry.getidd(iddv7handle).idd_info
+    assert idf.idfobjects['ZONE'][0].Name == 'Z7'
+    idf = easyopen.easyopen(StringIO("Version, 8.0; Zone, Z8;"))
+    assert idf.idd_version[:2] == (8, 0)
+    assert idf.idfobjects['ZONE'][0].Name == 'Z8'
+
+
+def test_preloadidd():
+    """py.test for preloadidd and freezeidds"""
+    iddhandle = StringIO(iddv7.iddtxt)
+    parsed = iddregistry.preloadidd(iddhandle)
+    assert parsed is iddregistry.getidd(iddhandle)
+    assert parsed.idd_version[:2] == (7, 2)
+    assert iddregistry.preloadidd(iddhandle) is parsed  # parsed once
+    idf = IDF(StringIO("Zone, Z1;"), idd=iddhandle)
+    assert idf.idd_info is parsed.idd_info
+    # defaults to the IDD of the class
+    assert iddregistry.preloadidd().iddname is IDF.getiddname()
+    if iddregistry.freezeidds():
+        gc.unfreeze()
+
+
+def test_handlekey():
+    """py.test for the registry keys of IDDs given as file handles"""
+    for idftxt in ["Zone, Z1;", "Zone, Z2;"]:
+        idf = IDF(idd=StringIO(iddv7.iddtxt))
+        idf.initreadtxt(idftxt)
+    versions = [parsed.idd_version[:2]
+                for parsed in iddregistry.registeredidds()]
+    assert versions.count((7, 2)) == 1
+    assert idf.idd_info is iddregistry.getidd(iddv7handle).idd_info
+    # the same text gives the same key, wherever the handle is
+    iddhandle = StringIO(iddv7.iddtxt)
+    iddhandle.read()
+    assert iddregistry.iddkey(iddhandle) == iddregistry.iddkey(iddv7handle)
@@ -102,6 +102,56 @@ def test_getobjectswithnode():
     resultset = set([item.Name for item in foundobjs]) 
     assert  resultset ==  expectedset
 
+
+def test_nodeindex():
+    """py.test for nodeindex"""
+    idf = IDF(StringIO(""))
+    nodekeys = idf_helpers.getidfkeyswithnodes()
+    assert [key for key, _ in idf_helpers.nodefieldindexes(idf)] == nodekeys
+    pipe = idf.newidfobject('PIPE:ADIABATIC', Name='pipe1',
+                            Inlet_Node_Name='node1', Outlet_Node_Name='node2')
+    index = idf_helpers.nodeindex(idf)
+    assert idf_helpers.nodeindex(idf) is index
+    assert index.objects('node1') == [pipe]
+    # kept up to date
+    branch = idf.newidfobject('BRANCH', Name='branch1',
+                              Component_1_Inlet_Node_Name='node1')
+    assert idf_helpers.getobjectswithnode(idf, nodekeys, 'node1') == [
+        branch, pipe]
+    pipe.Inlet_Node_Name = 'node3'
+    assert index.objects('node1') == [branch]
+    assert index.objects('node3') == [pipe]
+    pipe['Outlet_Node_Name'] = 'node1'
+    assert index.objects('node2') == []
+    assert len(index.objects('node1')) == 2
+    idf.removeidfobject(branch)
+    assert index.objects('node1') == [pipe]
+    # writing in obj needs fieldschanged
+    pipe.obj[2] = 'node4'
+    assert index.objects('node3') == []
+    assert index.objects('node4') == []
+    pipe.fieldschanged()
+    assert index.objects('node4') == [pipe]
+    # same as getobjectswithnode without the index
+    idf.initreadtxt(str(idf.idfobjects['PIPE:ADIABATIC'][0]))
+    assert idf_helpers.nodeindex(idf) is not index
+    foundobjs = idf_helpers.getobjectswithnode(idf, nodekeys, 'node4')
+    assert [obj.Name for obj in foundobjs] == ['pipe1']
+    # objects of a key are in model order after a node is renamed
+    pipes = [idf.newidfobject('PIPE:ADIABATIC', Name=name,
+                              Inlet_Node_Name='node5')
+             for name in ['pipe2', 'pipe3', 'pipe4']]
+    pipes[0].Inlet_Node_Name = 'node6'
+    pipes[0].Inlet_Node_Name = 'node5'
+    foundobjs = idf_helpers.getobjectswithnode(idf, nodekeys, 'node5')
+    assert [obj.Name for obj in foundobjs] == ['pipe2', 'pipe3', 'pipe4']
+    # and after an insert at the front and a remove
+    allpipes = idf.idfobjects['PIPE:ADIABATIC']
+    allpipes.insert(0, allpipes.pop())
+    idf.removeidfobject(pipes[1])
+    foundobjs = idf_helpers.getobjectswithnode(idf, nodekeys, 'node5')
+    assert [obj.Name for obj in foundobjs] == ['pipe4', 'pipe2']
+    
 def test_name2idfobject():
     """py.test for name2idfobject"""
     idf = IDF(StringIO(""))
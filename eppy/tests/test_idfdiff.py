@@ -0,0 +1,59 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for idfdiff.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+from six import StringIO
+
+pytest.importorskip('bs4')
+
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+from eppy.useful_scripts import idfdiff
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+idftxt1 = """Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Material, Stone, Rough, 0.2, 1.7, 2300, 900;
+    Construction, Wall, Brick, Concrete;
+    Zone, Z1;"""
+
+idftxt2 = """material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Material, Brick, Smooth, 0.1, 0.9, 1900, 800;
+    Material, Glass, Smooth, 0.003, 0.9, 2500, 840;
+    Construction, Wall, Brick, Concrete;
+    Zone, Z1;"""
+
+
+def test_idfdiffs():
+    """py.test for idfdiffs"""
+    idf1 = IDF(StringIO(idftxt1))
+    idf1.idfname = 'file1'
+    idf2 = IDF(StringIO(idftxt2))
+    idf2.idfname = 'file2'
+    expected = {
+        ('MATERIAL', 'Brick', 'Roughness'): ('Rough', 'Smooth'),
+        ('MATERIAL', 'Glass'): (None, 'file2'),
+        ('MATERIAL', 'Stone'): ('file1', None), }
+    assert idfdiff.idfdiffs(idf1, idf2) == expected
+    assert idfdiff.idfdiffs(idf1, idf2, processes=2) == expected
+    assert idfdiff.idfdiffs(idf1, idf1) == {}
+    csvdiffs = idfdiff.makecsvdiffs(expected, idf1.model.dtls,
+                                    'file1', 'file2')
+    assert csvdiffs[4:] == [
+        ['MATERIAL', 'Brick', 'Roughness', 'Rough', 'Smooth'],
+        ['MATERIAL', 'Glass', '', 'not here', 'is here'],
+        ['MATERIAL', 'Stone', '', 'is here', 'not here'], ]
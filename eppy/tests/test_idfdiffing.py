@@ -0,0 +1,40 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""py.test for idfdiffing.py"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from six import StringIO
+
+from eppy import idfdiffing
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+
+
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
+
+def test_changedkeys():
+    """py.test for changedkeys and keydiffs"""
+    idf1 = IDF(StringIO("Material, Brick, Rough, 0.1, 0.9, 1900, 800;"
+                        "Zone, Z1;"))
+    idf2 = IDF(StringIO("material, Brick, Smooth, 0.1, 0.9, 1900, 800;"
+                        "Zone, Z1;"))
+    changed = list(idfdiffing.changedkeys(idf1, idf2))
+    assert [akey for akey, objidd, named1, named2 in changed] == ['MATERIAL']
+    akey, objidd, named1, named2 = changed[0]
+    assert named1 == {'Brick': [('MATERIAL', 'Brick', 'Rough', 0.1, 0.9,
+                                 1900, 800)]}
+    fieldnames = [comm.get('field', [''])[0] for comm in objidd]
+    diffs = idfdiffing.keydiffs((akey, fieldnames, named1, named2,
+                                 'idf1', 'idf2'))
+    assert diffs == {('MATERIAL', 'Brick', 'Roughness'): ('Rough', 'Smooth')}
@@ -10,7 +10,10 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import pytest
+
 from eppy import modeleditor
+from eppy.bunch_subclass import BadEPFieldError
 from eppy.modeleditor import IDF
 from six import StringIO
 
@@ -131,4 +134,71 @@ def test_updateidf():
         idfhandle = StringIO(idftxt)
         idf = IDF(idfhandle)
         json_functions.updateidf(idf, dct)
-        assert idf.idfobjects[key][0][field] ==fieldval
\ No newline at end of file
+        assert idf.idfobjects[key][0][field] ==fieldval
+
+
+def test_makepatch():
+    """py.test for makepatch and applypatch"""
+    idftxt1 = """SimulationControl, No, No, No, No, Yes;
+    Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Material, Stone, Rough, 0.2, 1.7, 2300, 900;
+    Construction, Wall, Brick, Concrete;"""
+    idftxt2 = """SimulationControl, Yes, No, No, No, Yes;
+    Material, Brick, Smooth, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Material, Glass, Smooth, 0.003, 0.9, 2500, 840;
+    Construction, Wall, Brick, Concrete, Brick;"""
+    idf1 = IDF(StringIO(idftxt1))
+    idf2 = IDF(StringIO(idftxt2))
+    patch = json_functions.makepatch(idf1, idf2)
+    assert patch == {
+        'removed': [['MATERIAL', 'Stone'], ['CONSTRUCTION', 'Wall']],
+        'added': [
+            ['MATERIAL', 'Glass', 'Smooth', 0.003, 0.9, 2500, 840],
+            ['CONSTRUCTION', 'Wall', 'Brick', 'Concrete', 'Brick']],
+        'changed': {
+            'idf.SIMULATIONCONTROL..Do_Zone_Sizing_Calculation': 'Yes',
+            'idf.MATERIAL.Brick.Roughness': 'Smooth'}}
+    assert json_functions.makepatch(idf1, idf1) == {
+        'removed': [], 'added': [], 'changed': {}}
+    json_functions.applypatch(idf1, patch)
+    assert json_functions.makepatch(idf1, idf2) == {
+        'removed': [], 'added': [], 'changed': {}}
+    names = [material.Name for material in idf1.idfobjects['MATERIAL']]
+    assert names == ['Brick', 'Concrete', 'Glass']
+    assert idf1.idfobjects['CONSTRUCTION'][0].Layer_3 == 'Brick'
+
+
+def test_sweep():
+    """py.test for Sweep and sweep"""
+    idftxt = """SimulationControl, No, No, No, No, Yes;
+    Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;"""
+    keys = ['idf.Material.Brick.Thickness',
+            'idf.MATERIAL.Brick.Roughness',
+            'idf.SimulationControl..Do_Zone_Sizing_Calculation',
+            'idf.Material.Stone.Thickness']
+    table = [
+        {keys[0]: 0.2, keys[1]: 'Smooth', keys[3]: 0.3},
+        {keys[0]: 0.3, keys[2]: 'Yes', keys[3]: 0.4}, ]
+    idf = IDF(StringIO(idftxt))
+    asweep = json_functions.Sweep(idf, keys)
+    # Stone is made, as in updateidf
+    assert idf.getobject('MATERIAL', 'Stone') is not None
+    for row in table:
+        variant = IDF(StringIO(idftxt))
+        json_functions.updateidf(variant, row)
+        assert asweep.variantstr(row) == variant.idfstr()
+    assert asweep.variantstr([0.5, 'Rough', 'No', 0.1]) == (
+        asweep.variantstr({keys[0]: 0.5, keys[3]: 0.1}))
+    handles = [StringIO(), StringIO()]
+    assert json_functions.sweep(idf, table, handles) == handles
+    for row, handle in zip(table, handles):
+        variant = IDF(StringIO(idftxt))
+        json_functions.updateidf(variant, row)
+        saved = StringIO()
+        variant.save(saved)
+        assert handle.getvalue() == saved.getvalue()
+    with pytest.raises(BadEPFieldError):
+        json_functions.Sweep(idf, ['idf.Material.Brick.Not_A_Field'])
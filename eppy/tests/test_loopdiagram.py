@@ -15,13 +15,20 @@ from __future__ import unicode_literals
 import os
 
 import pytest
+from six import StringIO
 
+from eppy import hvacbuilder
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
 from eppy.useful_scripts.loopdiagram import clean_edges
 from eppy.useful_scripts.loopdiagram import dropnodes
 from eppy.useful_scripts.loopdiagram import edges2nodes
+from eppy.useful_scripts.loopdiagram import getedges
+from eppy.useful_scripts.loopdiagram import getidfedges
 from eppy.useful_scripts.loopdiagram import process_idf
 from eppy.useful_scripts.loopdiagram import replace_colon
 from eppy.pytest_helpers import do_integration_tests
+from eppy.walk_hvac import HVACGraph
 
 
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -31,6 +38,10 @@ RESOURCES_DIR = os.path.join(THIS_DIR, os.pardir, 'resources')
 IDD_FILES = os.path.join(RESOURCES_DIR, 'iddfiles')
 IDF_FILES = os.path.join(RESOURCES_DIR, 'idffiles')
 
+iddfhandle = StringIO(iddcurrent.iddtxt)
+if IDF.getiddname() == None:
+    IDF.setiddname(iddfhandle)
+
 def test_dropnodes():
     """py.test for dropnodes"""
     # test 1
@@ -95,7 +106,24 @@ def test_cleanedges():
     for edg, clean_edg in data:
         result = clean_edges(edg)
         assert result == clean_edg
-        
+
+
+def test_getidfedges():
+    """py.test for getidfedges"""
+    idf = IDF(StringIO(""))
+    hvacbuilder.makeplantloop(
+        idf, "p_loop", ['sb0', ['sb1', 'sb2', 'sb3'], 'sb4'],
+        ['db0', ['db1', 'db2', 'db3'], 'db4'])
+    edges = getidfedges(idf)
+    # same as reading the file again
+    assert edges == getedges(
+        StringIO(idf.idfstr()), StringIO(iddcurrent.iddtxt))
+    graph = HVACGraph(edges)
+    assert sorted(graph.sources()) == [
+        ('p_loop Demand Inlet', 'epnode'), ('p_loop Supply Inlet', 'epnode')]
+    assert sorted(graph.sinks()) == [
+        ('p_loop Demand Outlet', 'epnode'), ('p_loop Supply Outlet', 'epnode')]
+
 
 @pytest.mark.skipif(
     not do_integration_tests(), reason="$EPPY_INTEGRATION env var not set")
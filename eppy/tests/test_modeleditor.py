@@ -200,9 +200,7 @@ def test_rename():
     assert idf.idfobjects['CONSTRUCTION'][0].Layer_3 == 'peanut butter'
 
 
-def test_zonearea_zonevolume():
-    """py.test for zonearea and zonevolume"""
-    idftxt = """Zone, 473222, 0.0, 0.0, 0.0, 0.0, , 1;
+zoneidftxt = """Zone, 473222, 0.0, 0.0, 0.0, 0.0, , 1;
         BuildingSurface:Detailed, F7289B, Floor, Exterior Floor, 473222,
         Ground, ,
         NoSun, NoWind, , 4, 2.23, 2.56, 0.0, 2.23, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
@@ -245,6 +243,11 @@ def test_zonearea_zonevolume():
         Exterior Wall, 473222, Outdoors, , SunExposed, WindExposed, , 4,
         2.23, 2.52548139464, 1.49, 2.23, 2.52548139464, 0.0, 2.23, 2.56,
         0.0, 2.23, 2.56, 1.49;  """
+
+
+def test_zonearea_zonevolume():
+    """py.test for zonearea and zonevolume"""
+    idftxt = zoneidftxt
     idf = IDF(StringIO(idftxt))
     result = modeleditor.zonearea(idf, '473222')
     assert almostequal(result, 7.1938)
@@ -297,6 +300,55 @@ def test_zonearea_zonevolume():
     assert almostequal(result, 10.718762)
 
 
+def test_zone_geometry_table():
+    """py.test for zone_geometry_table"""
+    idftxt = zoneidftxt + """Zone, emptyzone;"""
+    idf = IDF(StringIO(idftxt))
+    result = modeleditor.zone_geometry_table(idf)
+    assert sorted(result.keys()) == ['473222', 'emptyzone']
+    assert almostequal(result['473222']['area'], 7.1938)
+    assert almostequal(result['473222']['height'], 1.49)
+    assert almostequal(result['473222']['volume'], 10.718762)
+    assert result['emptyzone'] == dict(area=0, height=0, volume=0)
+    # same values as the single zone functions
+    assert almostequal(
+        result['473222']['area'], modeleditor.zonearea(idf, '473222'))
+    assert almostequal(
+        result['473222']['height'], modeleditor.zoneheight(idf, '473222'))
+    # changing the returned table does not change the cache
+    result['473222']['area'] = 42
+    result = modeleditor.zone_geometry_table(idf)
+    assert almostequal(result['473222']['area'], 7.1938)
+    # recalculated when the geometry changes
+    roof = idf.getobject('BuildingSurface:Detailed'.upper(), 'E6DF3B')
+    roof.Vertex_1_Zcoordinate = 2.98
+    result = modeleditor.zone_geometry_table(idf)
+    assert almostequal(result['473222']['height'], 2.98)
+    floors = [s for s in idf.idfobjects['BuildingSurface:Detailed'.upper()]
+              if s.Surface_Type.upper() == 'FLOOR']
+    for floor in floors:
+        idf.removeidfobject(floor)
+    result = modeleditor.zone_geometry_table(idf)
+    assert almostequal(
+        result['473222']['area'], modeleditor.zonearea(idf, '473222'))
+    assert almostequal(result['473222']['height'], 2.98)
+    # the table is kept until a zone or a surface changes
+    index = modeleditor.zonegeometryindex(idf)
+    table = index.gettable()
+    modeleditor.zonevolume(idf, '473222')
+    assert index.gettable() is table
+    idf.newidfobject('MATERIAL', Name='notageometry')
+    assert index.gettable() is table
+    idf.newidfobject('ZONE', Name='newzone')
+    assert index.gettable() is not table
+    assert 'newzone' in index.gettable()
+    # as zoneheight, zonevolume fails for a zone with no surfaces
+    with pytest.raises(ValueError):
+        modeleditor.zoneheight(idf, 'emptyzone')
+    with pytest.raises(ValueError):
+        modeleditor.zonevolume(idf, 'EMPTYZONE')
+
+
 def test_new():
     """py.test for IDF.new()"""
     idf = IDF()
@@ -348,6 +400,257 @@ def test_newidfobject():
     assert sim_deffalse.Do_Zone_Sizing_Calculation == ''
 
 
+def test_query():
+    """py.test for IDF.query"""
+    idftxt = """Building, Office, 30.0;
+    Building, OFFICE, 30.000000001;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Material, concrete, MediumRough, 0.1, 1.7, 2300, 900;
+    Material, Brick, Rough, 0.1000000001, 0.9, 1900, 800;"""
+    idf = IDF(StringIO(idftxt))
+    materials = idf.idfobjects['MATERIAL']
+    # Name of Building is retaincase
+    buildings = idf.query('BUILDING', Name='Office')
+    assert [bldg.Name for bldg in buildings] == ['Office']
+    assert idf.query('building', North_Axis=30) == list(
+        idf.idfobjects['BUILDING'])
+    assert idf.query('BUILDING', North_Axis=30, places=12) == [
+        idf.idfobjects['BUILDING'][0]]
+    # Name of Material ignores case
+    assert idf.query('MATERIAL', Name='CONCRETE') == materials[:2]
+    assert idf.query('MATERIAL', Thickness='0.1') == materials[1:]
+    assert idf.query('MATERIAL', Roughness='rough', Thickness=0.1) == [
+        materials[2]]
+    assert idf.query('MATERIAL', Thickness=lambda value: value < 0.15) == (
+        materials[1:])
+    assert idf.query('MATERIAL', Name='concrete',
+                     Conductivity=lambda value: value > 1) == materials[:2]
+    assert idf.query('MATERIAL', Name='Glass') == []
+    assert idf.query('MATERIAL:AIRGAP', Name='Argon') == []
+    with pytest.raises(modeleditor.BadEPFieldError):
+        idf.query('MATERIAL', Not_A_Field=1)
+    # same as getobjects
+    for kwargs in [dict(Name='CONCRETE'), dict(Roughness='Rough'),
+                   dict(Density=2300, Specific_Heat=900)]:
+        assert idf.query('MATERIAL', **kwargs) == modeleditor.getobjects(
+            idf.idfobjects, idf.model, idf.idd_info, 'MATERIAL', **kwargs)
+    # the indexes are kept up to date
+    materials[0].Name = 'Stone'
+    materials[2]['Thickness'] = 0.2
+    assert idf.query('MATERIAL', Name='concrete') == [materials[1]]
+    assert idf.query('MATERIAL', Name='stone') == [materials[0]]
+    assert idf.query('MATERIAL', Thickness=0.2) == [materials[0],
+                                                    materials[2]]
+    glass = idf.newidfobject('MATERIAL', Name='Glass', Thickness=0.2)
+    assert idf.query('MATERIAL', Name='Glass') == [glass]
+    assert idf.query('MATERIAL', Thickness=0.2)[-1] is glass
+    idf.removeidfobject(materials[0])
+    assert idf.query('MATERIAL', Name='stone') == []
+    assert idf.query('MATERIAL', Thickness=0.2) == [materials[1], glass]
+    # writing directly into obj needs fieldschanged
+    glass.obj[1] = 'Clear'
+    assert idf.query('MATERIAL', Name='Clear') == []
+    glass.fieldschanged()
+    assert idf.query('MATERIAL', Name='Clear') == [glass]
+    # the objects stay in model order after their fields are written
+    idf = IDF(StringIO("""Material, A, Rough, 0.1;
+    Material, B, Rough, 0.1;
+    Material, C, Rough, 0.1;"""))
+    roughs = idf.query('MATERIAL', Roughness='Rough')
+    assert [mat.Name for mat in roughs] == ['A', 'B', 'C']
+    a, b, c = roughs
+    a.Roughness = 'Rough'
+    assert [mat.Name for mat in idf.query(
+        'MATERIAL', Roughness='Rough')] == ['A', 'B', 'C']
+    b.Roughness = 'Smooth'
+    c.Roughness = 'Rough'
+    b.Roughness = 'Rough'
+    assert [mat.Name for mat in idf.query(
+        'MATERIAL', Roughness='Rough')] == ['A', 'B', 'C']
+    assert [mat.Name for mat in idf.query(
+        'MATERIAL', Thickness=0.1)] == ['A', 'B', 'C']
+    # objects added at the end and anywhere else
+    idf.newidfobject('MATERIAL', Name='D', Roughness='Rough')
+    assert [mat.Name for mat in idf.query(
+        'MATERIAL', Roughness='Rough')] == ['A', 'B', 'C', 'D']
+    materials = idf.idfobjects['MATERIAL']
+    materials.insert(0, materials.pop())
+    assert [mat.Name for mat in idf.query(
+        'MATERIAL', Roughness='Rough')] == ['D', 'A', 'B', 'C']
+    idf.removeidfobject(materials[1])
+    assert [mat.Name for mat in idf.query(
+        'MATERIAL', Roughness='Rough')] == ['D', 'B', 'C']
+
+
+def test_template():
+    """py.test for IDF.template"""
+    idftxt = """Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Construction, Wall, Brick;"""
+    idf = IDF(StringIO(idftxt))
+    brick, concrete = idf.idfobjects['MATERIAL']
+    wall = idf.idfobjects['CONSTRUCTION'][0]
+    fields = [(brick, 'Roughness'), (concrete, 'Specific_Heat'),
+              (wall, 'Layer_2'), (brick, 'Thickness')]
+    template = idf.template(fields)
+    assert template.basevalues == ['Rough', 900, '', 0.1]
+    assert template.idfstr(template.basevalues) == idf.idfstr()
+    values = ['Smooth', 1000, 'Concrete', 0.25]
+    text = template.idfstr(values)
+    saved = StringIO()
+    template.save(values, saved)
+    for (idfobject, fieldname), value in zip(fields, values):
+        idfobject[fieldname] = value
+    assert text == idf.idfstr()
+    idfsaved = StringIO()
+    idf.save(idfsaved)
+    assert saved.getvalue() == idfsaved.getvalue()
+    with pytest.raises(modeleditor.BadEPFieldError):
+        idf.template([(brick, 'Not_A_Field')])
+
+
+@pytest.mark.parametrize('outputtype', ['nocomment', 'nocomment1',
+                                        'nocomment2', 'compressed'])
+def test_template_outputtype(outputtype):
+    """py.test for IDF.template with the outputtype of the idf"""
+    idftxt = """Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Construction, Wall, Brick;"""
+    idf = IDF(StringIO(idftxt))
+    idf.outputtype = outputtype
+    brick, concrete = idf.idfobjects['MATERIAL']
+    wall = idf.idfobjects['CONSTRUCTION'][0]
+    fields = [(brick, 'Name'), (concrete, 'Specific_Heat'),
+              (wall, 'Layer_2')]
+    template = idf.template(fields)
+    assert template.idfstr(template.basevalues) == idf.idfstr()
+    values = ['Stone', 1000, 'Concrete']
+    saved = StringIO()
+    template.save(values, saved)
+    for (idfobject, fieldname), value in zip(fields, values):
+        idfobject[fieldname] = value
+    idfsaved = StringIO()
+    idf.save(idfsaved)
+    assert saved.getvalue() == idfsaved.getvalue()
+    idf.outputtype = 'other'
+    with pytest.raises(ValueError):
+        idf.template(fields)
+
+
+def test_copy():
+    """py.test for IDF.copy"""
+    idftxt = """Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Construction, Wall, Brick, Concrete;"""
+    idf = IDF(StringIO(idftxt))
+    idfcopy = idf.copy()
+    assert idfcopy.idfstr() == idf.idfstr()
+    brick, concrete = idf.idfobjects['MATERIAL']
+    brickcopy, concretecopy = idfcopy.idfobjects['MATERIAL']
+    assert brickcopy.theidf is idfcopy
+    # the field values are shared until they are written
+    assert brickcopy.obj is brick.obj
+    brickcopy.Roughness = 'Smooth'
+    assert brickcopy.obj is not brick.obj
+    assert brick.Roughness == 'Rough'
+    assert idfcopy.model.dt['MATERIAL'][0] is brickcopy.obj
+    concrete['Thickness'] = 0.3
+    assert concretecopy.Thickness == 0.2
+    assert idf.model.dt['MATERIAL'][1] is concrete.obj
+    # the objects of the copy are its own
+    idfcopy.newidfobject('MATERIAL', Name='Glass')
+    idfcopy.removeidfobject(concretecopy)
+    assert len(idf.idfobjects['MATERIAL']) == 2
+    assert [material.Name for material in idfcopy.query(
+        'MATERIAL', Roughness='Smooth')] == ['Brick']
+    assert idf.query('MATERIAL', Roughness='Smooth') == []
+    # writing directly into obj needs ownobj
+    wall = idf.idfobjects['CONSTRUCTION'][0]
+    wallcopy = idfcopy.idfobjects['CONSTRUCTION'][0]
+    wallcopy.ownobj()[2] = 'Glass'
+    assert wall.Outside_Layer == 'Brick'
+    assert idfcopy.model.dt['CONSTRUCTION'][0][2] == 'Glass'
+
+
+def test_newidfobjects():
+    """py.test for newidfobjects"""
+    idf = IDF()
+    idf.new()
+    objtype = 'material:airgap'.upper()
+    rows = [dict(Name='Argon', Thermal_Resistance=0.1), dict(Name='Krypton')]
+    gaps = idf.newidfobjects(objtype, rows)
+    idf.newidfobjects(objtype, [['Xenon', 0.2], ['Air']])
+    idf.newidfobjects(objtype, [[0.3, 'Neon']],
+                      fieldnames=['Thermal_Resistance', 'Name'])
+    assert idf.model.dt[objtype] == [['MATERIAL:AIRGAP', 'Argon', 0.1],
+                                     ['MATERIAL:AIRGAP', 'Krypton'],
+                                     ['MATERIAL:AIRGAP', 'Xenon', 0.2],
+                                     ['MATERIAL:AIRGAP', 'Air'],
+                                     ['MATERIAL:AIRGAP', 'Neon', 0.3],
+                                     ]
+    assert list(idf.idfobjects[objtype])[:2] == gaps
+    assert gaps[0].theidf is idf
+    # the same as newidfobject
+    other = IDF()
+    other.new()
+    for row in rows:
+        other.newidfobject(objtype, **row)
+    other.newidfobject('SimulationControl'.upper(),
+                       Do_Zone_Sizing_Calculation='Yes')
+    idf.newidfobjects('SimulationControl'.upper(),
+                      [dict(Do_Zone_Sizing_Calculation='Yes')])
+    assert other.model.dt[objtype] == idf.model.dt[objtype][:2]
+    assert other.idfobjects['SIMULATIONCONTROL'][0].obj == (
+        idf.idfobjects['SIMULATIONCONTROL'][0].obj)
+    with pytest.raises(modeleditor.BadEPFieldError):
+        idf.newidfobjects(objtype, [dict(Not_A_Field=1)])
+    with pytest.raises(modeleditor.BadEPFieldError):
+        idf.newidfobjects(objtype, [['Air', 0.1, 'too many']])
+
+
+def test_removeidfobjects():
+    """py.test for removeidfobjects and filter"""
+    idftxt = """Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Material, Concrete, Rough, 0.2, 1.7, 2300, 900;
+    Material, Stone, Rough, 0.3, 1.7, 2300, 900;
+    Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+    Construction, Wall, Brick, Concrete;
+    Zone, Z1;"""
+    idf = IDF(StringIO(idftxt))
+    materials = list(idf.idfobjects['MATERIAL'])
+    wall = idf.idfobjects['CONSTRUCTION'][0]
+    # found by identity. the first Brick is equal to the last one
+    idf.removeidfobjects([materials[3], wall, materials[1]])
+    assert list(idf.idfobjects['MATERIAL']) == [materials[0], materials[2]]
+    assert idf.idfobjects['MATERIAL'][0] is materials[0]
+    assert idf.model.dt['MATERIAL'] == [materials[0].obj, materials[2].obj]
+    assert idf.model.dt['CONSTRUCTION'] == []
+    assert len(idf.idfobjects['ZONE']) == 1
+    # filter
+    removed = idf.filter('material', lambda material: material.Thickness > 0.2)
+    assert removed == [materials[0]]
+    assert idf.model.dt['MATERIAL'] == [materials[2].obj]
+    assert idf.query('MATERIAL', Name='Brick') == []
+    assert idf.filter('MATERIAL', lambda material: True) == []
+    idf.removeidfobjects([])
+    # the removed objects are no longer in the idf or its indexes
+    idf = IDF(StringIO(idftxt))
+    zone = idf.idfobjects['ZONE'][0]
+    assert idf.query('ZONE', Name='Z1') == [zone]
+    brick, concrete = idf.idfobjects['MATERIAL'][:2]
+    wall = idf.idfobjects['CONSTRUCTION'][0]
+    ufactor = wall.ufactor
+    idf.removeidfobjects([zone, concrete])
+    assert zone.theidf is None
+    zone.Name = 'foo'
+    assert idf.query('ZONE', Name='foo') == []
+    concrete.Thickness = 0.4
+    with pytest.raises(AttributeError):
+        wall.ufactor  # Concrete is not in the idf
+    wall.Layer_2 = 'Stone'
+    assert not almostequal(wall.ufactor, ufactor)
+
+
 def test_newidfobject_warning():
     """Test that the warning for newidfobject created with `aname` is working.
 
@@ -620,4 +923,5 @@ def test_idd_index():
     """py.test to see if idd_index is returned"""
     idftxt = """"""
     idf = IDF(StringIO(idftxt))
-    assert idf.idd_index == {}
+    # the idd was parsed already. Its idd_index is kept in iddregistry
+    assert sorted(idf.idd_index.keys()) == ['name2refs', 'ref2names']
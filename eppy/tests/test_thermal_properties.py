@@ -15,6 +15,7 @@ import warnings
 
 from six import StringIO
 
+from eppy.constructions import thermal_properties
 from eppy.constructions.thermal_properties import INSIDE_FILM_R
 from eppy.constructions.thermal_properties import OUTSIDE_FILM_R
 from eppy.iddcurrent import iddcurrent
@@ -411,3 +412,73 @@ class Test_ThermalProperties(object):
         expected = (m.Thickness * m.Specific_Heat * m.Density * 0.001)
         assert m.heatcapacity == expected
         assert m.heatcapacity == 120
+
+    def test_construction_memo_invalidation(self):
+        self.idf.initreadtxt(air_gap)
+        c = self.idf.getobject('CONSTRUCTION', 'TestConstruction')
+        m = self.idf.getobject('MATERIAL', 'TestMaterial')
+        a = self.idf.getobject('MATERIAL:AIRGAP', 'AirGap')
+        assert almostequal(c.rvalue, 0.65, places=2)
+        assert almostequal(c.heatcapacity, 240, places=2)
+        # change a field of a layer material
+        m.Thickness = 0.2
+        assert almostequal(c.rvalue, 1.05, places=2)
+        assert almostequal(c.heatcapacity, 480, places=2)
+        # change the layers
+        c.Layer_2 = 'TestMaterial'
+        assert almostequal(c.rvalue, 1.35, places=2)
+        c.Layer_2 = 'AirGap'
+        assert almostequal(c.rvalue, 1.05, places=2)
+        # rename a material
+        a.Name = 'NewGap'
+        try:
+            c.rvalue
+            assert False
+        except AttributeError as e:
+            assert str(e) == "AirGap material not found in IDF"
+        c.Layer_2 = 'NewGap'
+        assert almostequal(c.rvalue, 1.05, places=2)
+        # remove a material and add another with the same name
+        self.idf.removeidfobject(a)
+        newgap = self.idf.copyidfobject(m)
+        newgap.Name = 'NewGap'
+        newgap.Thickness = 0.05
+        assert almostequal(c.rvalue, 1.05, places=2)
+        newgap.Thickness = 0.1
+        assert almostequal(c.rvalue, 1.15, places=2)
+
+    def test_construction_memo_copy_remove(self):
+        self.idf.initreadtxt(air_gap)
+        c = self.idf.getobject('CONSTRUCTION', 'TestConstruction')
+        assert almostequal(c.rvalue, 0.65, places=2)
+        memo = thermal_properties._layersummemo(self.idf, ('CONSTRUCTION', ))
+        assert len(memo.sums) == 1
+        assert memo.materialtable(('MATERIAL', ))['TESTMATERIAL']
+        # a material that is not a layer keeps the sums
+        other = self.idf.newidfobject('MATERIAL', Name='Other')
+        assert len(memo.sums) == 1
+        assert not memo.tables  # an added material drops the tables
+        memo.materialtable(('MATERIAL', ))
+        other.Thickness = 0.3
+        assert len(memo.sums) == 1
+        assert memo.tables
+        # a layer material drops the sums of its constructions
+        m = self.idf.getobject('MATERIAL', 'TestMaterial')
+        m.Thickness = 0.1
+        assert len(memo.sums) == 0
+        assert memo.tables
+        assert almostequal(c.rvalue, 0.65, places=2)
+        # a copy has its own memo
+        idf2 = self.idf.copy()
+        c2 = idf2.getobject('CONSTRUCTION', 'TestConstruction')
+        assert almostequal(c2.rvalue, 0.65, places=2)
+        memo2 = thermal_properties._layersummemo(idf2, ('CONSTRUCTION', ))
+        assert memo2 is not memo
+        assert len(memo.sums) == 1
+        # the memo is emptied when a construction or material is removed
+        idf2.removeidfobject(c2)
+        assert len(memo2.sums) == 0
+        assert len(memo.sums) == 1
+        self.idf.removeidfobject(
+            self.idf.getobject('MATERIAL:AIRGAP', 'AirGap'))
+        assert len(memo.sums) == 0
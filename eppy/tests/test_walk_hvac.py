@@ -262,3 +262,50 @@ def test_prevnode():
         result = walk_hvac.prevnode(edges, comp)
         assert result == [prevcomp]
         
+
+def test_HVACGraph():
+    """py.test for HVACGraph"""
+    graph = walk_hvac.HVACGraph(e1)
+    # same as nextnode and prevnode
+    for edges in (e1, e2):
+        thegraph = walk_hvac.HVACGraph(edges)
+        for item in thegraph.items():
+            assert thegraph.nextnode(item) == walk_hvac.nextnode(edges, item)
+            assert thegraph.prevnode(item) == walk_hvac.prevnode(edges, item)
+    assert graph.nextnode('p_loop_supply_splitter') == [
+        'sb1_pipe', 'sb2_pipe', 'sb3_pipe']
+    assert graph.prevnode('p_loop_supply_mixer') == [
+        'sb1_pipe', 'sb2_pipe', 'sb3_pipe']
+    # downstream and upstream
+    assert graph.downstream('np2') == [
+        'p_loop_supply_splitter', 'sb1_pipe', 'sb2_pipe', 'sb3_pipe',
+        'p_loop_supply_mixer', 'sb4_pipe']
+    assert graph.downstream('sb4_pipe') == []
+    assert graph.downstream('sb4_pipe', nodes=True) == [
+        ('p_loop Supply Outlet', 'epnode')]
+    assert graph.upstream('np1') == ['Central_Chiller']
+    assert graph.upstream('np1', nodes=True) == [
+        ('Central_Chiller_np1_node', 'epnode'),
+        'Central_Chiller',
+        ('p_loop Supply Inlet', 'epnode')]
+    # sources, sinks and disconnected groups
+    assert graph.sources() == [
+        ('p_loop Supply Inlet', 'epnode'), ('p_loop Demand Inlet', 'epnode')]
+    assert graph.sinks() == [
+        ('p_loop Supply Outlet', 'epnode'), ('p_loop Demand Outlet', 'epnode')]
+    groups = graph.connectedgroups()
+    assert len(groups) == 2  # supply side and demand side
+    assert 'Central_Chiller' in groups[0] or 'Central_Chiller' in groups[1]
+    assert graph.cycles() == []
+    # close the loop
+    edges = list(e1) + [
+        ('sb4_pipe', ('p_loop Demand Inlet', 'epnode')),
+        ('db4_pipe', ('p_loop Supply Inlet', 'epnode'))]
+    graph = walk_hvac.HVACGraph(edges)
+    assert len(graph.connectedgroups()) == 1
+    cycles = graph.cycles()
+    assert len(cycles) == 1
+    assert set(cycles[0]) == set(graph.items()) - set(graph.sinks())
+    # a component connected to itself
+    graph = walk_hvac.HVACGraph([('a', 'a'), ('a', 'b')])
+    assert graph.cycles() == [['a']]
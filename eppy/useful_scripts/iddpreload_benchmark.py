@@ -0,0 +1,120 @@
+# Copyright (c) 2019 Santosh Philip
+# =======================================================================
+#  Distributed under the MIT License.
+#  (See accompanying file LICENSE or copy at
+#  http://opensource.org/licenses/MIT)
+# =======================================================================
+"""Startup time of forked workers, with and without an IDD preloaded in the
+parent (see eppy.iddregistry.preloadidd and freezeidds).
+
+Each worker reads a small idf file once. Without preloading, each worker
+parses the IDD. With preloading, the workers use the IDD parsed in the
+parent. On linux the memory copied from the parent (Private_Dirty) is
+shown too.
+
+Works only where processes can be forked::
+
+    python iddpreload_benchmark.py --workers 4
+    python iddpreload_benchmark.py --idd /path/to/Energy+.idd
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import gc
+import multiprocessing
+import sys
+import time
+
+from six import StringIO
+
+pathnameto_eplusscripting = "../../"
+sys.path.append(pathnameto_eplusscripting)
+
+from eppy import iddregistry
+from eppy.iddcurrent import iddcurrent
+from eppy.modeleditor import IDF
+
+IDFTXT = """Zone, Z1;
+Material, Brick, Rough, 0.1, 0.9, 1900, 800;
+Construction, Wall, Brick;
+"""
+
+
+def privatedirty():
+    """kB of memory of this process not shared with other processes.
+    None if /proc/self/smaps_rollup is not there"""
+    try:
+        with open('/proc/self/smaps_rollup') as fhandle:
+            for line in fhandle:
+                if line.startswith('Private_Dirty:'):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+    return None
+
+
+def startworker(queue):
+    """read an idf, run a collection and put the times in queue"""
+    start = time.time()
+    IDF(StringIO(IDFTXT))
+    startup = time.time() - start
+    gc.collect()  # a collection in a worker can copy pages of the parent
+    queue.put((startup, privatedirty()))
+
+
+def runworkers(context, workers):
+    """[(startup, privatedirty), ...] of workers forked workers"""
+    queue = context.Queue()
+    processes = [context.Process(target=startworker, args=(queue, ))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return results
+
+
+def printresults(title, results):
+    """print the mean startup time and memory of the workers"""
+    startups = [startup for startup, dirty in results]
+    line = "%s: %.3f s per worker" % (title, sum(startups) / len(startups))
+    dirties = [dirty for startup, dirty in results if dirty is not None]
+    if dirties:
+        line += ", %d kB private per worker" % (sum(dirties) / len(dirties))
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(usage=None, description=__doc__,
+                                     formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--idd', action='store', default=None,
+                        help='location of the idd file. Default is the idd in eppy.iddcurrent')
+    parser.add_argument('--workers', action='store', type=int, default=4,
+                        help='number of workers to fork')
+    nspace = parser.parse_args()
+    context = multiprocessing.get_context('fork')
+    if nspace.idd is None:
+        iddname = StringIO(iddcurrent.iddtxt)
+    else:
+        iddname = nspace.idd
+    IDF.setiddname(iddname)
+
+    # the IDD is not parsed in the parent. Each worker parses it
+    printresults("not preloaded", runworkers(context, nspace.workers))
+
+    start = time.time()
+    iddregistry.preloadidd()
+    print("preloading in the parent: %.3f s" % (time.time() - start, ))
+    printresults("preloaded", runworkers(context, nspace.workers))
+    if iddregistry.freezeidds():
+        printresults("preloaded and frozen",
+                     runworkers(context, nspace.workers))
+        gc.unfreeze()
+
+
+if __name__ == '__main__':
+    main()
@@ -18,6 +18,7 @@ from __future__ import unicode_literals
 
 import argparse
 
+import multiprocessing
 from pprint import pprint
 import sys
 import itertools
@@ -34,6 +35,11 @@ from eppy.bunch_subclass import BadEPFieldError
 from eppy.modeleditor import IDF
 from eppy.easyopen import easyopen
 from eppy.modeleditor import IDDAlreadySetError
+from eppy.idfdiffing import getobjname
+from eppy.idfdiffing import normalobj
+from eppy.idfdiffing import namedobjs
+from eppy.idfdiffing import keydiffs
+from eppy.idfdiffing import changedkeys
 
 help_message = '''
 The help message goes here.
@@ -47,15 +53,6 @@ class Usage(Exception):
         self.msg = msg
 
 
-def getobjname(item):
-    """return obj name or blank """
-    try:
-        objname = item.Name
-    except BadEPFieldError as e:
-        objname = ' '
-    return objname
-
-
 def theheader(n1, n2):
     """return the csv header"""
     s = "Object Key, Object Name, Field Name, %s, %s" % ('file1', 'file2')
@@ -95,43 +92,31 @@ def makecsvdiffs(thediffs, dtls, n1, n2):
     return rows
 
 
-def idfdiffs(idf1, idf2):
-    """return the diffs between the two idfs"""
+def idfdiffs(idf1, idf2, processes=None):
+    """return the diffs between the two idfs
+
+    The objects of each key are matched by name in a dict. Keys and names
+    whose objects are the same in both idfs are skipped without comparing
+    the fields. If processes is more than 1, the keys are compared in that
+    many processes"""
     # for any object type, it is sorted by name
+    jobs = []
+    for akey, objidd, named1, named2 in changedkeys(idf1, idf2):
+        fieldnames = [comm.get('field', [''])[0] for comm in objidd]
+        jobs.append((akey, fieldnames, named1, named2,
+                     idf1.idfname, idf2.idfname))
+    if processes and processes > 1 and len(jobs) > 1:
+        pool = multiprocessing.Pool(processes)
+        try:
+            keysdiffs = pool.map(keydiffs, jobs)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        keysdiffs = [keydiffs(job) for job in jobs]
     thediffs = {}
-    keys = idf1.model.dtls # undocumented variable
-
-    for akey in keys:
-        idfobjs1 = idf1.idfobjects[akey]
-        idfobjs2 = idf2.idfobjects[akey]
-        names = set([getobjname(i) for i in idfobjs1] +
-                    [getobjname(i) for i in idfobjs2])
-        names = sorted(names)
-        idfobjs1 = sorted(idfobjs1, key=lambda idfobj: idfobj['obj'])
-        idfobjs2 = sorted(idfobjs2, key=lambda idfobj: idfobj['obj'])
-        for name in names:
-            n_idfobjs1 = [item for item in idfobjs1
-                          if getobjname(item) == name]
-            n_idfobjs2 = [item for item in idfobjs2
-                          if getobjname(item) == name]
-            for idfobj1, idfobj2 in zip_longest(n_idfobjs1,
-                                                           n_idfobjs2):
-                if idfobj1 == None:
-                    thediffs[(idfobj2.key.upper(), 
-                                getobjname(idfobj2))] = (None, idf2.idfname) #(idf1.idfname, None) -> old
-                    break
-                if idfobj2 == None:
-                    thediffs[(idfobj1.key.upper(), 
-                                getobjname(idfobj1))] = (idf1.idfname, None) # (None, idf2.idfname) -> old
-                    break
-                for i, (f1, f2) in enumerate(zip(idfobj1.obj, idfobj2.obj)):
-                    if i == 0:
-                        f1, f2 = f1.upper(), f2.upper()
-                    if f1 != f2:
-                        thediffs[(
-                            akey,
-                            getobjname(idfobj1),
-                            idfobj1.objidd[i]['field'][0])] = (f1, f2)
+    for diffs in keysdiffs:
+        thediffs.update(diffs)
     return thediffs
 
 def printcsv(csvdiffs):
@@ -197,6 +182,8 @@ if __name__ == '__main__':
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument('--csv', action='store_true')
     group.add_argument('--html', action='store_true')
+    parser.add_argument("--processes", action='store', type=int,
+                    help='compare the object keys in this many processes')
     nspace = parser.parse_args()
     fname1 = nspace.file1
     fname2 = nspace.file2
@@ -212,7 +199,7 @@ if __name__ == '__main__':
     
     # TODO What id they have different idd files ?
     dtls = idf1.model.dtls # undocumented variable
-    thediffs = idfdiffs(idf1, idf2)
+    thediffs = idfdiffs(idf1, idf2, processes=nspace.processes)
     csvdiffs = makecsvdiffs(thediffs, dtls, idf1.idfname, idf2.idfname)
     if nspace.csv:
         printcsv(csvdiffs)
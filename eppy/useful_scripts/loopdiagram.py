@@ -237,9 +237,10 @@ def makeairplantloop(data, commdct):
     branchkey = "branch".upper()
     branches = data.dt[branchkey]
     branch_i_o = {}
+    all_in_out = loops.branches_inlet_outlet(data, commdct)
     for br in branches:
         br_name = br[1]
-        in_out = loops.branch_inlet_outlet(data, commdct, br_name)
+        in_out = all_in_out[br_name]
         branch_i_o[br_name] = dict(list(zip(["inlet", "outlet"], in_out)))
     # for br_name, in_out in branch_i_o.items():
     #     edges.append(((in_out["inlet"], anode), br_name))
@@ -501,6 +502,13 @@ def getedges(fname, iddfile):
     return edges
 
 
+def getidfedges(idf):
+    """return the edges of an IDF that is already loaded
+
+    Uses the model of the idf without reading the file again"""
+    return makeairplantloop(idf.model, idf.idd_info)
+
+
 def replace_colon(s, replacewith='__'):
     """replace the colon with something"""
     return s.replace(":", replacewith)
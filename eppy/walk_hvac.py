@@ -9,56 +9,193 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import collections
+import itertools
+
 e = [(('p_loop Supply Inlet', 'epnode'), 'Central_Chiller'), ('Central_Chiller', ('Central_Chiller_np1_node', 'epnode')), (('Central_Chiller_np1_node', 'epnode'), 'np1'), ('np1', ('np1_np2_node', 'epnode')), (('np1_np2_node', 'epnode'), 'np2'), ('np2', ('np2_Outlet_Node_Name', 'epnode')), (('sb1_pipe_inlet', 'epnode'), 'sb1_pipe'), ('sb1_pipe', ('sb1_pipe_outlet', 'epnode')), (('sb2_pipe_inlet', 'epnode'), 'sb2_pipe'), ('sb2_pipe', ('sb2_pipe_outlet', 'epnode')), (('sb3_pipe_inlet', 'epnode'), 'sb3_pipe'), ('sb3_pipe', ('sb3_pipe_outlet', 'epnode')), (('sb4_pipe_inlet', 'epnode'), 'sb4_pipe'), ('sb4_pipe', ('p_loop Supply Outlet', 'epnode')), (('p_loop Demand Inlet', 'epnode'), 'db0_pipe'), ('db0_pipe', ('db0_pipe_outlet', 'epnode')), (('db1_pipe_inlet', 'epnode'), 'db1_pipe'), ('db1_pipe', ('db1_pipe_outlet', 'epnode')), (('db2_pipe_inlet', 'epnode'), 'db2_pipe'), ('db2_pipe', ('db2_pipe_outlet', 'epnode')), (('db3_pipe_inlet', 'epnode'), 'db3_pipe'), ('db3_pipe', ('db3_pipe_outlet', 'epnode')), (('db4_pipe_inlet', 'epnode'), 'db4_pipe'), ('db4_pipe', ('p_loop Demand Outlet', 'epnode')), (('np2_Outlet_Node_Name', 'epnode'), 'p_loop_supply_splitter'), ('p_loop_supply_splitter', ('sb1_pipe_inlet', 'epnode')), ('p_loop_supply_splitter', ('sb2_pipe_inlet', 'epnode')), ('p_loop_supply_splitter', ('sb3_pipe_inlet', 'epnode')), (('db0_pipe_outlet', 'epnode'), 'p_loop_demand_splitter'), ('p_loop_demand_splitter', ('db1_pipe_inlet', 'epnode')), ('p_loop_demand_splitter', ('db2_pipe_inlet', 'epnode')), ('p_loop_demand_splitter', ('db3_pipe_inlet', 'epnode')), ('p_loop_supply_mixer', ('sb4_pipe_inlet', 'epnode')), (('sb1_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), (('sb2_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), (('sb3_pipe_outlet', 'epnode'), 'p_loop_supply_mixer'), ('p_loop_demand_mixer', ('db4_pipe_inlet', 'epnode')), (('db1_pipe_outlet', 'epnode'), 'p_loop_demand_mixer'), (('db2_pipe_outlet', 'epnode'), 'p_loop_demand_mixer'), (('db3_pipe_outlet', 'epnode'), 'p_loop_demand_mixer')]
 
 
 
+def isnode(item):
+    """True if the item is a node. Nodes are (name, 'epnode') tuples"""
+    return type(item) == tuple
+
+
+class HVACGraph(object):
+    """The topology of the HVAC loops, built once from the edges.
+
+    The edges are the (from, to) pairs made by
+    loopdiagram.makeairplantloop. The items are component names and
+    nodes, which are (name, 'epnode') tuples.
+    Keeps the downstream and upstream items of every item in dicts, so
+    that nextnode and prevnode do not have to scan all the edges.
+    """
+    def __init__(self, edges):
+        self.edges = list(edges)
+        self.succ = {}  # item -> downstream items, in the order of edges
+        self.pred = {}  # item -> upstream items, in the order of edges
+        for a, b in self.edges:
+            self.succ.setdefault(a, []).append(b)
+            self.pred.setdefault(b, []).append(a)
+            self.succ.setdefault(b, [])
+            self.pred.setdefault(a, [])
+
+    def __contains__(self, item):
+        return item in self.succ
+
+    def items(self):
+        """all the components and nodes"""
+        return list(self.succ.keys())
+
+    def nextnode(self, component):
+        """get the next components in the loop. Same as nextnode"""
+        cs = self._across(component, self.succ)
+        # connections that have no nodes
+        if not isnode(component):
+            cs.extend([b for b in self.succ.get(component, [])
+                       if not isnode(b)])
+        return cs
+
+    def prevnode(self, component):
+        """get the previous components in the loop. Same as prevnode"""
+        cs = self._across(component, self.pred)
+        # connections that have no nodes
+        if not isnode(component):
+            cs.extend([a for a in self.pred.get(component, [])
+                       if not isnode(a)])
+        return cs
+
+    @staticmethod
+    def _across(component, adjacent):
+        """the first component across each node next to component
+        Returns [] if any neighbour is not a node or is a dead end"""
+        cs = []
+        for node in adjacent.get(component, []):
+            across = adjacent.get(node, []) if isnode(node) else []
+            if not across:
+                return []
+            cs.append(across[0])
+        return cs
+
+    def _traverse(self, item, adjacent, nodes):
+        """all the items reachable from item, breadth first"""
+        seen = set([item])
+        order = []
+        queue = collections.deque([item])
+        while queue:
+            current = queue.popleft()
+            for other in adjacent.get(current, []):
+                if other not in seen:
+                    seen.add(other)
+                    order.append(other)
+                    queue.append(other)
+        if not nodes:
+            order = [other for other in order if not isnode(other)]
+        return order
+
+    def downstream(self, item, nodes=False):
+        """all the components downstream of item, nearest first
+        includes the nodes if nodes is True"""
+        return self._traverse(item, self.succ, nodes)
+
+    def upstream(self, item, nodes=False):
+        """all the components upstream of item, nearest first
+        includes the nodes if nodes is True"""
+        return self._traverse(item, self.pred, nodes)
+
+    def sources(self):
+        """items that have nothing upstream, such as loop inlet nodes"""
+        return [item for item in self.succ if not self.pred[item]]
+
+    def sinks(self):
+        """items that have nothing downstream, such as loop outlet nodes"""
+        return [item for item in self.succ if not self.succ[item]]
+
+    def connectedgroups(self):
+        """the groups of items that are connected to each other,
+        ignoring the direction of flow. Largest group first.
+        More than one group means that some items are disconnected"""
+        seen = set()
+        groups = []
+        for item in self.succ:
+            if item in seen:
+                continue
+            seen.add(item)
+            group = [item]
+            queue = collections.deque([item])
+            while queue:
+                current = queue.popleft()
+                for other in itertools.chain(self.succ[current],
+                                             self.pred[current]):
+                    if other not in seen:
+                        seen.add(other)
+                        group.append(other)
+                        queue.append(other)
+            groups.append(group)
+        groups.sort(key=len, reverse=True)
+        return groups
+
+    def cycles(self):
+        """groups of items that are in a cycle, following the flow
+
+        These are the strongly connected groups with more than one item,
+        or an item connected to itself. Tarjan's algorithm, without
+        recursion so that large plants do not hit the recursion limit"""
+        index = {}
+        lowlink = {}
+        onstack = set()
+        stack = []
+        result = []
+        counter = itertools.count()
+        for start in self.succ:
+            if start in index:
+                continue
+            index[start] = lowlink[start] = next(counter)
+            stack.append(start)
+            onstack.add(start)
+            work = [(start, iter(self.succ[start]))]
+            while work:
+                item, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = next(counter)
+                        stack.append(child)
+                        onstack.add(child)
+                        work.append((child, iter(self.succ[child])))
+                        break
+                    elif child in onstack:
+                        lowlink[item] = min(lowlink[item], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[item])
+                    if lowlink[item] == index[item]:
+                        group = []
+                        while True:
+                            member = stack.pop()
+                            onstack.discard(member)
+                            group.append(member)
+                            if member == item:
+                                break
+                        if len(group) > 1 or item in self.succ[item]:
+                            result.append(group[::-1])
+        return result
+
+
 def nextnode(edges, component):
-    """get the next component in the loop"""
-    e = edges
-    c = component
-    n2c = [(a, b) for a, b in e if type(a) == tuple]
-    c2nodes = [(a, b) for a, b in e if a == c]
-    node2cs = []
-    for c2node in c2nodes:
-        node2c = [(a, b) for a, b in n2c if a == c2node[-1]]
-        if len(node2c) == 0:
-            # return []
-            node2cs = []
-            break
-        node2cs.append(node2c[0])
-    cs = [b for a, b in node2cs]
-    # test for connections that have no nodes
-    # filter for no nodes
-    nonodes = [(a, b) for a, b in e if type(a) != tuple and type(b) != tuple]
-    for a, b in nonodes:
-        if a == component:
-            cs.append(b)
-    return cs
+    """get the next component in the loop
+
+    Builds an HVACGraph each time. Make an HVACGraph once and use its
+    nextnode when walking a large loop"""
+    return HVACGraph(edges).nextnode(component)
 
 def prevnode(edges, component):
-    """get the pervious component in the loop"""
-    e = edges
-    c = component
-    n2c = [(a, b) for a, b in e if type(a) == tuple]
-    c2n = [(a, b) for a, b in e if type(b) == tuple]
-    node2cs = [(a, b) for a, b in e if b == c]
-    c2nodes = []
-    for node2c in node2cs:
-        c2node = [(a, b) for a, b in c2n if b == node2c[0]]
-        if len(c2node) == 0:
-            # return []
-            c2nodes = []
-            break
-        c2nodes.append(c2node[0])
-    cs = [a for a, b in c2nodes]
-    # test for connections that have no nodes
-    # filter for no nodes
-    nonodes = [(a, b) for a, b in e if type(a) != tuple and type(b) != tuple]
-    for a, b in nonodes:
-        if b == component:
-            cs.append(a)
-    return cs
+    """get the pervious component in the loop
+
+    Builds an HVACGraph each time. Make an HVACGraph once and use its
+    prevnode when walking a large loop"""
+    return HVACGraph(edges).prevnode(component)
 
 def main():
     edges = e